@@ -9,6 +9,8 @@ import os
 sys.path.append(os.getcwd())
 
 from mcdm_calculator.service import calculate_mcdm
+from mcdm_calculator.explain import trace_steps, TITLES
+from mcdm_calculator import loaders
 
 st.set_page_config(
     page_title="MCDM Research Tool",
@@ -20,16 +22,14 @@ st.title("📊 Multi-Criteria Decision Making (MCDM) Research Tool")
 st.markdown("A research-ready tool for comprehensive decision analysis.")
 
 # --- Helper Functions ---
+UPLOAD_TYPES = [ext.lstrip('.') for ext in loaders.LOADERS]
+
 @st.cache_data
 def load_data(file):
-    """Load data from CSV or Excel file."""
+    """Load data by file extension (CSV, Excel, .npy/.npz, Parquet/Feather). Returns (df, criteria types)."""
     try:
-        if file.name.endswith('.csv'):
-            return pd.read_csv(file, index_col=0)
-        elif file.name.endswith(('.xls', '.xlsx')):
-            return pd.read_excel(file, index_col=0, engine='openpyxl')
-        else:
-            return None
+        data = loaders.load(file)
+        return data.to_frame(), data.criteria_types
     except Exception as e:
         return str(e)
 
@@ -59,30 +59,62 @@ if weights_method == 'manual':
 # Ranking Method
 ranking_method = st.sidebar.selectbox(
     "Ranking Method",
-    options=['topsis', 'vikor', 'mairca'],
+    options=['topsis', 'vikor', 'mairca', 'promethee', 'electre1', 'electre3'],
     index=0,
     help="Select the method to rank alternatives."
 )
 
+ranking_options = None
+if ranking_method == 'topsis':
+    distance = st.sidebar.selectbox(
+        "Distance Metric",
+        options=['euclidean', 'manhattan', 'chebyshev', 'minkowski'],
+        index=0,
+        help="Separation measure to the ideal and anti-ideal solutions."
+    )
+    if distance != 'euclidean':
+        ranking_options = {'metric': distance}
+    if distance == 'minkowski':
+        ranking_options['p'] = st.sidebar.number_input("Minkowski exponent p", min_value=1.0, value=3.0)
+elif ranking_method == 'promethee':
+    preference = st.sidebar.selectbox(
+        "Preference Function",
+        options=['usual', 'linear', 'vshape', 'gaussian'],
+        index=0,
+        help="PROMETHEE preference function, applied to every criterion (thresholds in criterion units)."
+    )
+    ranking_options = {'preference': preference}
+    if preference == 'linear':
+        ranking_options['q'] = st.sidebar.number_input("Indifference threshold q", min_value=0.0, value=0.0)
+    if preference in ('linear', 'vshape'):
+        ranking_options['p'] = st.sidebar.number_input("Preference threshold p", min_value=0.0, value=1.0)
+    if preference == 'gaussian':
+        ranking_options['s'] = st.sidebar.number_input("Gaussian threshold s", min_value=0.0, value=1.0)
+
+show_steps = st.sidebar.checkbox(
+    "Show calculation steps",
+    value=False,
+    help="Display the intermediate matrices of the selected methods (large tables are truncated)."
+)
+
 st.sidebar.info(f"**Selected Logic:**\n\nWeights: `{weights_method.upper()}`\nRanking: `{ranking_method.upper()}`")
 
 # --- Main Area: Data Input ---
 st.header("Input Data")
-st.info("Upload a CSV/Excel file or edit the table below. First column must be Alternative Names.")
+st.info("Upload a CSV/Excel/NumPy/Parquet file or edit the table below. First column must be Alternative Names; "
+        "an optional second row labelled 'types' (benefit/cost) presets the criteria types.")
 
 # File Uploader
-uploaded_file = st.file_uploader("Upload Data File", type=["csv", "xlsx", "xls"])
+uploaded_file = st.file_uploader("Upload Data File", type=UPLOAD_TYPES)
 
+file_types = None
 if uploaded_file is not None:
     loaded_data = load_data(uploaded_file)
     if isinstance(loaded_data, str): # Error message
         st.error(f"Error reading file: {loaded_data}")
         st.stop()
-    elif loaded_data is None:
-        st.error("Unsupported file format.")
-        st.stop()
     else:
-        df = loaded_data
+        df, file_types = loaded_data
 else:
     # Default example data
     data = {
@@ -107,10 +139,12 @@ with col2:
     criteria_types = []
     cols = edited_df.columns
     
-    for col in cols:
+    for j, col in enumerate(cols):
+        preset = file_types[j] if file_types and j < len(file_types) else 1
         c_type = st.radio(
             f"**{col}**",
             options=[1, -1],
+            index=0 if preset == 1 else 1,
             format_func=lambda x: "Benefit (Maximize)" if x == 1 else "Cost (Minimize)",
             key=f"type_{col}",
             horizontal=True
@@ -140,7 +174,9 @@ if st.button("🚀 Calculate Results", type="primary"):
             weights_method, 
             ranking_method, 
             criteria_types, 
-            manual_weights
+            manual_weights,
+            explain=show_steps,
+            ranking_options=ranking_options
         )
         
         # --- Display Results ---
@@ -152,7 +188,9 @@ if st.button("🚀 Calculate Results", type="primary"):
             results['results'].style.background_gradient(cmap='Blues', subset=[results['results'].columns[1]]),
             use_container_width=True
         )
-        
+        if 'kernel' in results['intermediate']:
+            st.info(f"**Kernel:** {', '.join(map(str, results['intermediate']['kernel']))}")
+
         # Weights Table
         st.subheader("⚖️ Calculated Weights")
         
@@ -164,6 +202,19 @@ if st.button("🚀 Calculate Results", type="primary"):
         with col_w2:
             st.bar_chart(results['weights'].set_index('Criterion'))
             
+        # Calculation Steps (recorded during the same computation)
+        if show_steps:
+            st.subheader("🔍 Calculation Steps")
+            trace = results['intermediate']['trace']
+            alternatives = [str(a) for a in edited_df.index]
+            for section in (weights_method, ranking_method):
+                steps = trace_steps(trace, section, list(edited_df.columns), alternatives, criteria_types)
+                for title, table, note in steps:
+                    with st.expander(f"{TITLES[section]} - {title}"):
+                        st.dataframe(table, use_container_width=True)
+                        if note:
+                            st.caption(note)
+            
         # Download Button
         csv_data = convert_df(results['results'])
         st.download_button(
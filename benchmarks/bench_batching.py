@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: throughput of many small concurrent requests, sequential calls vs
+the asyncio micro-batcher.
+Run from project root: python benchmarks/bench_batching.py
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from mcdm_calculator.batching import MicroBatcher
+from mcdm_calculator.service import calculate_mcdm, compute_weights, compute_scores
+
+def run_sequential_service(frames, c_types, weights_method, ranking_method):
+    for df in frames:
+        calculate_mcdm(df, weights_method, ranking_method, c_types, use_cache=False)
+
+def run_sequential_core(matrices, c_types, weights_method, ranking_method):
+    for matrix in matrices:
+        weights = compute_weights(matrix, weights_method, c_types)
+        compute_scores(matrix, weights, ranking_method, c_types)
+
+def run_batched(matrices, c_types, weights_method, ranking_method, max_batch_size, max_wait):
+    async def main():
+        batcher = MicroBatcher(max_batch_size, max_wait)
+        await asyncio.gather(*(batcher.score(matrix, weights_method, ranking_method, c_types)
+                               for matrix in matrices))
+    asyncio.run(main())
+
+def throughput(fn, count):
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    m, n = 20, 10
+    c_types = rng.choice([1, -1], size=n)
+    matrices = [rng.uniform(1, 100, size=(m, n)) for _ in range(args.requests)]
+    frames = [pd.DataFrame(matrix) for matrix in matrices]
+
+    print(f"{args.requests} requests of {m}x{n}, max batch {args.max_batch_size}, max wait {args.max_wait_ms} ms")
+    print(f"{'methods':>16} {'calculate_mcdm':>15} {'core calls':>11} {'batched':>10} {'speedup':>8}   (requests/s)")
+    for weights_method, ranking_method in [('merec', 'topsis'), ('entropy', 'vikor'), ('critic', 'mairca')]:
+        args_ = (c_types, weights_method, ranking_method)
+        service = throughput(lambda: run_sequential_service(frames, *args_), args.requests)
+        core = throughput(lambda: run_sequential_core(matrices, *args_), args.requests)
+        batched = throughput(lambda: run_batched(matrices, *args_, args.max_batch_size,
+                                                 args.max_wait_ms / 1000), args.requests)
+        print(f"{weights_method + '/' + ranking_method:>16} {service:>15.0f} {core:>11.0f} {batched:>10.0f} "
+              f"{batched / core:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
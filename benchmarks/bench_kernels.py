@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-column loops vs the criteria-direction kernel layer.
+Run from project root: python benchmarks/bench_kernels.py
+
+The loop versions below are the pre-kernel implementations, kept here only
+as a reference point for the timings.
+"""
+import sys
+import os
+import timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from mcdm_calculator.core import normalization, ranking, weighting
+
+def loop_min_max(matrix, criteria_types):
+    matrix = np.array(matrix, dtype=float)
+    normalized = np.zeros_like(matrix)
+    min_vals = np.min(matrix, axis=0)
+    max_vals = np.max(matrix, axis=0)
+    ranges = np.where(max_vals - min_vals == 0, 1, max_vals - min_vals)
+    for j, c_type in enumerate(criteria_types):
+        if c_type == 1:
+            normalized[:, j] = (matrix[:, j] - min_vals[j]) / ranges[j]
+        else:
+            normalized[:, j] = (max_vals[j] - matrix[:, j]) / ranges[j]
+    return normalized
+
+def loop_linear(matrix, criteria_types):
+    matrix = np.array(matrix, dtype=float)
+    normalized = np.zeros_like(matrix)
+    max_vals = np.max(matrix, axis=0)
+    min_vals = np.min(matrix, axis=0)
+    for j, c_type in enumerate(criteria_types):
+        if c_type == 1:
+            normalized[:, j] = matrix[:, j] / (max_vals[j] if max_vals[j] != 0 else 1)
+        else:
+            normalized[:, j] = min_vals[j] / np.where(matrix[:, j] == 0, 1e-9, matrix[:, j])
+    return normalized
+
+def loop_topsis(matrix, weights, criteria_types):
+    weighted = normalization.vector_normalization(matrix) * weights
+    ideal = np.zeros(len(weights))
+    anti_ideal = np.zeros(len(weights))
+    for j, c_type in enumerate(criteria_types):
+        if c_type == 1:
+            ideal[j] = np.max(weighted[:, j])
+            anti_ideal[j] = np.min(weighted[:, j])
+        else:
+            ideal[j] = np.min(weighted[:, j])
+            anti_ideal[j] = np.max(weighted[:, j])
+    d_plus = np.sqrt(np.sum((weighted - ideal)**2, axis=1))
+    d_minus = np.sqrt(np.sum((weighted - anti_ideal)**2, axis=1))
+    return d_minus / (d_plus + d_minus + 1e-9)
+
+def loop_vikor(matrix, weights, criteria_types, v=0.5):
+    matrix = np.array(matrix, dtype=float)
+    f_star = np.zeros(matrix.shape[1])
+    f_minus = np.zeros(matrix.shape[1])
+    for j, c_type in enumerate(criteria_types):
+        if c_type == 1:
+            f_star[j], f_minus[j] = np.max(matrix[:, j]), np.min(matrix[:, j])
+        else:
+            f_star[j], f_minus[j] = np.min(matrix[:, j]), np.max(matrix[:, j])
+    denom = np.where(f_star - f_minus == 0, 1e-9, f_star - f_minus)
+    regret = np.zeros_like(matrix)
+    for j in range(matrix.shape[1]):
+        regret[:, j] = (f_star[j] - matrix[:, j]) / denom[j]
+    weighted = weights * regret
+    S, R = weighted.sum(axis=1), weighted.max(axis=1)
+    dS = (S.max() - S.min()) or 1
+    dR = (R.max() - R.min()) or 1
+    return v * (S - S.min()) / dS + (1 - v) * (R - R.min()) / dR
+
+def best_time(fn, repeat=5):
+    number = 3
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+def main():
+    rng = np.random.default_rng(42)
+    m = 50
+    print(f"Alternatives: {m}")
+    print(f"{'criteria':>9} {'function':>15} {'loop (ms)':>10} {'kernel (ms)':>12} {'speedup':>8}")
+    for n in [10, 100, 1000, 5000]:
+        matrix = rng.uniform(1, 100, size=(m, n))
+        c_types = rng.choice([1, -1], size=n)
+        weights = np.ones(n) / n
+        cases = [
+            ('min_max', lambda: loop_min_max(matrix, c_types),
+             lambda: normalization.min_max_normalization(matrix, c_types)),
+            ('linear', lambda: loop_linear(matrix, c_types),
+             lambda: normalization.linear_normalization(matrix, c_types)),
+            ('topsis', lambda: loop_topsis(matrix, weights, c_types),
+             lambda: ranking.topsis_ranking(matrix, weights, c_types)),
+            ('vikor', lambda: loop_vikor(matrix, weights, c_types),
+             lambda: ranking.vikor_ranking(matrix, weights, c_types)),
+        ]
+        for name, loop_fn, kernel_fn in cases:
+            t_loop = best_time(loop_fn)
+            t_kernel = best_time(kernel_fn)
+            print(f"{n:>9} {name:>15} {t_loop * 1e3:>10.3f} {t_kernel * 1e3:>12.3f} {t_loop / t_kernel:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
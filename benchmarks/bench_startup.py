@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start-up cost of the entry points, from `python -X importtime`.
+Run from project root: python benchmarks/bench_startup.py [--check]
+
+For each module the cumulative import time is the median of --repeat fresh
+interpreters. --check exits with status 1 when pandas is imported by a
+module that must not need it, or an import exceeds --budget-ms.
+"""
+import sys
+import os
+import re
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry points that must start without pandas
+MODULES = [
+    'mcdm_calculator.calculator',
+    'mcdm_calculator.service',
+    'mcdm_calculator.batching',
+    'mcdm_calculator.server',
+    'mcdm_calculator.loaders',
+]
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def import_profile(module):
+    """{imported module: (self us, cumulative us)} of one fresh interpreter importing module."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    profile = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            profile[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return profile
+
+def help_seconds():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join('mcdm_calculator', 'calculator.py'), '--help'],
+                   cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=250.0,
+                        help='Largest accepted cumulative import time per module (default: 250)')
+    parser.add_argument('--top', type=int, default=8, help='Heaviest imports listed per module')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 on a violation')
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':>28} {'import (ms)':>12} {'pandas':>7}   heaviest (cumulative ms)")
+    for module in MODULES:
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        total = statistics.median(p[module][1] for p in profiles) / 1000
+        has_pandas = any('pandas' in p for p in profiles)
+        last = profiles[-1]
+        heaviest = sorted((name for name in last if name != module and '.' not in name),
+                          key=lambda name: -last[name][1])[:args.top]
+        summary = ", ".join(f"{name} {last[name][1] / 1000:.1f}" for name in heaviest)
+        print(f"{module:>28} {total:>12.1f} {'yes' if has_pandas else 'no':>7}   {summary}")
+        if has_pandas:
+            failures.append(f"{module} imports pandas")
+        if total > args.budget_ms:
+            failures.append(f"{module} takes {total:.1f} ms to import (budget {args.budget_ms} ms)")
+
+    help_ms = statistics.median(help_seconds() for _ in range(args.repeat)) * 1000
+    print(f"\ncalculator.py --help: {help_ms:.1f} ms wall time (interpreter start-up included)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark suite for the MCDM core and service layer.
+Run from project root:
+
+    # Full grid, write a baseline
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+
+    # Quick grid, compare against the stored baseline
+    python benchmarks/run_benchmarks.py --quick --compare benchmarks/baseline.json
+
+Every public function and class in core.normalization, core.weighting,
+core.ranking and core.streaming plus service.calculate_mcdm is timed (best of
+several runs) and memory-profiled (tracemalloc peak) on synthetic decision
+matrices. Needs only numpy/pandas.
+"""
+import argparse
+import functools
+import inspect
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from mcdm_calculator import service
+from mcdm_calculator.core import normalization, weighting, ranking, streaming
+from mcdm_calculator.core.workspace import Workspace
+
+ALTERNATIVES = [10, 100, 1000, 10**4, 10**5, 10**6]
+CRITERIA = [3, 10, 100, 1000]
+QUICK_ALTERNATIVES = [10, 1000, 10**5]
+QUICK_CRITERIA = [3, 100]
+BATCH = 8
+CHUNK_ROWS = 10**4
+MODULES = {'normalization': normalization, 'weighting': weighting, 'ranking': ranking, 'streaming': streaming}
+# Cases building all m x m pairs (cell_cost counts m * m * n)
+PAIRWISE = ('ranking.promethee_ranking[gaussian]', 'ranking.electre1_relation', 'ranking.electre1_ranking',
+            'ranking.electre3_relation', 'ranking.electre3_ranking')
+
+def public_functions():
+    """'module.name' of every public function and class defined in MODULES."""
+    names = set()
+    for prefix, module in MODULES.items():
+        for name, obj in vars(module).items():
+            if (not name.startswith('_') and (inspect.isfunction(obj) or inspect.isclass(obj))
+                    and obj.__module__ == module.__name__):
+                names.add(f"{prefix}.{name}")
+    return names
+
+def make_inputs(m, n, seed=0):
+    """Synthetic decision matrix with mixed criteria types."""
+    rng = np.random.default_rng(seed)
+    matrix = rng.uniform(1, 100, size=(m, n))
+    c_types = np.where(np.arange(n) % 3 == 0, -1, 1)
+    weights = rng.dirichlet(np.ones(n))
+    return matrix, c_types, weights
+
+def build_cases(matrix, c_types, weights):
+    """
+    name -> zero-argument callable for every benchmarked function.
+    Batched functions get a contiguous stack of BATCH copies of the matrix
+    (a broadcast view would be read strided, which real stacks are not).
+    [workspace] variants reuse one Workspace (warmed up by the timing runs).
+    Stacks and prepared scorings are built on first use, so skipped cases
+    allocate nothing. Weight samples and streaming functions see BATCH weight vectors and
+    chunks of CHUNK_ROWS rows. The test suite checks that every function in
+    public_functions() has a case.
+    """
+    m, n = matrix.shape
+    df = pd.DataFrame(matrix)
+    ws = Workspace(m, n, dtype=matrix.dtype)
+    samples = np.random.default_rng(1).dirichlet(np.ones(n), BATCH)
+    stats = streaming.ColumnStats(n).update(matrix)
+    extremes = (stats.min, stats.max)
+
+    @functools.cache
+    def stack():
+        return np.ascontiguousarray(np.broadcast_to(matrix, (BATCH,) + matrix.shape))
+
+    @functools.cache
+    def prepared(method):
+        return ranking.prepare_scoring(matrix, c_types, method)
+
+    def chunks():
+        return ((None, matrix[i:i + CHUNK_ROWS]) for i in range(0, m, CHUNK_ROWS))
+
+    cases = {
+        'normalization.vector_normalization': lambda: normalization.vector_normalization(matrix),
+        'normalization.min_max_normalization': lambda: normalization.min_max_normalization(matrix, c_types),
+        'normalization.linear_normalization': lambda: normalization.linear_normalization(matrix, c_types),
+        'normalization.sum_normalization': lambda: normalization.sum_normalization(matrix),
+        'weighting.entropy_weighting': lambda: weighting.entropy_weighting(matrix),
+        'weighting.critic_weighting': lambda: weighting.critic_weighting(matrix),
+        'weighting.merec_weighting': lambda: weighting.merec_weighting(matrix, c_types),
+        'weighting.merec_normalization': lambda: weighting.merec_normalization(matrix, c_types),
+        'weighting.merec_removal_effects': lambda: weighting.merec_removal_effects(matrix, c_types),
+        'weighting.batch_entropy_weighting': lambda: weighting.batch_entropy_weighting(stack()),
+        'weighting.batch_critic_weighting': lambda: weighting.batch_critic_weighting(stack()),
+        'weighting.batch_merec_weighting': lambda: weighting.batch_merec_weighting(stack(), c_types),
+        'ranking.topsis_ranking': lambda: ranking.topsis_ranking(matrix, weights, c_types),
+        'ranking.vikor_ranking': lambda: ranking.vikor_ranking(matrix, weights, c_types),
+        'ranking.mairca_ranking': lambda: ranking.mairca_ranking(matrix, weights, c_types),
+        'ranking.topsis_ranking[workspace]': lambda: ranking.topsis_ranking(matrix, weights, c_types, workspace=ws),
+        'ranking.vikor_ranking[workspace]': lambda: ranking.vikor_ranking(matrix, weights, c_types, workspace=ws),
+        'ranking.mairca_ranking[workspace]': lambda: ranking.mairca_ranking(matrix, weights, c_types, workspace=ws),
+        'ranking.batch_topsis_ranking': lambda: ranking.batch_topsis_ranking(stack(), weights, c_types),
+        'ranking.batch_vikor_ranking': lambda: ranking.batch_vikor_ranking(stack(), weights, c_types),
+        'ranking.batch_mairca_ranking': lambda: ranking.batch_mairca_ranking(stack(), weights, c_types),
+        'ranking.promethee_preferences': lambda: ranking.promethee_preferences('linear', 1, 10, None, n),
+        'ranking.promethee_ranking': lambda: ranking.promethee_ranking(matrix, weights, c_types, 'linear', q=1, p=10),
+        'ranking.promethee_ranking[gaussian]': lambda: ranking.promethee_ranking(matrix, weights, c_types,
+                                                                                 'gaussian', s=10),
+        'ranking.electre1_relation': lambda: ranking.electre1_relation(matrix, weights, c_types),
+        'ranking.electre1_ranking': lambda: ranking.electre1_ranking(matrix, weights, c_types),
+        'ranking.electre3_thresholds': lambda: ranking.electre3_thresholds(1, 10, 50, n),
+        'ranking.electre3_relation': lambda: ranking.electre3_relation(matrix, weights, c_types, q=1, p=10, v=50),
+        'ranking.electre3_ranking': lambda: ranking.electre3_ranking(matrix, weights, c_types, q=1, p=10, v=50),
+        'streaming.ColumnStats': lambda: streaming.ColumnStats(n).update(matrix),
+        'streaming.collect_stats': lambda: streaming.collect_stats(chunks()),
+        'streaming.EntropyAccumulator': lambda: streaming.EntropyAccumulator(n).update(matrix).weights(),
+        'streaming.CriticAccumulator': lambda: streaming.CriticAccumulator(*extremes).update(matrix).weights(),
+        'streaming.MerecAccumulator': lambda: streaming.MerecAccumulator(*extremes, c_types).update(matrix).weights(),
+        'streaming.scores_from_stats': lambda: streaming.scores_from_stats(matrix, weights, c_types, stats, 'topsis'),
+        'service.calculate_mcdm': lambda: service.calculate_mcdm(df, 'merec', 'topsis', list(c_types), use_cache=False),
+    }
+    for method in ('topsis', 'vikor', 'mairca'):
+        cases[f'ranking.prepare_scoring[{method}]'] = lambda method=method: ranking.prepare_scoring(matrix, c_types,
+                                                                                                     method)
+        cases[f'ranking.score_weight_samples[{method}]'] = lambda method=method: ranking.score_weight_samples(
+            prepared(method), samples)
+        cases[f'streaming.stream_scores[{method}]'] = lambda method=method: list(streaming.stream_scores(
+            chunks, weights, c_types, method, stats=stats))
+    for method in streaming.STREAM_WEIGHTS:
+        cases[f'streaming.stream_weights[{method}]'] = lambda method=method: streaming.stream_weights(
+            chunks, method, c_types, stats=stats)
+    return cases
+
+def cell_cost(name, m, n):
+    """
+    Matrix cells touched by one call: batched functions see BATCH matrices,
+    pairwise outranking cases all m x m pairs per criterion.
+    """
+    if name in PAIRWISE:
+        return m * m * n
+    cost = m * n * (BATCH if '.batch_' in name or '.score_weight_samples' in name else 1)
+    if 'critic' in name.lower():
+        cost += n * n * (BATCH if '.batch_' in name else 1)
+    return cost
+
+def time_call(fn, min_time=0.2, max_repeat=1000):
+    """
+    Best wall time of several runs: at least 3, then until min_time is spent,
+    so microsecond-scale cases get enough runs for a stable minimum.
+    """
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_repeat:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - start > min_time and len(times) >= 3:
+            break
+    return min(times), float(np.median(times)), len(times)
+
+def peak_memory(fn):
+    """Peak bytes allocated (tracemalloc) during a single call."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(alternatives, criteria, max_cells, pattern=None, log=print):
+    results = {}
+    for m in alternatives:
+        for n in criteria:
+            if m * n > max_cells: # every case touches at least the matrix
+                continue
+            matrix, c_types, weights = make_inputs(m, n)
+            for name, fn in build_cases(matrix, c_types, weights).items():
+                if pattern and not re.search(pattern, name):
+                    continue
+                if cell_cost(name, m, n) > max_cells:
+                    continue
+                best, median, repeats = time_call(fn)
+                peak = peak_memory(fn)
+                key = f"{name}|{m}|{n}"
+                results[key] = {
+                    'function': name, 'alternatives': m, 'criteria': n,
+                    'time_s': best, 'median_s': median, 'repeats': repeats,
+                    'peak_bytes': int(peak),
+                }
+                log(f"{name:40s} m={m:<8d} n={n:<5d} {best * 1e3:10.3f} ms {peak / 2**20:10.2f} MiB")
+    return results
+
+def compare(current, baseline, threshold, mem_threshold):
+    """
+    Return regressions: entries slower (or using more memory) than the
+    baseline by more than the relative threshold.
+    """
+    regressions = []
+    for key, cur in current.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        time_ratio = cur['time_s'] / max(base['time_s'], 1e-9)
+        mem_ratio = cur['peak_bytes'] / max(base['peak_bytes'], 1)
+        if time_ratio > 1 + threshold or mem_ratio > 1 + mem_threshold:
+            regressions.append((key, time_ratio, mem_ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MCDM scaling benchmarks")
+    parser.add_argument('--quick', action='store_true', help='Small grid for quick checks')
+    parser.add_argument('--alternatives', type=str, help='Comma separated alternative counts')
+    parser.add_argument('--criteria', type=str, help='Comma separated criteria counts')
+    parser.add_argument('--max-cells', type=float, default=2e7,
+                        help='Skip cases touching more matrix cells than this (default: 2e7)')
+    parser.add_argument('--functions', type=str, metavar='REGEX', help='Only run matching functions')
+    parser.add_argument('--output', type=str, metavar='FILE', help='Write results as a JSON baseline')
+    parser.add_argument('--compare', type=str, metavar='FILE', help='Compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Relative slowdown flagged as regression (default: 0.25)')
+    parser.add_argument('--mem-threshold', type=float, default=0.10,
+                        help='Relative peak memory increase flagged as regression (default: 0.10)')
+    args = parser.parse_args(argv)
+    
+    alternatives = QUICK_ALTERNATIVES if args.quick else ALTERNATIVES
+    criteria = QUICK_CRITERIA if args.quick else CRITERIA
+    if args.alternatives:
+        alternatives = [int(float(x)) for x in args.alternatives.split(',')]
+    if args.criteria:
+        criteria = [int(float(x)) for x in args.criteria.split(',')]
+    
+    results = run(alternatives, criteria, args.max_cells, args.functions)
+    
+    if args.output:
+        payload = {
+            'meta': {
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'machine': platform.machine(),
+                'processor': platform.processor(),
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        print(f"\n✓ Baseline written to: {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.mem_threshold)
+        print(f"\nCompared {sum(k in baseline for k in results)} cases against {args.compare}")
+        for key, time_ratio, mem_ratio in regressions:
+            print(f"  ✗ {key}: time x{time_ratio:.2f}, memory x{mem_ratio:.2f}")
+        if regressions:
+            print(f"✗ {len(regressions)} regression(s) beyond threshold")
+            return 1
+        print("✓ No regressions beyond threshold")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
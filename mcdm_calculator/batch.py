@@ -0,0 +1,104 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from mcdm_calculator import loaders
+from mcdm_calculator.calculator import (criteria_types_from_string, manual_weights_from_string,
+                                        ranking_options_from_strings)
+from mcdm_calculator.service import calculate_mcdm
+
+INPUT_EXTENSIONS = tuple(loaders.LOADERS)
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+def expand_inputs(patterns):
+    """
+    Input files for glob patterns, directories (all supported files inside) or plain paths,
+    sorted and without duplicates.
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                       if name.lower().endswith(INPUT_EXTENSIONS)]
+        else:
+            matches = glob.glob(pattern)
+        files.extend(path for path in matches if os.path.isfile(path))
+    return sorted(set(files))
+
+def output_path(input_path, output_dir, ranking_method, weights_method, fmt):
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{stem}_{ranking_method}_{weights_method}.{fmt}")
+
+def write_results(results, target, fmt):
+    """Write a results frame as CSV or JSON lines to a path or an open text file."""
+    if fmt == 'csv':
+        results.to_csv(target, index=False)
+        return
+    text = results.to_json(orient='records', lines=True)
+    if text and not text.endswith('\n'):
+        text += '\n'
+    if isinstance(target, str):
+        with open(target, 'w') as f:
+            f.write(text)
+    else:
+        target.write(text)
+
+def process_file(path, options):
+    """
+    Score one input file. Runs in a worker process, so failures are returned
+    instead of raised.
+
+    options: dict with 'weights', 'ranking', 'types', 'manual_weights', 'top_k',
+             'format', 'output_dir' (None to return the results to the caller)
+             and optionally 'dtype' (compute dtype) and 'ranking_options' (ranking option strings)
+
+    Returns:
+        dict: 'file', 'ok', 'seconds', 'alternatives', and 'output' / 'results' or 'error'
+    """
+    start = time.perf_counter()
+    report = {'file': path, 'ok': False, 'alternatives': 0}
+    try:
+        data = loaders.load(path)
+        df = data.to_frame()
+        n = df.shape[1]
+        if options['types'] or data.criteria_types is None:
+            c_types = criteria_types_from_string(options['types'], n)
+        else:
+            c_types = data.criteria_types
+        manual = None
+        if options['weights'] == 'manual':
+            manual = list(manual_weights_from_string(options['manual_weights'], n))
+        ranking_options = ranking_options_from_strings(options['ranking'], options.get('ranking_options', {}), n)
+        out = calculate_mcdm(df, options['weights'], options['ranking'], c_types, manual,
+                             top_k=options['top_k'], use_cache=False, dtype=options.get('dtype'),
+                             ranking_options=ranking_options)
+        results = out['results']
+        if options['output_dir'] is None:
+            report['results'] = results
+        else:
+            report['output'] = output_path(path, options['output_dir'], options['ranking'],
+                                           options['weights'], options['format'])
+            write_results(results, report['output'], options['format'])
+        report['alternatives'] = len(df)
+        report['ok'] = True
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['seconds'] = time.perf_counter() - start
+    return report
+
+def run_batch(files, options, workers=None):
+    """
+    Process files on a pool of worker processes (workers=1 runs in-process).
+    Yields the process_file reports in completion order; a failing file does
+    not stop the others.
+    """
+    if workers == 1 or len(files) <= 1:
+        for path in files:
+            yield process_file(path, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_file, path, options) for path in files]
+        for future in as_completed(futures):
+            yield future.result()
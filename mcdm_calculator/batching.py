@@ -0,0 +1,132 @@
+import asyncio
+
+import numpy as np
+
+from mcdm_calculator.core.kernels import as_float
+from mcdm_calculator.service import (compute_weights, compute_scores, compute_batch_weights,
+                                     compute_batch_scores, RANKING_OUTPUT, WEIGHT_METHODS)
+
+class MicroBatcher:
+    """
+    Coalesces concurrent small scoring requests into stacked NumPy batches.
+
+    Each `await score(...)` is queued under its (weights method, ranking
+    method, shape, dtype) key. A queue is computed as one (batch, m, n)
+    tensor through the batch_* core functions when it reaches
+    max_batch_size or max_wait seconds after its first request, whichever
+    comes first, and every caller receives its own slice of the result.
+
+    Batches run on the event loop by default (small batches take well
+    under a millisecond); pass an executor to compute them off the loop.
+    """
+    def __init__(self, max_batch_size=64, max_wait=0.002, executor=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.batches = 0
+        self.requests = 0
+        self._pending = {}
+        self._timers = {}
+        self._running = set()
+
+    async def score(self, matrix, weights_method='merec', ranking_method='topsis',
+                    criteria_types=None, manual_weights=None):
+        """
+        Weights and scores of one decision matrix.
+
+        Args:
+            matrix: (m, n) decision matrix
+            weights_method (str): 'merec', 'entropy', 'critic', 'equal', 'manual'
+            ranking_method (str): 'topsis', 'vikor', 'mairca'
+            criteria_types (list, optional): 1 (Benefit) or -1 (Cost) per criterion (default: all benefit)
+            manual_weights (list, optional): Weights if weights_method is 'manual'
+
+        Returns:
+            dict: {'weights': (n,) array, 'scores': (m,) array in input order}
+        """
+        matrix = as_float(matrix)
+        if matrix.ndim != 2:
+            raise ValueError("Decision matrix must be 2-dimensional")
+        n = matrix.shape[1]
+        if weights_method not in WEIGHT_METHODS:
+            raise ValueError(f"Unknown weighting method: {weights_method}")
+        if ranking_method not in RANKING_OUTPUT:
+            raise ValueError(f"Unknown ranking method: {ranking_method}")
+        c_types = np.ones(n, dtype=int) if criteria_types is None else np.asarray(criteria_types)
+        if c_types.shape != (n,):
+            raise ValueError(f"Number of criteria types ({c_types.size}) doesn't match columns ({n}).")
+        if weights_method == 'manual':
+            if not manual_weights or len(manual_weights) != n:
+                raise ValueError(f"Manual weights required, one per criterion ({n})")
+
+        key = (weights_method, ranking_method, matrix.shape, matrix.dtype)
+        future = asyncio.get_running_loop().create_future()
+        queue = self._pending.setdefault(key, [])
+        queue.append((matrix, c_types, manual_weights, future))
+        if len(queue) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, None)
+        if not items:
+            return
+        task = asyncio.ensure_future(self._run(key, items))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key, items):
+        self.batches += 1
+        self.requests += len(items)
+        try:
+            if self.executor is None:
+                results = _compute_batch(key, items)
+            else:
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(self.executor, _compute_batch, key,
+                                                     [item[:3] for item in items])
+        except Exception:
+            # Fall back to one computation per request so only the failing ones get the error
+            results = []
+            for matrix, c_types, manual, _ in items:
+                try:
+                    results.append(_compute_one(key, matrix, c_types, manual))
+                except Exception as e:
+                    results.append(e)
+        for (*_, future), result in zip(items, results):
+            if future.done(): # cancelled by its caller
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def flush(self):
+        """Compute every queued request now and wait for all running batches."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+def _compute_batch(key, items):
+    weights_method, ranking_method = key[:2]
+    matrices = np.stack([item[0] for item in items])
+    c_types = np.stack([item[1] for item in items])
+    manual = [item[2] for item in items] if weights_method == 'manual' else None
+    weights = compute_batch_weights(matrices, weights_method, c_types, manual)
+    scores = compute_batch_scores(matrices, weights, ranking_method, c_types)
+    return [{'weights': weights[i], 'scores': scores[i]} for i in range(len(items))]
+
+def _compute_one(key, matrix, c_types, manual_weights):
+    weights_method, ranking_method = key[:2]
+    weights = compute_weights(matrix, weights_method, c_types, manual_weights)
+    return {'weights': weights, 'scores': compute_scores(matrix, weights, ranking_method, c_types)}
@@ -0,0 +1,80 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+def fingerprint(*parts):
+    """
+    Fast content hash of arrays and plain values.
+    Arrays are hashed by dtype, shape and raw bytes, so equal matrices give
+    equal keys regardless of object identity.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            if part.dtype == object:
+                part = part.astype(float)
+            part = np.ascontiguousarray(part)
+            h.update(f"nd{part.dtype.str}{part.shape}".encode())
+            h.update(part.data)
+        else:
+            h.update(repr(part).encode())
+        h.update(b'|')
+    return h.hexdigest()
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by number of entries and total bytes.
+    Values are numpy arrays (or objects exposing nbytes).
+    """
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value or None, updating hit/miss counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        nbytes = getattr(value, 'nbytes', 0)
+        if nbytes > self.max_bytes:
+            return # Never cache something larger than the whole budget
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            self._data[key] = (value, nbytes)
+            self._bytes += nbytes
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._data.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+            }
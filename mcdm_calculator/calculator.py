@@ -1,54 +1,270 @@
 import argparse
-import pandas as pd
 import numpy as np
 import sys
 import os
 import json
+import time
 
 # Add current directory to path to allow imports if running from root
 sys.path.append(os.getcwd())
 
-from mcdm_calculator.core import normalization, weighting, ranking
+from mcdm_calculator.core import normalization, weighting, ranking, streaming, selection, kernels
+from mcdm_calculator.core.instrumentation import Profiler, stage
+from mcdm_calculator.core.trace import Trace
+from mcdm_calculator import explain, loaders
+
+# pandas is imported where a DataFrame is built, keeping start-up and --help fast
 
 def load_data(filepath):
     """
-    Load data from CSV.
-    Expected format: 
+    Load a decision matrix, the format is picked by extension (see loaders.LOADERS).
+    Expected CSV format: 
     - Index column as 0
     - Columns are criteria names
+    Returns loaders.DecisionData.
     """
     try:
-        df = pd.read_csv(filepath, index_col=0)
-        return df
+        return loaders.load(filepath)
     except Exception as e:
         print(f"Error loading file: {e}")
         sys.exit(1)
 
-def parse_criteria_types(types_str, num_criteria):
+def iter_chunks(filepath, chunk_size):
+    """
+    Yield (labels, block) chunks from a CSV file or a memory-mapped .npy file
+    without loading the whole matrix.
+    """
+    if filepath.endswith('.npy'):
+        data = np.load(filepath, mmap_mode='r')
+        for start in range(0, data.shape[0], chunk_size):
+            stop = min(start + chunk_size, data.shape[0])
+            yield [f"A{i + 1}" for i in range(start, stop)], data[start:stop]
+    else:
+        import pandas as pd
+        for chunk in pd.read_csv(filepath, index_col=0, chunksize=chunk_size):
+            yield list(chunk.index), chunk.values
+
+def read_criteria_names(filepath):
+    """Criteria names from the CSV header (or C1..Cn for .npy files)."""
+    if filepath.endswith('.npy'):
+        n = np.load(filepath, mmap_mode='r').shape[1]
+        return [f"C{j + 1}" for j in range(n)]
+    import pandas as pd
+    return list(pd.read_csv(filepath, index_col=0, nrows=0).columns)
+
+def run_stream(args):
+    """
+    Two-pass out-of-core scoring: column statistics first, then chunk-wise
+    scores written straight to the output CSV (unsorted, input order).
+    Entropy, CRITIC and MEREC weights take one more pass in between.
+    """
+    import pandas as pd
+    try:
+        criteria_names = read_criteria_names(args.data)
+    except Exception as e:
+        print(f"Error loading file: {e}")
+        sys.exit(1)
+    n = len(criteria_names)
+    c_types = parse_criteria_types(args.types, n)
+    if args.ranking in OUTRANKING_OPTIONS:
+        # Pairwise comparisons need every alternative at once
+        print(f"Error: --stream does not support --ranking {args.ranking}")
+        sys.exit(1)
+    ranking_options = parse_ranking_options(args, n) or {}
+    
+    if args.weights == 'manual':
+        weights = parse_manual_weights(args.manual_weights, n)
+    elif args.weights == 'equal':
+        weights = np.ones(n) / n
+    
+    def source():
+        return iter_chunks(args.data, args.chunk_size)
+    
+    print("\n" + "="*60)
+    print("MCDM CALCULATOR (STREAMING)")
+    print("="*60)
+    print(f"\nDataset: {args.data}")
+    print(f"Chunk size: {args.chunk_size}")
+    
+    # Pass 1: column statistics
+    with stage('stats_pass'):
+        stats = streaming.collect_stats(source())
+    print(f"Alternatives: {stats.count}")
+    print(f"Criteria: {n}")
+    
+    if args.weights in streaming.STREAM_WEIGHTS:
+        # Weights pass: chunk accumulators on the extremes of the statistics pass
+        with stage('weights_pass'):
+            weights = streaming.stream_weights(source, args.weights, c_types, stats=stats)
+    print(f"\nWeights ({args.weights.upper()}):")
+    for name, w in zip(criteria_names, weights):
+        print(f"  {name:20s}: {w:.6f}")
+    
+    score_col = {'topsis': 'Score (Closeness)', 'vikor': 'Q Value', 'mairca': 'Total Gap'}[args.ranking]
+    out_file = f"result_{args.ranking}_{args.weights}.csv"
+    chunk_scores = streaming.stream_scores(source, weights, c_types, args.ranking, stats=stats, **ranking_options)
+    
+    if args.top_k:
+        # Pass 2: keep only the k best in a bounded buffer
+        best = selection.TopKAccumulator(args.top_k, ascending=(args.ranking != 'topsis'))
+        for labels, scores in chunk_scores:
+            best.push(labels, scores)
+        labels, scores, ranks = best.result()
+        results = pd.DataFrame({'Alternative': labels, score_col: scores, 'Rank': ranks})
+        print(f"\n{'='*60}")
+        print(f"TOP {args.top_k} ({args.ranking.upper()})")
+        print('='*60)
+        print(results.to_string(index=False))
+        results.to_csv(out_file, index=False)
+        print(f"\n✓ Top {len(results)} of {stats.count} alternatives saved to: {out_file}")
+    else:
+        # Pass 2: score chunk by chunk and stream to disk
+        with open(out_file, 'w', newline='') as f:
+            header = True
+            for labels, scores in chunk_scores:
+                pd.DataFrame({'Alternative': labels, score_col: scores}).to_csv(f, header=header, index=False)
+                header = False
+        
+        print(f"\n✓ Scores for {stats.count} alternatives saved to: {out_file}")
+    print("="*60 + "\n")
+
+def manual_weights_from_string(weights_str, num_criteria):
+    """
+    Parse and normalize manual weights "0.2,0.3,0.5". Raises ValueError.
+    """
+    if not weights_str:
+        raise ValueError("--manual-weights required when --weights=manual")
+    w = [float(x) for x in weights_str.split(',')]
+    if len(w) != num_criteria:
+        raise ValueError(f"Expected {num_criteria} weights, got {len(w)}")
+    weights = np.array(w)
+    return weights / np.sum(weights)  # Normalize
+
+def parse_manual_weights(weights_str, num_criteria):
+    """
+    Parse and normalize manual weights "0.2,0.3,0.5", exiting on invalid input.
+    """
+    if not weights_str:
+        print("Error: --manual-weights required when --weights=manual")
+        sys.exit(1)
+    try:
+        return manual_weights_from_string(weights_str, num_criteria)
+    except Exception as e:
+        print(f"Error parsing manual weights: {e}")
+        sys.exit(1)
+
+def criteria_types_from_string(types_str, num_criteria):
     """
     Parse criteria types from string argument.
     Format: "1,1,-1,1" or "cost,benefit,..."
-    Returns list of 1/-1
+    Returns list of 1/-1. Raises ValueError.
     """
     if not types_str:
         return [1] * num_criteria # Default to all benefit
     
     parts = types_str.split(',')
     if len(parts) != num_criteria:
-        print(f"Error: Number of criteria types ({len(parts)}) doesn't match columns ({num_criteria}).")
-        sys.exit(1)
+        raise ValueError(f"Number of criteria types ({len(parts)}) doesn't match columns ({num_criteria}).")
         
-    types = []
-    for p in parts:
-        p = p.strip().lower()
-        if p in ['1', 'benefit', 'max', '+']:
-            types.append(1)
-        elif p in ['-1', 'cost', 'min', '-']:
-            types.append(-1)
-        else:
-            print(f"Unknown criteria type: {p}. Use 1/benefit or -1/cost.")
-            sys.exit(1)
-    return types
+    return loaders.criteria_types_from_tokens(parts)
+
+def parse_criteria_types(types_str, num_criteria):
+    """
+    Parse criteria types (see criteria_types_from_string), exiting on invalid input.
+    """
+    try:
+        return criteria_types_from_string(types_str, num_criteria)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+# CLI options of the outranking methods, passed on as ranking_options
+OUTRANKING_OPTIONS = {
+    'promethee': ('preference', 'q', 'p', 's'),
+    'electre1': ('concordance', 'discordance'),
+    'electre3': ('q', 'p', 'v', 'cut'),
+}
+# Options that take a single value rather than one per criterion
+SCALAR_OPTIONS = ('concordance', 'discordance', 'cut')
+# All CLI ranking options: the outranking ones and the TOPSIS separation measure
+RANKING_OPTIONS = dict(OUTRANKING_OPTIONS, topsis=('distance', 'minkowski_p'))
+
+def ranking_options_from_strings(ranking_method, strings, num_criteria):
+    """
+    Ranking options of an outranking method from CLI strings (dict of option
+    name -> str or None): thresholds as one value or one per criterion
+    "1,0.5,2", the PROMETHEE preference function(s) "linear" or
+    "usual,linear,...". For TOPSIS the distance metric and Minkowski p
+    ({'metric', 'p'}, None for the default Euclidean distance).
+    None for the other methods. Raises ValueError.
+    """
+    if ranking_method == 'topsis':
+        metric = strings.get('distance') or 'euclidean'
+        p = strings.get('minkowski_p')
+        if metric == 'euclidean' and p is None:
+            return None
+        p = None if p is None else float(p)
+        # Validate now rather than after the weights are computed
+        kernels.distance_metric(metric, p)
+        return {'metric': metric, 'p': p}
+    if ranking_method not in OUTRANKING_OPTIONS:
+        return None
+    options = {}
+    for name in OUTRANKING_OPTIONS[ranking_method]:
+        text = strings.get(name)
+        if name == 'preference':
+            text = text or 'usual'
+            options[name] = text.split(',') if ',' in text else text
+        elif text is not None:
+            values = [float(x) for x in text.split(',')]
+            if len(values) > 1 and name in SCALAR_OPTIONS:
+                raise ValueError(f"--{name} takes a single value")
+            options[name] = values[0] if len(values) == 1 else values
+
+    # Validate now rather than after the weights are computed
+    if ranking_method == 'promethee':
+        ranking.promethee_preferences(options['preference'], options.get('q'), options.get('p'),
+                                      options.get('s'), num_criteria)
+    elif ranking_method == 'electre3':
+        ranking.electre3_thresholds(options.get('q'), options.get('p'), options.get('v'), num_criteria)
+    return options
+
+def option_strings(args):
+    """The ranking option strings of the parsed arguments."""
+    names = {name for names in RANKING_OPTIONS.values() for name in names}
+    return {name: getattr(args, name) for name in names}
+
+def parse_ranking_options(args, num_criteria):
+    """
+    Ranking options (see ranking_options_from_strings), exiting on invalid input.
+    """
+    try:
+        return ranking_options_from_strings(args.ranking, option_strings(args), num_criteria)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def add_outranking_arguments(parser):
+    group = parser.add_argument_group('Outranking options (--ranking promethee, electre1, electre3)')
+    group.add_argument('--preference', type=str, default='usual',
+                       help='PROMETHEE preference function usual, linear, vshape or gaussian; one for all criteria '
+                            'or comma separated per criterion (default: usual)')
+    group.add_argument('--q', type=str, help='Indifference threshold(s) (PROMETHEE linear, ELECTRE III)')
+    group.add_argument('--p', type=str, help='Preference threshold(s) (PROMETHEE linear/vshape, ELECTRE III)')
+    group.add_argument('--s', type=str, help='PROMETHEE Gaussian threshold(s)')
+    group.add_argument('--v', type=str, help='ELECTRE III veto threshold(s) (default: no veto)')
+    group.add_argument('--cut', type=str, help='ELECTRE III credibility cut (default: first distillation level)')
+    group.add_argument('--concordance', type=str, help='ELECTRE I concordance threshold (default: mean)')
+    group.add_argument('--discordance', type=str, help='ELECTRE I discordance threshold (default: mean)')
+    return group
+
+def add_distance_arguments(parser):
+    group = parser.add_argument_group('Distance options (--ranking topsis)')
+    group.add_argument('--distance', choices=list(kernels.DISTANCE_METRICS), default='euclidean',
+                       help='Separation measure to the ideal and anti-ideal solutions (default: euclidean)')
+    group.add_argument('--minkowski-p', dest='minkowski_p', type=str,
+                       help='Exponent p >= 1 of --distance minkowski ("inf" for Chebyshev)')
+    return group
 
 def load_expected_results(filepath):
     """Load expected results from JSON file for comparison."""
@@ -126,135 +342,138 @@ def compare_results(actual, expected, tolerance=0.01):
     
     return all_match
 
-def verbose_topsis(matrix, weights, c_types, criteria_names, alternatives):
-    """Run TOPSIS with detailed step-by-step output."""
-    print("\n" + "="*60)
-    print("TOPSIS - DETAILED STEPS")
-    print("="*60)
+def print_steps(trace, section, criteria_names, alternatives, c_types, max_rows):
+    """Print the detailed steps recorded for one method (see explain.trace_steps)."""
+    print(explain.format_steps(trace, section, criteria_names, alternatives, c_types, max_rows))
+
+def report_profile(profiler, target):
+    """Print the stage breakdown, or write it as JSON when target is a file path."""
+    if profiler is None:
+        return
+    profiler.stop()
+    if target == '-':
+        print("="*60)
+        print("PROFILE")
+        print("="*60)
+        print(profiler.format_table())
+        print("="*60 + "\n")
+    else:
+        with open(target, 'w') as f:
+            f.write(profiler.to_json(indent=2))
+        print(f"✓ Profile written to: {target}")
+
+def batch_main(argv):
+    """`calculator.py batch`: score many input files on a process pool."""
+    from mcdm_calculator import batch
     
-    # Step 1: Vector Normalization
-    print("\nStep 1: Vector Normalization")
-    print("-" * 40)
-    norm_matrix = normalization.vector_normalization(matrix)
-    df_norm = pd.DataFrame(norm_matrix, index=alternatives, columns=criteria_names)
-    print(df_norm.to_string())
-    
-    # Step 2: Weighted Normalized Matrix
-    print("\nStep 2: Weighted Normalized Matrix")
-    print("-" * 40)
-    weighted_matrix = norm_matrix * weights
-    df_weighted = pd.DataFrame(weighted_matrix, index=alternatives, columns=criteria_names)
-    print(df_weighted.to_string())
-    
-    # Step 3: Ideal Solutions
-    print("\nStep 3: Ideal and Anti-Ideal Solutions")
-    print("-" * 40)
-    ideal = np.zeros(len(weights))
-    anti_ideal = np.zeros(len(weights))
-    
-    for j, c_type in enumerate(c_types):
-        if c_type == 1:  # Benefit
-            ideal[j] = np.max(weighted_matrix[:, j])
-            anti_ideal[j] = np.min(weighted_matrix[:, j])
-        else:  # Cost
-            ideal[j] = np.min(weighted_matrix[:, j])
-            anti_ideal[j] = np.max(weighted_matrix[:, j])
-    
-    df_ideal = pd.DataFrame({
-        'Criterion': criteria_names,
-        'Type': ['Benefit' if t == 1 else 'Cost' for t in c_types],
-        'Ideal (A*)': ideal,
-        'Anti-Ideal (A-)': anti_ideal
-    })
-    print(df_ideal.to_string(index=False))
-    
-    # Step 4: Separation Measures
-    print("\nStep 4: Separation Measures (Euclidean Distance)")
-    print("-" * 40)
-    dist_ideal = np.sqrt(np.sum((weighted_matrix - ideal)**2, axis=1))
-    dist_anti_ideal = np.sqrt(np.sum((weighted_matrix - anti_ideal)**2, axis=1))
-    
-    df_dist = pd.DataFrame({
-        'Alternative': alternatives,
-        'S+ (to Ideal)': dist_ideal,
-        'S- (to Anti-Ideal)': dist_anti_ideal
-    })
-    print(df_dist.to_string(index=False))
-    
-    # Step 5: Closeness Coefficient
-    print("\nStep 5: Closeness Coefficient")
-    print("-" * 40)
-    scores = dist_anti_ideal / (dist_ideal + dist_anti_ideal + 1e-9)
-    
-    df_scores = pd.DataFrame({
-        'Alternative': alternatives,
-        'Closeness (C)': scores,
-        'Rank': pd.Series(scores).rank(ascending=False).astype(int)
-    })
-    df_scores = df_scores.sort_values('Rank')
-    print(df_scores.to_string(index=False))
+    parser = argparse.ArgumentParser(
+        prog="calculator.py batch",
+        description="Score many decision matrices in one run (one interpreter, a pool of worker processes)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # One JSON-lines file per input in results/
+  python calculator.py batch "data/*.csv" --types "cost,benefit,benefit,benefit" --output-dir results
+  
+  # All inputs of a directory into one CSV stream on stdout
+  python calculator.py batch data/ --format csv --combined -
+        """
+    )
+    parser.add_argument('inputs', nargs='+', help='Input files, glob patterns or directories')
+    parser.add_argument('--weights', type=str, default='merec',
+                       choices=['merec', 'entropy', 'critic', 'equal', 'manual'],
+                       help='Weighting method (default: merec)')
+    parser.add_argument('--ranking', type=str, default='topsis',
+                       choices=['topsis', 'vikor', 'mairca', 'promethee', 'electre1', 'electre3'],
+                       help='Ranking method (default: topsis)')
+    parser.add_argument('--types', type=str,
+                       help='Criteria types applied to every file, e.g., "-1,1,1,1". Default: types row/sidecar of each file, else all benefit')
+    parser.add_argument('--manual-weights', type=str,
+                       help='Manual weights (comma separated) if --weights=manual')
+    parser.add_argument('--top-k', type=int, metavar='K',
+                       help='Only keep the K best alternatives of each file')
+    parser.add_argument('--format', choices=batch.OUTPUT_FORMATS, default='jsonl',
+                       help='Output format (default: jsonl)')
+    parser.add_argument('--output-dir', default='.',
+                       help='Directory for the per-file outputs <name>_<ranking>_<weights>.<format> (default: .)')
+    parser.add_argument('--combined', metavar='FILE',
+                       help='Write all results to one stream instead (with a File column); "-" for stdout')
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64',
+                       help='Compute precision (default: float64)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Worker processes (default: CPU count, 1 = in-process)')
+    add_outranking_arguments(parser)
+    add_distance_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    files = batch.expand_inputs(args.inputs)
+    if not files:
+        print("Error: no input files matched")
+        sys.exit(1)
     
-    print("="*60 + "\n")
-    return scores
-
-def verbose_merec(matrix, c_types, criteria_names):
-    """Run MEREC with detailed step-by-step output."""
-    print("\n" + "="*60)
-    print("MEREC - DETAILED STEPS")
-    print("="*60)
+    options = {
+        'weights': args.weights,
+        'ranking': args.ranking,
+        'types': args.types,
+        'manual_weights': args.manual_weights,
+        'top_k': args.top_k,
+        'format': args.format,
+        'dtype': args.dtype,
+        'output_dir': None if args.combined else args.output_dir,
+        'ranking_options': option_strings(args),
+    }
+    if args.combined is None:
+        outputs = [batch.output_path(f, args.output_dir, args.ranking, args.weights, args.format) for f in files]
+        if len(set(outputs)) != len(outputs):
+            print("Error: input files with the same name would overwrite each other; use --combined")
+            sys.exit(1)
+        os.makedirs(args.output_dir, exist_ok=True)
     
-    # Step 1: Normalization
-    print("\nStep 1: Normalization (min/x for benefit, x/max for cost)")
-    print("-" * 40)
-    n_matrix = np.zeros_like(matrix, dtype=float)
-    min_vals = np.min(matrix, axis=0)
-    max_vals = np.max(matrix, axis=0)
-    
-    for j, c_type in enumerate(c_types):
-        if c_type == 1:  # Benefit
-            n_matrix[:, j] = min_vals[j] / np.where(matrix[:, j] == 0, 1e-9, matrix[:, j])
-        else:  # Cost
-            n_matrix[:, j] = matrix[:, j] / np.where(max_vals[j] == 0, 1, max_vals[j])
-    
-    df_norm = pd.DataFrame(n_matrix, columns=criteria_names)
-    print(df_norm.to_string())
-    
-    # Step 2: Overall Performance
-    print("\nStep 2: Overall Performance (S_i)")
-    print("-" * 40)
-    n_matrix = np.where(n_matrix <= 0, 1e-9, n_matrix)
-    m = matrix.shape[1]
-    S = np.log(1 + (1/m * np.sum(np.abs(np.log(n_matrix)), axis=1)))
-    print(f"S values: {S}")
-    
-    # Step 3: Removal Effects
-    print("\nStep 3: Removal Effects (E_j)")
-    print("-" * 40)
-    E = np.zeros(m)
-    
-    for j in range(m):
-        n_matrix_excl = np.delete(n_matrix, j, axis=1)
-        S_prime = np.log(1 + (1/m * np.sum(np.abs(np.log(n_matrix_excl)), axis=1)))
-        E[j] = np.sum(np.abs(S_prime - S))
-        print(f"  E_{criteria_names[j]}: {E[j]:.6f}")
-    
-    # Step 4: Final Weights
-    print("\nStep 4: Final Weights")
-    print("-" * 40)
-    weights = E / np.sum(E)
-    
-    df_weights = pd.DataFrame({
-        'Criterion': criteria_names,
-        'Removal Effect (E)': E,
-        'Weight': weights
-    })
-    print(df_weights.to_string(index=False))
-    print(f"\nSum of weights: {np.sum(weights):.6f}")
+    # Progress goes to stderr when the results themselves are written to stdout
+    log = sys.stderr if args.combined == '-' else sys.stdout
+    stream = None
+    if args.combined:
+        stream = sys.stdout if args.combined == '-' else open(args.combined, 'w', newline='')
     
-    print("="*60 + "\n")
-    return weights
+    start = time.perf_counter()
+    failed = 0
+    header = True
+    try:
+        for report in batch.run_batch(files, options, args.workers):
+            if not report['ok']:
+                failed += 1
+                print(f"✗ {report['file']} ({report['seconds']:.3f}s): {report['error']}", file=log)
+                continue
+            if stream is not None:
+                results = report['results']
+                results.insert(0, 'File', report['file'])
+                if args.format == 'csv':
+                    results.to_csv(stream, header=header, index=False)
+                    header = False
+                else:
+                    batch.write_results(results, stream, 'jsonl')
+                target = args.combined
+            else:
+                target = report['output']
+            print(f"✓ {report['file']} ({report['alternatives']} alternatives, "
+                  f"{report['seconds']:.3f}s) -> {target}", file=log)
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    
+    print(f"\nProcessed {len(files)} files in {time.perf_counter() - start:.3f}s: "
+          f"{len(files) - failed} ok, {failed} failed", file=log)
+    if failed:
+        sys.exit(1)
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'batch':
+        return batch_main(argv[1:])
+    if argv and argv[0] == 'serve':
+        from mcdm_calculator import server
+        return server.main(argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="MCDM Calculator CLI - Multi-Criteria Decision Making Tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -268,15 +487,31 @@ Examples:
   
   # Compare with expected results
   python calculator.py data.csv --compare expected.json --verbose
+  
+  # PROMETHEE II with a linear preference function (thresholds in criterion units)
+  python calculator.py data.csv --ranking promethee --preference linear --q 1 --p 5
+  
+  # ELECTRE III with per-criterion thresholds; prints the kernel of the outranking relation
+  python calculator.py data.csv --ranking electre3 --q "10,1,1,0" --p "30,4,2,1" --v "100,16,8,4"
+  
+  # Stream a very large file in chunks of 500k rows
+  python calculator.py big.csv --weights equal --ranking topsis --stream --chunk-size 500000
+  
+  # Score every CSV of a directory on a process pool (see: calculator.py batch --help)
+  python calculator.py batch data/ --types "cost,benefit,benefit,benefit" --output-dir results
+  
+  # HTTP/JSON scoring server (see: calculator.py serve --help)
+  python calculator.py serve --port 8000
         """
     )
     
-    parser.add_argument('data', type=str, help='Path to input CSV file')
+    parser.add_argument('data', type=str,
+                       help='Path to input file (.csv, .npy, .npz, .parquet, .feather, .xlsx)')
     parser.add_argument('--weights', type=str, default='merec', 
                        choices=['merec', 'entropy', 'critic', 'equal', 'manual'], 
                        help='Weighting method (default: merec)')
     parser.add_argument('--ranking', type=str, default='topsis', 
-                       choices=['topsis', 'vikor', 'mairca'], 
+                       choices=['topsis', 'vikor', 'mairca', 'promethee', 'electre1', 'electre3'], 
                        help='Ranking method (default: topsis)')
     parser.add_argument('--types', type=str, 
                        help='Criteria types. Comma separated, e.g., "-1,1,1,1" or "cost,benefit,benefit,benefit". Default: all benefit')
@@ -284,18 +519,43 @@ Examples:
                        help='Manual weights (comma separated) if --weights=manual')
     parser.add_argument('--verbose', '-v', action='store_true', 
                        help='Show detailed step-by-step calculations')
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64',
+                       help='Compute precision; float32 halves memory use (default: float64)')
+    parser.add_argument('--max-rows', type=int, default=explain.MAX_ROWS,
+                       help=f'Rows shown per printed table; larger tables are truncated (default: {explain.MAX_ROWS})')
     parser.add_argument('--compare', type=str, metavar='FILE',
                        help='Compare results with expected values from JSON file')
     parser.add_argument('--tolerance', type=float, default=0.01,
                        help='Tolerance for comparison (default: 0.01)')
-    
-    args = parser.parse_args()
+    parser.add_argument('--stream', action='store_true',
+                       help='Out-of-core mode: read the CSV/.npy in chunks and stream scores to the output file')
+    parser.add_argument('--chunk-size', type=int, default=100000,
+                       help='Rows per chunk in --stream mode (default: 100000)')
+    parser.add_argument('--top-k', type=int, metavar='K',
+                       help='Only rank and save the K best alternatives (no full sort)')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                       help='Record per-stage time and peak memory; print a table, or write JSON to FILE')
+    outranking_group = add_outranking_arguments(parser)
+    outranking_group.add_argument('--workers', type=int,
+                                  help='Worker processes for the tiled PROMETHEE (Gaussian) flows (default: in-process)')
+    add_distance_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    
+    profiler = Profiler(memory=True).start() if args.profile else None
+    
+    if args.stream:
+        with stage('stream'):
+            run_stream(args)
+        report_profile(profiler, args.profile)
+        return
     
     # 1. Load Data
-    df = load_data(args.data)
-    matrix = df.values
-    criteria_names = list(df.columns)
-    alternatives = list(df.index)
+    with stage('load'):
+        data = load_data(args.data)
+    matrix = kernels.as_float(data.matrix, args.dtype)
+    criteria_names = data.criteria
+    alternatives = data.alternatives
     m, n = matrix.shape
     
     print("\n" + "="*60)
@@ -305,43 +565,37 @@ Examples:
     print(f"Alternatives: {m}")
     print(f"Criteria: {n}")
     print("\nDecision Matrix:")
-    print(df.to_string())
-    
-    # 2. Parse Types
-    c_types = parse_criteria_types(args.types, n)
+    table, note = explain.matrix_table(matrix, alternatives, criteria_names, args.max_rows)
+    print(table.to_string())
+    if note:
+        print(note)
+    
+    # 2. Parse Types (--types wins over a types row / sidecar file in the input)
+    if args.types or data.criteria_types is None:
+        c_types = parse_criteria_types(args.types, n)
+    else:
+        c_types = data.criteria_types
     print(f"\nCriteria Types: {['Benefit' if t == 1 else 'Cost' for t in c_types]}")
+    ranking_options = parse_ranking_options(args, n)
     
     # 3. Calculate Weights
-    if args.weights == 'manual':
-        if not args.manual_weights:
-            print("Error: --manual-weights required when --weights=manual")
-            sys.exit(1)
-        try:
-            w = [float(x) for x in args.manual_weights.split(',')]
-            if len(w) != n:
-                raise ValueError(f"Expected {n} weights, got {len(w)}")
-            weights = np.array(w)
-            weights = weights / np.sum(weights)  # Normalize
-        except Exception as e:
-            print(f"Error parsing manual weights: {e}")
-            sys.exit(1)
-    elif args.weights == 'equal':
-        weights = np.ones(n) / n
-    elif args.weights == 'entropy':
-        if args.verbose:
-            print("\n[Entropy method - verbose mode not yet implemented for this method]")
-        weights = weighting.entropy_weighting(matrix)
-    elif args.weights == 'critic':
-        if args.verbose:
-            print("\n[CRITIC method - verbose mode not yet implemented for this method]")
-        weights = weighting.critic_weighting(matrix)
-    elif args.weights == 'merec':
-        if args.verbose:
-            weights = verbose_merec(matrix, c_types, criteria_names)
-        else:
-            weights = weighting.merec_weighting(matrix, c_types)
-    
-    if not args.verbose or args.weights not in ['merec']:
+    # Verbose mode records the intermediate arrays during the single computation
+    trace = Trace() if args.verbose else None
+    with stage('weights'):
+        if args.weights == 'manual':
+            weights = parse_manual_weights(args.manual_weights, n)
+        elif args.weights == 'equal':
+            weights = np.ones(n) / n
+        elif args.weights == 'entropy':
+            weights = weighting.entropy_weighting(matrix, trace=trace)
+        elif args.weights == 'critic':
+            weights = weighting.critic_weighting(matrix, trace=trace)
+        elif args.weights == 'merec':
+            weights = weighting.merec_weighting(matrix, c_types, trace=trace)
+    
+    if args.verbose and args.weights in trace:
+        print_steps(trace, args.weights, criteria_names, alternatives, c_types, args.max_rows)
+    else:
         print(f"\n{'='*60}")
         print(f"WEIGHTS ({args.weights.upper()})")
         print('='*60)
@@ -350,44 +604,76 @@ Examples:
         print(f"\nSum of weights: {np.sum(weights):.6f}")
     
     # 4. Ranking
-    if args.ranking == 'topsis':
-        if args.verbose:
-            scores = verbose_topsis(matrix, weights, c_types, criteria_names, alternatives)
-        else:
-            scores = ranking.topsis_ranking(matrix, weights, c_types)
-        score_col = 'Score (Closeness)'
-        ascending = False  # Higher is better
-    elif args.ranking == 'vikor':
-        if args.verbose:
-            print("\n[VIKOR verbose mode not yet implemented]")
-        scores = ranking.vikor_ranking(matrix, weights, c_types)
-        score_col = 'Q Value'
-        ascending = True  # Lower is better
-    elif args.ranking == 'mairca':
-        if args.verbose:
-            print("\n[MAIRCA verbose mode not yet implemented]")
-        scores = ranking.mairca_ranking(matrix, weights, c_types)
-        score_col = 'Total Gap'
-        ascending = True  # Lower is better
+    with stage('ranking'):
+        if args.ranking == 'topsis':
+            scores = ranking.topsis_ranking(matrix, weights, c_types, trace=trace, **(ranking_options or {}))
+            score_col = 'Score (Closeness)'
+            ascending = False  # Higher is better
+        elif args.ranking == 'vikor':
+            scores = ranking.vikor_ranking(matrix, weights, c_types, trace=trace)
+            score_col = 'Q Value'
+            ascending = True  # Lower is better
+        elif args.ranking == 'mairca':
+            scores = ranking.mairca_ranking(matrix, weights, c_types, trace=trace)
+            score_col = 'Total Gap'
+            ascending = True  # Lower is better
+        elif args.ranking == 'promethee':
+            scores = ranking.promethee_ranking(matrix, weights, c_types, workers=args.workers, trace=trace,
+                                               **ranking_options)
+            score_col = 'Net Flow'
+            ascending = False  # Higher is better
+        elif args.ranking in ('electre1', 'electre3'):
+            # Traced in any case: the kernel is read from the relation built for the scores
+            trace = trace if trace is not None else Trace()
+            electre = ranking.electre1_ranking if args.ranking == 'electre1' else ranking.electre3_ranking
+            scores = electre(matrix, weights, c_types, trace=trace, **ranking_options)
+            score_col = 'Net Outranking'
+            ascending = False  # Higher is better
+    
+    if args.verbose:
+        print_steps(trace, args.ranking, criteria_names, alternatives, c_types, args.max_rows)
     
     # 5. Output
-    results = pd.DataFrame({
-        'Alternative': alternatives,
-        score_col: scores
-    })
-    
-    results['Rank'] = results[score_col].rank(ascending=ascending).astype(int)
-    results = results.sort_values('Rank')
+    import pandas as pd
+    with stage('format'):
+        if args.top_k:
+            # Partial selection of the k best; ranks match the full ranking
+            idx, ranks = selection.top_k(scores, args.top_k, ascending)
+            results = pd.DataFrame({
+                'Alternative': [alternatives[i] for i in idx],
+                score_col: scores[idx],
+                'Rank': ranks
+            })
+        else:
+            results = pd.DataFrame({
+                'Alternative': alternatives,
+                score_col: scores
+            })
+        
+            results['Rank'] = results[score_col].rank(ascending=ascending).astype(int)
+            results = results.sort_values('Rank')
+        if args.ranking in ('electre1', 'electre3'):
+            kernel, cycles = trace.get(args.ranking, 'kernel')
+            results['Kernel'] = kernel[idx] if args.top_k else kernel[results.index.to_numpy()]
     
     if not args.verbose:
         print(f"\n{'='*60}")
         print(f"RANKING RESULTS ({args.ranking.upper()})")
         print('='*60)
-        print(results.to_string(index=False))
+        print(results.head(args.max_rows).to_string(index=False))
+        if len(results) > args.max_rows:
+            print(f"... {len(results) - args.max_rows} more rows in the output file")
+    if args.ranking in ('electre1', 'electre3'):
+        names = [str(alternatives[i]) for i in np.flatnonzero(kernel)]
+        more = f" ... ({len(names) - args.max_rows} more)" if len(names) > args.max_rows else ""
+        print(f"\nKernel ({len(names)} of {m}): {', '.join(names[:args.max_rows])}{more}")
+        if cycles:
+            print(f"  {len(cycles)} outranking cycle(s) entered the kernel as a whole")
     
     # Save
     out_file = f"result_{args.ranking}_{args.weights}.csv"
-    results.to_csv(out_file, index=False)
+    with stage('write_csv'):
+        results.to_csv(out_file, index=False)
     print(f"\n✓ Results saved to: {out_file}")
     
     # 6. Comparison (if requested)
@@ -402,6 +688,7 @@ Examples:
             compare_results(actual, expected, args.tolerance)
     
     print("="*60 + "\n")
+    report_profile(profiler, args.profile)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,213 @@
+import heapq
+import numpy as np
+from .kernels import benefit_mask, split_columns
+from .streaming import ColumnStats, scores_from_stats
+
+class _ExtremeHeap:
+    """
+    Multiset of one column's live values supporting min or max queries.
+    Deleted or overwritten entries are dropped lazily when they reach the top,
+    so each operation is O(log m) amortized.
+    """
+    def __init__(self, largest):
+        self.sign = -1.0 if largest else 1.0
+        self.heap = []
+
+    def push(self, value, slot, version):
+        heapq.heappush(self.heap, (self.sign * value, slot, version))
+
+    def top(self, versions):
+        heap = self.heap
+        while heap and versions[heap[0][1]] != heap[0][2]:
+            heapq.heappop(heap)
+        return self.sign * heap[0][0] if heap else np.nan
+
+class DecisionModel:
+    """
+    Decision matrix that supports adding, removing and editing alternatives
+    while keeping the column statistics used by vector, min-max and linear
+    normalization and by the TOPSIS/VIKOR ideals up to date:
+    sums, sums of squares, and min/max (as multisets, so deletions work).
+    
+    Insert/delete/update cost O(n), plus O(n log m) heap work for columns whose
+    extreme value changes. Scores are computed from the maintained statistics
+    and match a full recompute on model.matrix.
+    """
+    def __init__(self, matrix, criteria_types, alternatives=None):
+        matrix = np.array(matrix, dtype=float)
+        m, n = matrix.shape
+        self.criteria_types = list(criteria_types)
+        self.mask = benefit_mask(criteria_types)
+        
+        capacity = max(16, 2 * m)
+        self._rows = np.zeros((capacity, n))
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._versions = np.zeros(capacity, dtype=np.int64) # bumped on every removal
+        self._labels = [None] * capacity
+        self._slots = {}
+        self._free = []
+        self._next = 0
+        
+        self.stats = ColumnStats(n)
+        self._min_heaps = [_ExtremeHeap(largest=False) for _ in range(n)]
+        self._max_heaps = [_ExtremeHeap(largest=True) for _ in range(n)]
+        
+        if alternatives is None:
+            alternatives = [f"A{i + 1}" for i in range(m)]
+        for label, row in zip(alternatives, matrix):
+            self.add(label, row)
+
+    def __len__(self):
+        return self.stats.count
+
+    def _allocate(self):
+        if self._free:
+            return self._free.pop()
+        if self._next == len(self._alive):
+            grow = len(self._alive)
+            self._rows = np.vstack([self._rows, np.zeros_like(self._rows)])
+            self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+            self._versions = np.concatenate([self._versions, np.zeros(grow, dtype=np.int64)])
+            self._labels.extend([None] * grow)
+        slot = self._next
+        self._next += 1
+        return slot
+
+    def _compact_heaps(self):
+        """Rebuild the heaps from live rows once stale entries dominate."""
+        slots = np.flatnonzero(self._alive)
+        versions = self._versions[slots]
+        for j in range(self._rows.shape[1]):
+            values = self._rows[slots, j]
+            self._min_heaps[j].heap = list(zip(values, slots, versions))
+            self._max_heaps[j].heap = list(zip(-values, slots, versions))
+            heapq.heapify(self._min_heaps[j].heap)
+            heapq.heapify(self._max_heaps[j].heap)
+
+    def _insert_slot(self, slot, row):
+        if self._min_heaps and len(self._min_heaps[0].heap) > 4 * self.stats.count + 64:
+            self._compact_heaps()
+        version = self._versions[slot]
+        self._rows[slot] = row
+        self._alive[slot] = True
+        
+        stats = self.stats
+        stats.count += 1
+        stats.sum += row
+        stats.sumsq += row * row
+        np.minimum(stats.min, row, out=stats.min)
+        np.maximum(stats.max, row, out=stats.max)
+        for j, value in enumerate(row):
+            self._min_heaps[j].push(value, slot, version)
+            self._max_heaps[j].push(value, slot, version)
+
+    def _remove_slot(self, slot):
+        row = self._rows[slot]
+        self._alive[slot] = False
+        self._versions[slot] += 1 # invalidates this slot's heap entries
+        
+        stats = self.stats
+        stats.count -= 1
+        stats.sum -= row
+        stats.sumsq -= row * row
+        
+        # Only columns where this row held the extreme need the heaps
+        for j in np.flatnonzero(row == stats.min):
+            stats.min[j] = self._min_heaps[j].top(self._versions)
+        for j in np.flatnonzero(row == stats.max):
+            stats.max[j] = self._max_heaps[j].top(self._versions)
+        if stats.count == 0:
+            stats.min[:] = np.inf
+            stats.max[:] = -np.inf
+        return row.copy()
+
+    def _checked_row(self, row):
+        row = np.asarray(row, dtype=float)
+        if row.shape != (self._rows.shape[1],):
+            raise ValueError(f"Expected {self._rows.shape[1]} criteria values, got {row.shape}")
+        return row
+
+    def add(self, label, row):
+        """Add an alternative."""
+        if label in self._slots:
+            raise ValueError(f"Alternative already exists: {label}")
+        row = self._checked_row(row)
+        slot = self._allocate()
+        self._labels[slot] = label
+        self._slots[label] = slot
+        self._insert_slot(slot, row)
+
+    def remove(self, label):
+        """Remove an alternative; returns its row."""
+        if label not in self._slots:
+            raise KeyError(label)
+        slot = self._slots.pop(label)
+        self._labels[slot] = None
+        row = self._remove_slot(slot)
+        self._free.append(slot)
+        return row
+
+    def update(self, label, row):
+        """Replace the criteria values of an existing alternative."""
+        if label not in self._slots:
+            raise KeyError(label)
+        row = self._checked_row(row)
+        slot = self._slots[label]
+        self._remove_slot(slot)
+        self._insert_slot(slot, row)
+
+    @property
+    def alternatives(self):
+        """Labels of the live alternatives, in the same order as matrix."""
+        return [self._labels[s] for s in np.flatnonzero(self._alive)]
+
+    @property
+    def matrix(self):
+        """Live decision matrix (copy)."""
+        return self._rows[self._alive]
+
+    def normalize(self, method):
+        """
+        Normalized live matrix from the maintained statistics.
+        method: 'vector', 'min_max' or 'linear'
+        """
+        matrix = self.matrix
+        stats = self.stats
+        if method == 'vector':
+            norm = stats.norm
+            return matrix / np.where(norm == 0, 1, norm)
+        elif method == 'min_max':
+            best = np.where(self.mask, stats.max, stats.min)
+            worst = np.where(self.mask, stats.min, stats.max)
+            span = best - worst
+            return (matrix - worst) / np.where(span == 0, 1, span)
+        elif method == 'linear':
+            div = np.where(stats.max != 0, stats.max, 1)
+            
+            def benefit(cols):
+                return matrix[:, cols] / div[cols]
+            
+            def cost(cols):
+                denom = matrix[:, cols]
+                return stats.min[cols] / np.where(denom == 0, 1e-9, denom)
+            
+            return split_columns(self.mask, benefit, cost, np.empty_like(matrix))
+        raise ValueError(f"Unknown normalization method: {method}")
+
+    def scores(self, weights, method='topsis', v=0.5):
+        """
+        Ranking scores of the live alternatives (aligned with alternatives).
+        method: 'topsis', 'vikor' or 'mairca'
+        """
+        if self.stats.count == 0:
+            raise ValueError("Decision model has no alternatives")
+        return scores_from_stats(self.matrix, weights, self.mask, self.stats, method, v)
+
+    def refresh(self):
+        """
+        Recompute sums from scratch to clear floating-point drift accumulated
+        over many incremental updates.
+        """
+        matrix = self.matrix
+        self.stats.sum = np.sum(matrix, axis=0)
+        self.stats.sumsq = np.einsum('ij,ij->j', matrix, matrix)
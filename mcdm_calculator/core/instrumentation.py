@@ -0,0 +1,165 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Opt-in per-stage timing and memory instrumentation.
+# When no Profiler is active, stage() and @instrumented cost one flag check.
+
+_state = {'active': 0, 'memory': 0}
+_listeners = []
+_local = threading.local()
+
+class StageRecord:
+    """
+    Measurements of one completed stage.
+    start_s: perf_counter() value when the stage began
+    wall_s / cpu_s: wall-clock and process CPU time in seconds
+    peak_bytes: peak traced allocation above the stage's starting point
+                (None when memory tracking is off)
+    """
+    __slots__ = ('name', 'parent', 'depth', 'start_s', 'wall_s', 'cpu_s', 'peak_bytes')
+
+    def __init__(self, name, parent, depth, start_s, wall_s, cpu_s, peak_bytes):
+        self.name = name
+        self.start_s = start_s
+        self.parent = parent
+        self.depth = depth
+        self.wall_s = wall_s
+        self.cpu_s = cpu_s
+        self.peak_bytes = peak_bytes
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+def add_listener(callback):
+    """Register callback(StageRecord), called whenever an instrumented stage finishes."""
+    _listeners.append(callback)
+    return callback
+
+def remove_listener(callback):
+    _listeners.remove(callback)
+
+def is_active():
+    return _state['active'] > 0
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+@contextmanager
+def stage(name):
+    """
+    Measure the enclosed block as a named stage.
+    Nested stages are recorded with their parent; tracemalloc has a single
+    global peak, so a parent's peak is carried over its children's resets.
+    Memory figures are approximate when stages run on several threads at once.
+    """
+    if not _state['active']:
+        yield
+        return
+    
+    stack = _stack()
+    track_memory = _state['memory'] and tracemalloc.is_tracing()
+    frame = {'name': name, 'carry': 0, 'start_mem': 0}
+    if track_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]['carry'] = max(stack[-1]['carry'], peak)
+        frame['start_mem'] = current
+        tracemalloc.reset_peak()
+    stack.append(frame)
+    
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        stack.pop()
+        peak_bytes = None
+        if track_memory:
+            abs_peak = max(tracemalloc.get_traced_memory()[1], frame['carry'])
+            peak_bytes = max(0, abs_peak - frame['start_mem'])
+            if stack:
+                stack[-1]['carry'] = max(stack[-1]['carry'], abs_peak)
+        record = StageRecord(name, stack[-1]['name'] if stack else None, len(stack),
+                             wall0, wall, cpu, peak_bytes)
+        for callback in list(_listeners):
+            callback(record)
+
+def instrumented(name):
+    """Decorator recording every call of a core function as a stage."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _state['active']:
+                return fn(*args, **kwargs)
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class Profiler:
+    """
+    Activates instrumentation and collects every StageRecord.
+    
+        with Profiler(memory=True) as prof:
+            calculate_mcdm(...)
+        print(prof.format_table())
+    
+    memory=True starts tracemalloc (if not already running) for peak allocation.
+    """
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.records = []
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def _collect(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def start(self):
+        if self.memory:
+            _state['memory'] += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+        _state['active'] += 1
+        add_listener(self._collect)
+        return self
+
+    def stop(self):
+        remove_listener(self._collect)
+        _state['active'] -= 1
+        if self.memory:
+            _state['memory'] -= 1
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def as_dicts(self):
+        return [r.as_dict() for r in self.records]
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dicts(), **kwargs)
+
+    def format_table(self):
+        """Indented stage breakdown, in start order."""
+        lines = [f"{'Stage':40s} {'Wall (ms)':>10s} {'CPU (ms)':>10s} {'Peak (MiB)':>11s}"]
+        for r in sorted(self.records, key=lambda r: r.start_s):
+            peak = f"{r.peak_bytes / 2**20:11.2f}" if r.peak_bytes is not None else f"{'-':>11s}"
+            name = '  ' * r.depth + r.name
+            lines.append(f"{name:40s} {r.wall_s * 1e3:10.3f} {r.cpu_s * 1e3:10.3f} {peak}")
+        return "\n".join(lines)
@@ -0,0 +1,130 @@
+import numpy as np
+
+FLOAT_DTYPES = (np.float32, np.float64)
+
+def as_float(matrix, dtype=None):
+    """
+    The matrix as a floating-point array, copying only when a conversion is needed.
+    float32/float64 input keeps its dtype unless dtype is given; anything else
+    (integers, lists, object arrays) becomes float64.
+    Core functions never write into their input, so no defensive copy is made.
+    """
+    arr = np.asarray(matrix)
+    if dtype is None:
+        dtype = arr.dtype if arr.dtype in FLOAT_DTYPES else np.float64
+    return arr.astype(dtype, copy=False)
+
+def benefit_mask(criteria_types):
+    """
+    Convert criteria types (1 = benefit, anything else = cost) into a boolean mask.
+    A mask that is already boolean is returned unchanged, so callers can
+    build it once and pass it to several kernels.
+    """
+    types = np.asarray(criteria_types)
+    if types.dtype == bool:
+        return types
+    return types == 1
+
+def column_extremes(matrix, axis=0):
+    """
+    Column minima and maxima of the matrix.
+    """
+    return np.min(matrix, axis=axis), np.max(matrix, axis=axis)
+
+def best_worst(matrix, criteria_types, axis=0, extremes=None):
+    """
+    Best and worst value of each criterion.
+    Benefit: best = max, worst = min
+    Cost:    best = min, worst = max
+    extremes: optional precomputed (min_vals, max_vals) of the matrix
+    """
+    mask = benefit_mask(criteria_types)
+    min_vals, max_vals = extremes if extremes is not None else column_extremes(matrix, axis=axis)
+    best = np.where(mask, max_vals, min_vals)
+    worst = np.where(mask, min_vals, max_vals)
+    return best, worst
+
+def split_columns(mask, benefit_fn, cost_fn, out):
+    """
+    Fill `out` column-wise: benefit columns from benefit_fn(cols), cost columns
+    from cost_fn(cols), where cols is the boolean column selector passed in.
+    Each function only sees its own columns, so no work is done twice.
+    """
+    cost = ~mask
+    if mask.any():
+        out[:, mask] = benefit_fn(mask)
+    if cost.any():
+        out[:, cost] = cost_fn(cost)
+    return out
+
+DISTANCE_METRICS = ('euclidean', 'manhattan', 'chebyshev', 'minkowski')
+# Size of the float64 (rows, n) row blocks of scaled_distances
+DISTANCE_BLOCK_BYTES = 64 * 1024
+
+def distance_metric(metric, p=None):
+    """
+    Validated (metric, p); Minkowski with p = 1, 2 or inf becomes Manhattan,
+    Euclidean or Chebyshev. Raises ValueError.
+    """
+    if metric not in DISTANCE_METRICS:
+        raise ValueError(f"Unknown distance metric: {metric}. Use one of {', '.join(DISTANCE_METRICS)}")
+    if metric != 'minkowski':
+        return metric, None
+    if p is None or not p >= 1:
+        raise ValueError("Minkowski distance needs p >= 1")
+    p = float(p)
+    special = {1.0: 'manhattan', 2.0: 'euclidean', np.inf: 'chebyshev'}
+    return (special[p], None) if p in special else ('minkowski', p)
+
+def scaled_distances(matrix, scale, points, metric='euclidean', p=None, out=None, norm=None, blocks=None):
+    """
+    Distances from every row of matrix * scale (never formed) to each of k points.
+
+    The matrix is read in row blocks of about DISTANCE_BLOCK_BYTES: each block
+    is scaled once into a float64 buffer and every point is subtracted from it
+    directly. The expansion ||x||^2 - 2 x.y + ||y||^2 is not used, since it
+    cancels badly for columns with a large offset. Memory beyond the input and
+    output is two blocks.
+
+    out: optional sequence of k (m,) arrays for the results
+    norm: optional column divisors; rows are then (x / norm) * scale, rounded
+          exactly like a normalized-then-weighted matrix
+    blocks: optional pair of float64 (rows, n) buffers to use as the two blocks
+    Returns the list of k (m,) distance arrays (dtype of the matrix).
+    """
+    matrix = as_float(matrix)
+    m, n = matrix.shape
+    scale = np.asarray(scale, dtype=np.float64)
+    norm = None if norm is None else np.asarray(norm, dtype=np.float64)
+    points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+    metric, p = distance_metric(metric, p)
+    if out is None:
+        out = [np.empty(m, dtype=matrix.dtype) for _ in points]
+
+    if blocks is None:
+        rows = max(1, DISTANCE_BLOCK_BYTES // (8 * max(n, 1)))
+        blocks = (np.empty((min(rows, m), n)), np.empty((min(rows, m), n)))
+    scaled, diff = blocks
+    rows = len(scaled)
+    for i0 in range(0, m, rows):
+        i1 = min(i0 + rows, m)
+        b, d = scaled[:i1 - i0], diff[:i1 - i0]
+        if norm is None:
+            np.multiply(matrix[i0:i1], scale, out=b)
+        else:
+            np.divide(matrix[i0:i1], norm, out=b)
+            b *= scale
+        for point, dist in zip(points, out):
+            np.subtract(b, point, out=d)
+            if metric == 'euclidean':
+                dist[i0:i1] = np.sqrt(np.einsum('ij,ij->i', d, d))
+                continue
+            np.abs(d, out=d)
+            if metric == 'manhattan':
+                dist[i0:i1] = np.sum(d, axis=1)
+            elif metric == 'chebyshev':
+                dist[i0:i1] = np.max(d, axis=1)
+            else:
+                np.power(d, p, out=d)
+                dist[i0:i1] = np.sum(d, axis=1) ** (1 / p)
+    return out
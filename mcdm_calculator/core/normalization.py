@@ -1,66 +1,95 @@
 import numpy as np
+from .kernels import benefit_mask, best_worst, column_extremes, split_columns, as_float
+from .instrumentation import instrumented
 
-def vector_normalization(matrix):
+@instrumented('normalization.vector_normalization')
+def vector_normalization(matrix, workspace=None):
     """
     Normalizes the decision matrix using vector normalization.
     x_ij = x_ij / sqrt(sum(x_ij^2))
+    workspace: optional Workspace; the result is written to its 'normalized' buffer
     """
-    matrix = np.array(matrix, dtype=float)
-    norm = np.linalg.norm(matrix, axis=0)
+    if workspace is None:
+        matrix = as_float(matrix)
+        norm = np.linalg.norm(matrix, axis=0)
+    else:
+        matrix = workspace.check(as_float(matrix, workspace.dtype))
+        # Same steps as np.linalg.norm, with the squares in the scratch buffer
+        squares = np.multiply(matrix, matrix, out=workspace.matrix('scratch'))
+        norm = np.sqrt(np.sum(squares, axis=0))
     norm = np.where(norm == 0, 1, norm) # Avoid division by zero
-    return matrix / norm
+    if workspace is None:
+        return matrix / norm
+    return np.divide(matrix, norm, out=workspace.matrix('normalized'))
 
+@instrumented('normalization.min_max_normalization')
 def min_max_normalization(matrix, criteria_types):
     """
     Normalizes the matrix using Min-Max method.
     criteria_types: list of 1 (benefit) or -1 (cost)
     """
-    matrix = np.array(matrix, dtype=float)
-    normalized = np.zeros_like(matrix)
+    matrix = as_float(matrix)
     
-    min_vals = np.min(matrix, axis=0)
-    max_vals = np.max(matrix, axis=0)
-    ranges = max_vals - min_vals
-    ranges = np.where(ranges == 0, 1, ranges) # Avoid division by zero
-
-    for j, c_type in enumerate(criteria_types):
-        if c_type == 1: # Benefit
-            normalized[:, j] = (matrix[:, j] - min_vals[j]) / ranges[j]
-        else: # Cost
-            normalized[:, j] = (max_vals[j] - matrix[:, j]) / ranges[j]
+    # Benefit: (x - min) / (max - min), Cost: (x - max) / (min - max)
+    best, worst = best_worst(matrix, criteria_types)
+    span = best - worst
+    span = np.where(span == 0, 1, span) # Avoid division by zero
             
-    return normalized
+    return (matrix - worst) / span
 
-def linear_normalization(matrix, criteria_types):
+@instrumented('normalization.linear_normalization')
+def linear_normalization(matrix, criteria_types, extremes=None, workspace=None):
     """
     Linear normalization (Max or Sum based).
     Benefit: x_ij / x_max
     Cost: x_min / x_ij
+    extremes: optional precomputed (min_vals, max_vals) of the matrix
+    workspace: optional Workspace; the result is written to its 'normalized' buffer
     """
-    matrix = np.array(matrix, dtype=float)
-    normalized = np.zeros_like(matrix)
+    matrix = as_float(matrix) if workspace is None else workspace.check(as_float(matrix, workspace.dtype))
+    mask = benefit_mask(criteria_types)
+    
+    if extremes is None:
+        extremes = column_extremes(matrix)
+    min_vals, max_vals = extremes
+    div = np.where(max_vals != 0, max_vals, 1)
     
-    max_vals = np.max(matrix, axis=0)
-    min_vals = np.min(matrix, axis=0)
+    if workspace is not None:
+        return _linear_normalization_into(matrix, mask, min_vals, div, workspace)
+    normalized = np.empty_like(matrix)
     
-    for j, c_type in enumerate(criteria_types):
-        if c_type == 1: # Benefit
-            div = max_vals[j] if max_vals[j] != 0 else 1
-            normalized[:, j] = matrix[:, j] / div
-        else: # Cost
-            # Handle zeros in data for cost criteria if necessary, usually replace with small epsilon or handle
-            denom = matrix[:, j]
-            denom = np.where(denom == 0, 1e-9, denom)
-            normalized[:, j] = min_vals[j] / denom
+    def benefit(cols):
+        return matrix[:, cols] / div[cols]
+    
+    def cost(cols):
+        # Handle zeros in data for cost criteria if necessary, usually replace with small epsilon or handle
+        denom = matrix[:, cols]
+        denom = np.where(denom == 0, 1e-9, denom)
+        return min_vals[cols] / denom
             
+    return split_columns(mask, benefit, cost, normalized)
+
+def _linear_normalization_into(matrix, mask, min_vals, div, workspace):
+    # Benefit formula over all columns, then the cost columns overwritten,
+    # instead of the column subsets (copies) split_columns works on
+    normalized = np.divide(matrix, div, out=workspace.matrix('normalized'))
+    cost = ~mask
+    if cost.any():
+        denom = workspace.matrix('scratch')
+        zeros = np.equal(matrix, 0, out=workspace.mask('zeros'))
+        np.copyto(denom, matrix)
+        np.copyto(denom, 1e-9, where=zeros)
+        np.divide(min_vals, denom, out=denom)
+        np.copyto(normalized, denom, where=cost)
     return normalized
 
+@instrumented('normalization.sum_normalization')
 def sum_normalization(matrix):
     """
     Normalizes so that each column sums to 1.
     x_ij = x_ij / sum(x_ij)
     """
-    matrix = np.array(matrix, dtype=float)
+    matrix = as_float(matrix)
     col_sums = np.sum(matrix, axis=0)
     col_sums = np.where(col_sums == 0, 1, col_sums)
     return matrix / col_sums
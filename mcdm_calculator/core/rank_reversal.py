@@ -0,0 +1,221 @@
+import numpy as np
+from .kernels import benefit_mask, as_float, scaled_distances, DISTANCE_BLOCK_BYTES
+from .smaa import HIGHER_IS_BETTER
+from .ranking import topsis_ranking, vikor_ranking, mairca_ranking
+
+# Rough size of the temporaries of one block of removals
+BLOCK_BYTES = 32 * 1024 * 1024
+# Up to this many alternatives every pair is checked for a reversal, above it only neighbours
+ALL_PAIRS_MAX = 300
+
+def _top_two(matrix):
+    """Column maxima and minima, the row holding each, and the runner-up values."""
+    m = matrix.shape[0]
+    arg_max = np.argmax(matrix, axis=0)
+    arg_min = np.argmin(matrix, axis=0)
+    part = np.partition(matrix, [0, 1, m - 2, m - 1], axis=0)
+    return {
+        'max': part[m - 1], 'arg_max': arg_max, 'second_max': part[m - 2],
+        'min': part[0], 'arg_min': arg_min, 'second_min': part[1],
+    }
+
+def _extremes_without(top, rows):
+    """(R, n) column minima and maxima of the matrix without each of the given rows."""
+    rows = rows[:, None]
+    max_vals = np.where(top['arg_max'] == rows, top['second_max'], top['max'])
+    min_vals = np.where(top['arg_min'] == rows, top['second_min'], top['min'])
+    return min_vals, max_vals
+
+class _Context:
+    """Everything the leave-one-out scores need from the full matrix, computed once."""
+    def __init__(self, matrix, weights, criteria_types, method, v):
+        self.matrix = matrix
+        self.weights = weights
+        self.mask = benefit_mask(criteria_types)
+        self.method = method
+        self.v = v
+        self.top = _top_two(matrix)
+        if method == 'topsis':
+            self.sumsq = np.einsum('ij,ij->j', matrix, matrix)
+            rows = min(matrix.shape[0], max(1, DISTANCE_BLOCK_BYTES // (8 * matrix.shape[1])))
+            self.blocks = (np.empty((rows, matrix.shape[1])), np.empty((rows, matrix.shape[1])))
+        elif method == 'mairca':
+            # Benefit columns enter as x, cost columns as 1/x (linear normalization)
+            inverse = 1 / np.where(matrix == 0, 1e-9, matrix)
+            self.linear = np.where(self.mask, matrix, inverse)
+
+def _topsis_block(ctx, rows):
+    X, w = ctx.matrix, ctx.weights
+    min_vals, max_vals = _extremes_without(ctx.top, rows)
+    norm = np.sqrt(np.maximum(ctx.sumsq - X[rows]**2, 0))
+    norm = np.where(norm == 0, 1, norm)
+    ideal = np.where(ctx.mask, max_vals, min_vals) / norm * w
+    anti_ideal = np.where(ctx.mask, min_vals, max_vals) / norm * w
+    # Distances are taken directly per removal: the expansion ||x||^2 - 2 x.y + ||y||^2
+    # cancels for columns with a large offset and reports false reversals
+    scores = np.empty((len(rows), X.shape[0]))
+    for k in range(len(rows)):
+        dist_ideal, dist_anti_ideal = scaled_distances(X, w, [ideal[k], anti_ideal[k]], norm=norm[k],
+                                                       blocks=ctx.blocks)
+        scores[k] = dist_anti_ideal / (dist_ideal + dist_anti_ideal + 1e-9)
+    return scores
+
+def _vikor_block(ctx, rows):
+    min_vals, max_vals = _extremes_without(ctx.top, rows)
+    f_star = np.where(ctx.mask, max_vals, min_vals)[:, None, :]
+    f_minus = np.where(ctx.mask, min_vals, max_vals)[:, None, :]
+    denom = f_star - f_minus
+    denom = np.where(denom == 0, 1e-9, denom)
+    weighted_regret = ctx.weights * ((f_star - ctx.matrix) / denom)
+    S = np.sum(weighted_regret, axis=2)
+    R = np.max(weighted_regret, axis=2)
+
+    # Q is normalized over the remaining alternatives only
+    removed = (np.arange(len(rows)), rows)
+    S[removed] = np.nan
+    R[removed] = np.nan
+    S_star = np.nanmin(S, axis=1, keepdims=True)
+    R_star = np.nanmin(R, axis=1, keepdims=True)
+    delta_S = np.nanmax(S, axis=1, keepdims=True) - S_star
+    delta_S = np.where(delta_S == 0, 1, delta_S)
+    delta_R = np.nanmax(R, axis=1, keepdims=True) - R_star
+    delta_R = np.where(delta_R == 0, 1, delta_R)
+    return ctx.v * (S - S_star) / delta_S + (1 - ctx.v) * (R - R_star) / delta_R
+
+def _mairca_block(ctx, rows):
+    m = ctx.matrix.shape[0] - 1
+    min_vals, max_vals = _extremes_without(ctx.top, rows)
+    div = np.where(max_vals != 0, max_vals, 1)
+    # Total gap = sum_j w_j / m * (1 - n_ij) = (sum(w) - a . y_i) / m
+    coef = ctx.weights * np.where(ctx.mask, 1 / div, min_vals)
+    return (np.sum(ctx.weights) - coef @ ctx.linear.T) / m
+
+BLOCK_SCORES = {'topsis': _topsis_block, 'vikor': _vikor_block, 'mairca': _mairca_block}
+
+def _block_rows(method, m, n, all_pairs, block_rows):
+    if block_rows is not None:
+        return max(1, int(block_rows))
+    per_row = 8 * m * (3 * n if method == 'vikor' else 8)
+    if all_pairs:
+        per_row = max(per_row, 3 * m * m)
+    return int(np.clip(BLOCK_BYTES // per_row, 1, m))
+
+def leave_one_out_scores(matrix, weights, criteria_types, method, v=0.5, block_rows=None):
+    """
+    Scores of every alternative with each other alternative removed, in blocks.
+
+    Column statistics of the m - 1 row matrices are derived from the full
+    matrix: sums of squares minus the removed row (TOPSIS norms) and the
+    column extremes, which fall back to the runner-up value where the removed
+    row held the extreme. TOPSIS distances are then taken directly for each
+    removal (scaled_distances) and MAIRCA is a matrix product of the
+    (block, n) per-removal coefficients with the (n, m) data.
+    Weights stay fixed across removals.
+
+    Yields:
+        (rows, scores): the removed alternatives of the block and a
+        (len(rows), m) array of scores, NaN at each removed alternative
+    """
+    matrix = as_float(matrix, np.float64)
+    m, n = matrix.shape
+    if m < 3:
+        raise ValueError("Leave-one-out analysis needs at least 3 alternatives")
+    if method not in BLOCK_SCORES:
+        raise ValueError(f"Unknown ranking method: {method}")
+    ctx = _Context(matrix, as_float(weights, np.float64), criteria_types, method, v)
+    size = _block_rows(method, m, n, False, block_rows)
+    for start in range(0, m, size):
+        rows = np.arange(start, min(start + size, m))
+        scores = BLOCK_SCORES[method](ctx, rows)
+        scores[np.arange(len(rows)), rows] = np.nan
+        yield rows, scores
+
+RANKINGS = {'topsis': topsis_ranking, 'vikor': vikor_ranking, 'mairca': mairca_ranking}
+
+def _adjacent_flips(rows, keys, base_key, order, position):
+    """Neighbours in the full ranking (skipping the removed one) whose order reverses."""
+    b, m = keys.shape
+    keep = np.ones((b, m), dtype=bool)
+    keep[np.arange(b), position[rows]] = False
+    ids = np.broadcast_to(order, (b, m))[keep].reshape(b, m - 1)
+    new = np.take_along_axis(keys, ids, axis=1)
+    old = base_key[ids]
+    flipped = (old[:, :-1] < old[:, 1:]) & (new[:, :-1] > new[:, 1:])
+    r, k = np.nonzero(flipped)
+    return rows[r], ids[r, k], ids[r, k + 1]
+
+def _all_pair_flips(rows, keys, base_key):
+    """Every pair ranked a above b in the full ranking and b above a after the removal."""
+    before = base_key[:, None] < base_key[None, :]
+    after = keys[:, :, None] > keys[:, None, :] # NaN (removed) compares False
+    r, a, c = np.nonzero(before & after)
+    return rows[r], a, c
+
+def rank_reversal_analysis(matrix, weights, criteria_types, method='topsis', v=0.5,
+                           all_pairs=None, block_rows=None):
+    """
+    Leave-one-out rank-reversal analysis: remove each alternative in turn and
+    compare the ranking of the others with the full ranking.
+
+    Args:
+        matrix: (m, n) decision matrix
+        weights: (n,) weights, kept fixed for every removal
+        criteria_types: list of 1 (benefit) or -1 (cost)
+        method: 'topsis', 'vikor' or 'mairca'
+        all_pairs: check every pair of alternatives (O(m^2) per removal); otherwise
+                   only neighbours in the full ranking. Default: m <= ALL_PAIRS_MAX
+        block_rows: removals scored per block (default keeps blocks around BLOCK_BYTES)
+
+    Returns:
+        dict: {
+            'scores': (m,) scores of the full matrix,
+            'order': (m,) alternatives best-first,
+            'flips': (k, 3) int array of (removed, above, below): 'above' ranked
+                     better than 'below' in the full ranking and worse without 'removed',
+            'flip_counts': (m,) number of flips per removed alternative,
+            'involved_counts': (m,) number of flips each alternative takes part in,
+            'best': (m,) alternative ranked first after each removal,
+            'best_changed': (m,) True where that is not the best remaining
+                            alternative of the full ranking,
+            'all_pairs': whether every pair was checked
+        }
+    """
+    matrix = as_float(matrix, np.float64)
+    m, n = matrix.shape
+    if method not in RANKINGS:
+        raise ValueError(f"Unknown ranking method: {method}")
+    if all_pairs is None:
+        all_pairs = m <= ALL_PAIRS_MAX
+
+    sign = -1 if HIGHER_IS_BETTER[method] else 1
+    scores = RANKINGS[method](matrix, weights, criteria_types, **({'v': v} if method == 'vikor' else {}))
+    base_key = sign * scores # lower key ranks first
+    order = np.argsort(base_key, kind='stable')
+    position = np.empty(m, dtype=int)
+    position[order] = np.arange(m)
+
+    flips = []
+    best = np.empty(m, dtype=int)
+    best_changed = np.zeros(m, dtype=bool)
+    size = _block_rows(method, m, n, all_pairs, block_rows)
+    for rows, loo in leave_one_out_scores(matrix, weights, criteria_types, method, v, size):
+        keys = sign * loo
+        if all_pairs:
+            flips.append(np.stack(_all_pair_flips(rows, keys, base_key), axis=1))
+        else:
+            flips.append(np.stack(_adjacent_flips(rows, keys, base_key, order, position), axis=1))
+        old_best = np.where(order[0] == rows, order[1], order[0])
+        best[rows] = np.nanargmin(keys, axis=1)
+        best_changed[rows] = base_key[best[rows]] != base_key[old_best] # ties are not a change
+
+    flips = np.concatenate(flips) if flips else np.empty((0, 3), dtype=int)
+    return {
+        'scores': scores,
+        'order': order,
+        'flips': flips,
+        'flip_counts': np.bincount(flips[:, 0], minlength=m),
+        'involved_counts': np.bincount(flips[:, 1:].ravel(), minlength=m),
+        'best': best,
+        'best_changed': best_changed,
+        'all_pairs': all_pairs,
+    }
@@ -1,63 +1,81 @@
 import numpy as np
 from .normalization import vector_normalization, min_max_normalization, linear_normalization
+from .kernels import (benefit_mask, best_worst, column_extremes, distance_metric, scaled_distances, as_float,
+                      DISTANCE_BLOCK_BYTES)
+from .instrumentation import instrumented
+from .relation import BitRelation
 
-def topsis_ranking(matrix, weights, criteria_types):
+@instrumented('ranking.topsis_ranking')
+def topsis_ranking(matrix, weights, criteria_types, metric='euclidean', p=None, trace=None, workspace=None):
     """
     Returns TOPSIS scores (Closeness Coefficient). Higher is better.
+    metric: separation measure, 'euclidean' (default), 'manhattan', 'chebyshev'
+            or 'minkowski' with exponent p
+    trace: optional Trace recording intermediate steps under 'topsis'
+    workspace: optional Workspace holding the distances and the returned scores
     """
-    # 1. Vector Normalization
-    norm_matrix = vector_normalization(matrix)
-    
-    # 2. Weighted Normalized Decision Matrix
-    weighted_matrix = norm_matrix * weights
+    matrix = as_float(matrix) if workspace is None else workspace.check(as_float(matrix, workspace.dtype))
+    metric, p = distance_metric(metric, p)
+
+    # 1. Vector Normalization and 2. Weighting, applied block by block in the distance kernel:
+    # v_ij = x_ij / ||x_j|| * w_j. The weighted matrix is never formed.
+    norm = np.sqrt(np.einsum('ij,ij->j', matrix, matrix).astype(np.float64))
+    norm = np.where(norm == 0, 1, norm) # Avoid division by zero
+    weights = np.asarray(weights, dtype=np.float64)
     
     # 3. Ideal (A*) and Anti-Ideal (A-) Solutions
     # If Benefit: Max A*, Min A-
     # If Cost: Min A*, Max A-
-    
-    # However, since we might have costs, let's be explicit
-    # max_cols = np.max(weighted_matrix, axis=0) # This is purely mathematical max
-    # min_cols = np.min(weighted_matrix, axis=0)
-    
-    ideal = np.zeros(len(weights))
-    anti_ideal = np.zeros(len(weights))
-    
-    for j, c_type in enumerate(criteria_types):
-        if c_type == 1: # Benefit
-            ideal[j] = np.max(weighted_matrix[:, j])
-            anti_ideal[j] = np.min(weighted_matrix[:, j])
-        else: # Cost
-            ideal[j] = np.min(weighted_matrix[:, j])
-            anti_ideal[j] = np.max(weighted_matrix[:, j])
+    # Column extremes of v are the normalized, weighted extremes of x (swapped for a negative weight)
+    min_vals, max_vals = column_extremes(matrix)
+    low, high = min_vals / norm * weights, max_vals / norm * weights
+    ideal, anti_ideal = best_worst(None, criteria_types, extremes=(np.minimum(low, high), np.maximum(low, high)))
             
-    # 4. Separation Measures (Euclidean Distance)
-    dist_ideal = np.sqrt(np.sum((weighted_matrix - ideal)**2, axis=1))
-    dist_anti_ideal = np.sqrt(np.sum((weighted_matrix - anti_ideal)**2, axis=1))
-    
+    # 4. Separation Measures (Euclidean by default)
     # 5. Closeness Coefficient
     # C_i = S- / (S+ + S-)
-    score = dist_anti_ideal / (dist_ideal + dist_anti_ideal + 1e-9)
+    out = blocks = None
+    if workspace is not None:
+        out = (workspace.rows('dist_ideal'), workspace.rows('dist_anti_ideal'))
+        rows = max(1, DISTANCE_BLOCK_BYTES // (8 * matrix.shape[1]))
+        blocks = (workspace.block('scaled', rows), workspace.block('diff', rows))
+    dist_ideal, dist_anti_ideal = scaled_distances(matrix, weights, [ideal, anti_ideal], metric, p, out=out,
+                                                   norm=norm, blocks=blocks)
+    if workspace is None:
+        score = dist_anti_ideal / (dist_ideal + dist_anti_ideal + 1e-9)
+    else:
+        score = np.add(dist_ideal, dist_anti_ideal, out=workspace.rows('scores'))
+        np.add(score, 1e-9, out=score)
+        np.divide(dist_anti_ideal, score, out=score)
+    
+    if trace is not None:
+        dtype = matrix.dtype
+        # The m x n matrices are only built if the trace is read
+        trace.record_lazy('topsis', 'normalized', lambda: (matrix / norm).astype(dtype, copy=False))
+        trace.record_lazy('topsis', 'weighted', lambda: (matrix / norm * weights).astype(dtype, copy=False))
+        trace.record('topsis', 'metric', metric)
+        trace.record('topsis', 'p', p)
+        trace.record('topsis', 'ideal', ideal.astype(dtype))
+        trace.record('topsis', 'anti_ideal', anti_ideal.astype(dtype))
+        trace.record('topsis', 'dist_ideal', dist_ideal)
+        trace.record('topsis', 'dist_anti_ideal', dist_anti_ideal)
+        trace.record('topsis', 'scores', score)
     
     return score
 
-def vikor_ranking(matrix, weights, criteria_types, v=0.5):
+@instrumented('ranking.vikor_ranking')
+def vikor_ranking(matrix, weights, criteria_types, v=0.5, trace=None, workspace=None):
     """
     Run VIKOR method. Returns Q values (lower is better).
     v: weight for strategy of maximum group utility (usually 0.5)
+    trace: optional Trace recording intermediate steps under 'vikor'
+    workspace: optional Workspace holding the intermediates and the returned Q values
     """
-    matrix = np.array(matrix, dtype=float)
+    matrix = as_float(matrix) if workspace is None else workspace.check(as_float(matrix, workspace.dtype))
+    weights = as_float(weights, matrix.dtype)
     
     # 1. Best (f*) and Worst (f-) values for each criterion
-    f_star = np.zeros(matrix.shape[1])
-    f_minus = np.zeros(matrix.shape[1])
-    
-    for j, c_type in enumerate(criteria_types):
-        if c_type == 1: # Benefit
-            f_star[j] = np.max(matrix[:, j])
-            f_minus[j] = np.min(matrix[:, j])
-        else: # Cost
-            f_star[j] = np.min(matrix[:, j])
-            f_minus[j] = np.max(matrix[:, j])
+    f_star, f_minus = best_worst(matrix, criteria_types)
             
     # 2. S and R values
     # S_i = Sum( w_j * (f*_j - x_ij) / (f*_j - f-_j) )
@@ -66,29 +84,20 @@ def vikor_ranking(matrix, weights, criteria_types, v=0.5):
     denom = f_star - f_minus
     denom = np.where(denom == 0, 1e-9, denom)
     
-    term = weights * (f_star - matrix) / denom
-    # Note: For cost criteria, f* is min. (min - x) is negative?
-    # Standard formula: |f*_j - x_ij| / |f*_j - f-_j| usually?
-    # Or:
     # Benefit: (f* - x) / (f* - f-) -> (Max - x)/(Max - Min) : 0 at Max, 1 at Min. Correct (regret).
-    # Cost:   (x - f*) / (f- - f*) ? -> (x - Min)/(Max - Min) : 0 at Min, 1 at Max. Correct.
-    
-    normalized_regret = np.zeros_like(matrix)
-    for j, c_type in enumerate(criteria_types):
-        if c_type == 1:
-            normalized_regret[:, j] = (f_star[j] - matrix[:, j]) / denom[j]
-        else:
-            # f_star is min, f_minus is max. denom is min-max (neg).
-            # We want (x - min) / (max - min)
-            # (f_star - matrix) is (min - x). 
-            # (f_star - f_minus) is (min - max).
-            # (min - x) / (min - max) = (x - min) / (max - min). Correct.
-            normalized_regret[:, j] = (f_star[j] - matrix[:, j]) / denom[j]
-            
-    weighted_regret = weights * normalized_regret
-    
-    S = np.sum(weighted_regret, axis=1)
-    R = np.max(weighted_regret, axis=1)
+    # Cost: f* is min, f- is max, so (min - x) / (min - max) = (x - min) / (max - min). Correct.
+    # Both directions therefore share one whole-matrix expression.
+    if workspace is None:
+        normalized_regret = (f_star - matrix) / denom
+        weighted_regret = weights * normalized_regret
+        S = np.sum(weighted_regret, axis=1)
+        R = np.max(weighted_regret, axis=1)
+    else:
+        weighted_regret = np.subtract(f_star, matrix, out=workspace.matrix('weighted'))
+        np.divide(weighted_regret, denom, out=weighted_regret)
+        np.multiply(weights, weighted_regret, out=weighted_regret)
+        S = np.sum(weighted_regret, axis=1, out=workspace.rows('S'))
+        R = np.max(weighted_regret, axis=1, out=workspace.rows('R'))
     
     # 3. Q values
     # Q_i = v * (S_i - S*) / (S- - S*) + (1-v) * (R_i - R*) / (R- - R*)
@@ -104,11 +113,29 @@ def vikor_ranking(matrix, weights, criteria_types, v=0.5):
     delta_R = R_minus - R_star
     delta_R = delta_R if delta_R != 0 else 1
     
-    Q = v * (S - S_star) / delta_S + (1 - v) * (R - R_star) / delta_R
+    if workspace is None:
+        Q = v * (S - S_star) / delta_S + (1 - v) * (R - R_star) / delta_R
+    else:
+        Q = np.subtract(S, S_star, out=workspace.rows('scores'))
+        np.multiply(v, Q, out=Q)
+        np.divide(Q, delta_S, out=Q)
+        term = np.subtract(R, R_star, out=workspace.rows('term'))
+        np.multiply(1 - v, term, out=term)
+        np.divide(term, delta_R, out=term)
+        np.add(Q, term, out=Q)
+    
+    if trace is not None:
+        trace.record('vikor', 'f_star', f_star)
+        trace.record('vikor', 'f_minus', f_minus)
+        trace.record('vikor', 'weighted_regret', weighted_regret)
+        trace.record('vikor', 'S', S)
+        trace.record('vikor', 'R', R)
+        trace.record('vikor', 'scores', Q)
     
     return Q # Sort Ascending
 
-def mairca_ranking(matrix, weights, criteria_types):
+@instrumented('ranking.mairca_ranking')
+def mairca_ranking(matrix, weights, criteria_types, trace=None, workspace=None):
     """
     MAIRCA (Multi-Attributive Border Approximation area Comparison).
     Returns total gap values (lower/higher? Checking standard).
@@ -137,24 +164,580 @@ def mairca_ranking(matrix, weights, criteria_types):
     4. Final Function values (S_i).
        S_i = Sum(G_ij).
     Rank by S_i Ascending (Smaller gap is better).
+    
+    trace: optional Trace recording intermediate steps under 'mairca'
+    workspace: optional Workspace holding the intermediates and the returned gaps
     """
-    matrix = np.array(matrix, dtype=float)
+    matrix = as_float(matrix) if workspace is None else workspace.check(as_float(matrix, workspace.dtype))
+    weights = as_float(weights, matrix.dtype)
     m, n = matrix.shape # m alts, n criteria
     
     # 1. Theoretical Priorities
     # each alternative is equally probable initially P(Ai) = 1/m
     prob = 1.0 / m
-    Tp = np.tile(prob * weights, (m, 1))
+    # Same for every alternative: kept as one row and broadcast
+    Tp = prob * weights
     
     # 2. Real Ratings
     # Linear normalization
-    norm_matrix = linear_normalization(matrix, criteria_types) # assumes x/max, min/x
-    Tr = Tp * norm_matrix
+    norm_matrix = linear_normalization(matrix, criteria_types, workspace=workspace) # assumes x/max, min/x
+    if workspace is None:
+        Tr = Tp * norm_matrix
+        
+        # 3. Gap Matrix
+        G = Tp - Tr
+        
+        # 4. Sum
+        S = np.sum(G, axis=1)
+    else:
+        Tr = np.multiply(Tp, norm_matrix, out=workspace.matrix('weighted'))
+        G = np.subtract(Tp, Tr, out=workspace.matrix('scratch'))
+        S = np.sum(G, axis=1, out=workspace.rows('scores'))
+    
+    if trace is not None:
+        trace.record('mairca', 'theoretical', Tp)
+        trace.record('mairca', 'normalized', norm_matrix)
+        trace.record('mairca', 'real', Tr)
+        trace.record('mairca', 'gap', G)
+        trace.record('mairca', 'scores', S)
+    
+    return S # Sort Ascending (Lower is better)
+
+# PROMETHEE preference functions P(d) of the difference d = a - b in the preferred direction:
+#   usual:    1 if d > 0
+#   linear:   0 up to the indifference threshold q, linear up to the preference threshold p, then 1
+#   vshape:   linear from 0 up to p, then 1 (linear with q = 0)
+#   gaussian: 1 - exp(-d^2 / (2 s^2)) for d > 0
+PREFERENCE_FUNCTIONS = ('usual', 'linear', 'vshape', 'gaussian')
+# Memory budget of one row tile of the PROMETHEE preference matrix
+PROMETHEE_TILE_BYTES = 64 * 1024 * 1024
+
+def promethee_preferences(preference, q, p, s, n):
+    """
+    Validated per-criterion preference functions and thresholds.
+    preference: one name for all criteria or one per criterion.
+    q, p, s: None, a scalar or one value per criterion, in the criterion's units.
+    Returns (kinds, q, p, s) with q = p = 0 for usual and q = 0 for vshape. Raises ValueError.
+    """
+    kinds = [preference] * n if isinstance(preference, str) else list(preference)
+    if len(kinds) != n:
+        raise ValueError(f"Expected {n} preference functions, got {len(kinds)}")
+    for kind in kinds:
+        if kind not in PREFERENCE_FUNCTIONS:
+            raise ValueError(f"Unknown preference function: {kind}. Use one of {', '.join(PREFERENCE_FUNCTIONS)}")
+
+    def per_criterion(value, name, needed_by):
+        if value is None:
+            if any(kind in needed_by for kind in kinds):
+                raise ValueError(f"The {' / '.join(needed_by)} preference function needs threshold {name}")
+            return np.zeros(n)
+        value = np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+        if np.any(value < 0):
+            raise ValueError(f"Threshold {name} must not be negative")
+        return value
+
+    q = per_criterion(q, 'q', ())
+    p = per_criterion(p, 'p', ('linear', 'vshape'))
+    s = per_criterion(s, 's', ('gaussian',))
+    kinds = np.array(kinds)
+    q = np.where(np.isin(kinds, ('linear',)), q, 0.0)
+    p = np.where(np.isin(kinds, ('linear', 'vshape')), p, 0.0)
+    if np.any(p < q):
+        raise ValueError("Threshold p must not be smaller than q")
+    if np.any((kinds == 'gaussian') & (s == 0)):
+        raise ValueError("Threshold s must be positive")
+    return kinds, q, p, s
+
+def _piecewise_flow_sums(y, q, p):
+    """
+    Sum_b P(y_a - y_b) and Sum_b P(y_b - y_a) for every a, for a piecewise-linear P
+    (q <= p), from the sorted values and their prefix sums in O(m log m).
+    """
+    # y is not centred: the thresholds are compared to y +/- q, p exactly as
+    # the pairwise differences are, so ties at d == q or d == p fall on the same side
+    v = np.sort(y)
+    c = np.concatenate([[0.0], np.cumsum(v)])
+    m = len(y)
+    # Leaving: d = y_a - y_b > p counts 1, q < d <= p counts (d - q) / (p - q)
+    full = np.searchsorted(v, y - p, 'left')
+    leaving = full.astype(float)
+    # Entering: d = y_b - y_a, same bands above y_a
+    last = np.searchsorted(v, y + p, 'right')
+    entering = (m - last).astype(float)
+    if p > q:
+        band_end = np.searchsorted(v, y - q, 'left')
+        leaving += ((band_end - full) * (y - q) - (c[band_end] - c[full])) / (p - q)
+        band_start = np.searchsorted(v, y + q, 'right')
+        entering += ((c[last] - c[band_start]) - (last - band_start) * (y + q)) / (p - q)
+    return leaving, entering
+
+def _preference_in_place(d, kind, q, p, s):
+    """Overwrite the difference tile d with P(d)."""
+    if kind == 'gaussian':
+        np.maximum(d, 0, out=d)
+        np.square(d, out=d)
+        d *= -1 / (2 * s * s)
+        np.exp(d, out=d)
+        np.subtract(1, d, out=d)
+    elif p > q:
+        d -= q
+        d /= p - q
+        np.clip(d, 0, 1, out=d)
+    else:
+        d[...] = d > q
+
+def _tile_flow_sums(YT, weights, kinds, q, p, s, start, stop, tile):
+    """
+    Leaving-flow sums of rows start:stop and their contribution to every entering-flow
+    sum, one (tile, m) block of the preference matrix pi(a, b) at a time.
+    YT: (n, m) criteria in the preferred direction, weights: (n,) (zero skips a criterion)
+    """
+    n, m = YT.shape
+    leaving = np.zeros(stop - start)
+    entering = np.zeros(m)
+    d = np.empty((min(tile, stop - start), m), dtype=YT.dtype)
+    pi = np.empty_like(d)
+    for i0 in range(start, stop, tile):
+        i1 = min(i0 + tile, stop)
+        d_t, pi_t = d[:i1 - i0], pi[:i1 - i0]
+        pi_t.fill(0)
+        for j in np.flatnonzero(weights):
+            np.subtract(YT[j, i0:i1, None], YT[j], out=d_t)
+            _preference_in_place(d_t, kinds[j], q[j], p[j], s[j])
+            d_t *= weights[j]
+            pi_t += d_t
+        leaving[i0 - start:i1 - start] = np.sum(pi_t, axis=1, dtype=np.float64)
+        entering += np.sum(pi_t, axis=0, dtype=np.float64)
+    return leaving, entering
+
+_promethee_shared = {}
+
+def _init_promethee_worker(*args):
+    _promethee_shared['args'] = args
+
+def _worker_tile_flow_sums(start, stop, tile):
+    return _tile_flow_sums(*_promethee_shared['args'], start, stop, tile)
+
+@instrumented('ranking.promethee_ranking')
+def promethee_ranking(matrix, weights, criteria_types, preference='usual', q=None, p=None, s=None,
+                      tile_bytes=PROMETHEE_TILE_BYTES, workers=None, algorithm='auto', trace=None):
+    """
+    PROMETHEE II net outranking flows. Higher is better.
+    pi(a, b) = Sum_j w_j P_j(a, b); phi+ (a) = Sum_b pi(a, b) / (m - 1), phi- (a) = Sum_b pi(b, a) / (m - 1)
+    and the net flow phi = phi+ - phi-.
+
+    The m x m preference matrix is never formed. With algorithm='auto' the
+    piecewise-linear functions (usual, linear, vshape) use sorted values and
+    prefix sums per criterion; Gaussian criteria (all criteria with
+    algorithm='tiled') are summed over row tiles of pi of about tile_bytes,
+    phi+ from the tile's row sums and phi- from its column sums. workers > 1
+    spreads the tiles over a process pool.
+
+    preference: 'usual', 'linear', 'vshape', 'gaussian', or one per criterion
+    q, p, s: indifference, preference and Gaussian thresholds (scalar or per criterion)
+    trace: optional Trace recording intermediate steps under 'promethee'
+    """
+    matrix = as_float(matrix)
+    m, n = matrix.shape
+    if m < 2:
+        raise ValueError("PROMETHEE needs at least 2 alternatives")
+    if algorithm not in ('auto', 'tiled'):
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    weights = np.asarray(weights, dtype=float)
+    kinds, q, p, s = promethee_preferences(preference, q, p, s, n)
+    # Oriented so that a larger value is always preferred
+    Y = np.where(benefit_mask(criteria_types), matrix, -matrix)
+
+    leaving = np.zeros(m)
+    entering = np.zeros(m)
+    tiled = (kinds == 'gaussian') if algorithm == 'auto' else np.ones(n, dtype=bool)
+    for j in np.flatnonzero(~tiled & (weights != 0)):
+        plus, minus = _piecewise_flow_sums(Y[:, j].astype(float), q[j], p[j])
+        leaving += weights[j] * plus
+        entering += weights[j] * minus
+
+    if np.any(tiled & (weights != 0)):
+        YT = np.ascontiguousarray(Y.T)
+        tile_weights = np.where(tiled, weights, 0.0)
+        tile = int(max(1, min(m, tile_bytes // (2 * YT.itemsize * m))))
+        args = (YT, tile_weights, kinds, q, p, s)
+        if workers and workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            # A few contiguous row ranges per worker; the data is sent once per worker
+            bounds = np.linspace(0, m, min(m, 4 * workers) + 1).astype(int)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_promethee_worker,
+                                     initargs=args) as pool:
+                parts = list(pool.map(_worker_tile_flow_sums, bounds[:-1], bounds[1:], [tile] * (len(bounds) - 1)))
+            for start, (plus, minus) in zip(bounds[:-1], parts):
+                leaving[start:start + len(plus)] += plus
+                entering += minus
+        else:
+            plus, minus = _tile_flow_sums(*args, 0, m, tile)
+            leaving += plus
+            entering += minus
+
+    phi_plus = (leaving / (m - 1)).astype(matrix.dtype)
+    phi_minus = (entering / (m - 1)).astype(matrix.dtype)
+    net = phi_plus - phi_minus
+
+    if trace is not None:
+        trace.record('promethee', 'preference', kinds)
+        trace.record('promethee', 'q', q)
+        trace.record('promethee', 'p', p)
+        trace.record('promethee', 's', s)
+        trace.record('promethee', 'phi_plus', phi_plus)
+        trace.record('promethee', 'phi_minus', phi_minus)
+        trace.record('promethee', 'scores', net)
+
+    return net # Sort Descending (Higher is better)
+
+# Memory budget of one row tile of the ELECTRE concordance/discordance matrices
+ELECTRE_TILE_BYTES = 64 * 1024 * 1024
+
+def _electre_setup(matrix, weights, criteria_types, tile_bytes):
+    """Oriented (n, m) criteria rows, float weights and rows per tile (a multiple of 64, so tiles fill whole words)."""
+    matrix = as_float(matrix, np.float64)
+    m, n = matrix.shape
+    if m < 2:
+        raise ValueError("ELECTRE needs at least 2 alternatives")
+    YT = np.ascontiguousarray(np.where(benefit_mask(criteria_types), matrix, -matrix).T)
+    weights = np.asarray(weights, dtype=float)
+    tile = int(max(64, tile_bytes // (5 * 8 * m) // 64 * 64))
+    return YT, weights, tile
+
+def _electre1_tiles(YT, weights, ranges, tile):
+    """
+    (start, C, D) for row tiles of the ELECTRE I matrices:
+    C(a, b) = Sum_{j: a >= b on j} w_j / Sum w, D(a, b) = max_j (b - a on j)+ / range_j
+    """
+    n, m = YT.shape
+    total = np.sum(weights)
+    for i0 in range(0, m, tile):
+        i1 = min(i0 + tile, m)
+        C = np.zeros((i1 - i0, m))
+        D = np.zeros_like(C)
+        diff = np.empty_like(C)
+        at_least = np.empty(C.shape, dtype=bool)
+        for j in range(n):
+            # diff[a, b]: how much b is better than a on criterion j
+            np.subtract(YT[j], YT[j, i0:i1, None], out=diff)
+            np.less_equal(diff, 0, out=at_least)
+            C += weights[j] * at_least
+            diff /= ranges[j]
+            np.maximum(D, diff, out=D)
+        C /= total
+        yield i0, C, D
+
+def _electre3_tiles(YT, weights, q, p, v, tile):
+    """
+    (start, sigma) for row tiles of the ELECTRE III credibility matrix:
+    sigma = C * Prod_{j: d_j > C} (1 - d_j) / (1 - C) with the partial concordance
+    c_j (1 up to q, 0 from p) and discordance d_j (0 up to p, 1 from the veto v).
+    """
+    n, m = YT.shape
+    total = np.sum(weights)
+    vetoes = np.flatnonzero(np.isfinite(v))
+    for i0 in range(0, m, tile):
+        i1 = min(i0 + tile, m)
+        C = np.zeros((i1 - i0, m))
+        diff = np.empty_like(C)
+        tmp = np.empty_like(C)
+        for j in range(n):
+            np.subtract(YT[j], YT[j, i0:i1, None], out=diff)
+            if p[j] > q[j]:
+                np.subtract(p[j], diff, out=tmp)
+                tmp /= p[j] - q[j]
+                np.clip(tmp, 0, 1, out=tmp)
+            else:
+                tmp[...] = diff <= q[j]
+            tmp *= weights[j]
+            C += tmp
+        C /= total
+        sigma = C.copy()
+        if len(vetoes):
+            weak = np.empty(C.shape, dtype=bool)
+            one_minus_c = np.subtract(1, C)
+        for j in vetoes:
+            np.subtract(YT[j], YT[j, i0:i1, None], out=diff)
+            np.subtract(diff, p[j], out=tmp)
+            tmp /= v[j] - p[j]
+            np.clip(tmp, 0, 1, out=tmp)
+            np.greater(tmp, C, out=weak)
+            np.subtract(1, tmp, out=tmp)
+            np.divide(tmp, one_minus_c, out=tmp, where=weak)
+            tmp[~weak] = 1
+            sigma *= tmp
+        yield i0, sigma
+
+def _outranking_scores(section, relation, trace, **thresholds):
+    """Net outranking scores (outranked minus outranked by) of a BitRelation; records the relation and its kernel."""
+    net = (relation.out_degree - relation.in_degree).astype(float)
+    if trace is not None:
+        for key, value in thresholds.items():
+            trace.record(section, key, value)
+        trace.record(section, 'relation', relation)
+        trace.record(section, 'out_degree', relation.out_degree)
+        trace.record(section, 'in_degree', relation.in_degree)
+        # (kernel mask, cycles), computed when first read
+        trace.record_lazy(section, 'kernel', relation.kernel)
+        trace.record(section, 'scores', net)
+    return net # Sort Descending (Higher is better)
+
+@instrumented('ranking.electre1_relation')
+def electre1_relation(matrix, weights, criteria_types, concordance=None, discordance=None,
+                      tile_bytes=ELECTRE_TILE_BYTES):
+    """
+    ELECTRE I outranking relation: a S b when C(a, b) >= concordance and
+    D(a, b) <= discordance. Both thresholds default to the mean over all
+    pairs (one extra pass over the tiles).
+    The concordance/discordance matrices are built in row tiles of about
+    tile_bytes and only the packed relation (m^2 / 4 bytes) is kept.
+    Returns (BitRelation, concordance, discordance).
+    """
+    YT, weights, tile = _electre_setup(matrix, weights, criteria_types, tile_bytes)
+    m = YT.shape[1]
+    ranges = np.ptp(YT, axis=1)
+    ranges = np.where(ranges == 0, 1, ranges)
+
+    if concordance is None or discordance is None:
+        sum_c = sum_d = 0.0
+        for _, C, D in _electre1_tiles(YT, weights, ranges, tile):
+            sum_c += np.sum(C)
+            sum_d += np.sum(D)
+        pairs = m * (m - 1)
+        if concordance is None:
+            concordance = (sum_c - m) / pairs # C(a, a) = 1
+        if discordance is None:
+            discordance = sum_d / pairs
+
+    relation = BitRelation(m)
+    for i0, C, D in _electre1_tiles(YT, weights, ranges, tile):
+        S = (C >= concordance) & (D <= discordance)
+        S[np.arange(len(S)), i0 + np.arange(len(S))] = False
+        relation.set_rows(i0, S)
+    return relation, float(concordance), float(discordance)
+
+@instrumented('ranking.electre1_ranking')
+def electre1_ranking(matrix, weights, criteria_types, concordance=None, discordance=None,
+                     tile_bytes=ELECTRE_TILE_BYTES, trace=None):
+    """
+    ELECTRE I net outranking score: number of alternatives a outranks minus
+    the number outranking a (see electre1_relation). Higher is better.
+    trace: optional Trace recording the relation and its kernel under 'electre1'
+    """
+    relation, concordance, discordance = electre1_relation(matrix, weights, criteria_types, concordance,
+                                                           discordance, tile_bytes)
+    return _outranking_scores('electre1', relation, trace, concordance=concordance, discordance=discordance)
+
+def electre3_thresholds(q, p, v, n):
+    """
+    Per-criterion (q, p, v) arrays: indifference, preference and veto
+    thresholds (None: 0, q and no veto). Requires 0 <= q <= p < v. Raises ValueError.
+    """
+    def per_criterion(value, default):
+        if value is None:
+            return np.array(default, dtype=float)
+        return np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+
+    q = per_criterion(q, np.zeros(n))
+    p = per_criterion(p, q)
+    v = per_criterion(v, np.full(n, np.inf))
+    if np.any(q < 0) or np.any(p < q):
+        raise ValueError("Thresholds must satisfy 0 <= q <= p")
+    if np.any(v <= p):
+        raise ValueError("Veto thresholds must be larger than p")
+    return q, p, v
+
+@instrumented('ranking.electre3_relation')
+def electre3_relation(matrix, weights, criteria_types, q=None, p=None, v=None, cut=None,
+                      tile_bytes=ELECTRE_TILE_BYTES):
+    """
+    ELECTRE III outranking relation at a credibility cut: a S b when
+    sigma(a, b) >= cut. The default cut is the first distillation level
+    max(sigma) - (0.3 - 0.15 max(sigma)), found in one extra pass.
+    Returns (BitRelation, cut).
+    """
+    YT, weights, tile = _electre_setup(matrix, weights, criteria_types, tile_bytes)
+    m = YT.shape[1]
+    q, p, v = electre3_thresholds(q, p, v, YT.shape[0])
+
+    def tiles():
+        for i0, sigma in _electre3_tiles(YT, weights, q, p, v, tile):
+            sigma[np.arange(len(sigma)), i0 + np.arange(len(sigma))] = -np.inf # No self-outranking
+            yield i0, sigma
+
+    if cut is None:
+        top = max(np.max(sigma) for _, sigma in tiles())
+        cut = top - (0.3 - 0.15 * top)
+
+    relation = BitRelation(m)
+    for i0, sigma in tiles():
+        relation.set_rows(i0, sigma >= cut)
+    return relation, float(cut)
+
+@instrumented('ranking.electre3_ranking')
+def electre3_ranking(matrix, weights, criteria_types, q=None, p=None, v=None, cut=None,
+                     tile_bytes=ELECTRE_TILE_BYTES, trace=None):
+    """
+    ELECTRE III net outranking score (qualification) at the credibility cut of
+    electre3_relation. Higher is better.
+    q, p, v: indifference, preference and veto thresholds (scalar or per criterion)
+    trace: optional Trace recording the relation and its kernel under 'electre3'
+    """
+    relation, cut = electre3_relation(matrix, weights, criteria_types, q, p, v, cut, tile_bytes)
+    return _outranking_scores('electre3', relation, trace, cut=cut)
+
+def _batch_inputs(matrices, weights, criteria_types):
+    """
+    Broadcast batched inputs to a common shape.
+    matrices: (batch, m, n). weights / criteria_types: (n,) or (batch, n).
+    Returns matrices (b, m, n), weights (b, 1, n) and a benefit mask (b, 1, n).
+    """
+    matrices = as_float(matrices)
+    if matrices.ndim != 3:
+        raise ValueError("Batched input must have shape (batch, alternatives, criteria)")
+    b, m, n = matrices.shape
+    weights = np.broadcast_to(as_float(weights, matrices.dtype), (b, n))[:, None, :]
+    benefit = np.broadcast_to(benefit_mask(criteria_types), (b, n))[:, None, :]
+    return matrices, weights, benefit
+
+@instrumented('ranking.batch_topsis_ranking')
+def batch_topsis_ranking(matrices, weights, criteria_types):
+    """
+    Batched TOPSIS over a (batch, m, n) stack of decision matrices.
+    Returns a (batch, m) array of closeness coefficients.
+    """
+    matrices, weights, benefit = _batch_inputs(matrices, weights, criteria_types)
+
+    norm = np.linalg.norm(matrices, axis=1, keepdims=True)
+    norm = np.where(norm == 0, 1, norm)
+    weighted_matrix = matrices / norm * weights
+
+    ideal, anti_ideal = best_worst(weighted_matrix, benefit[:, 0, :], axis=1)
+    ideal, anti_ideal = ideal[:, None, :], anti_ideal[:, None, :]
+
+    dist_ideal = np.sqrt(np.sum((weighted_matrix - ideal)**2, axis=2))
+    dist_anti_ideal = np.sqrt(np.sum((weighted_matrix - anti_ideal)**2, axis=2))
+
+    return dist_anti_ideal / (dist_ideal + dist_anti_ideal + 1e-9)
+
+@instrumented('ranking.batch_vikor_ranking')
+def batch_vikor_ranking(matrices, weights, criteria_types, v=0.5):
+    """
+    Batched VIKOR over a (batch, m, n) stack of decision matrices.
+    Returns a (batch, m) array of Q values (lower is better).
+    """
+    matrices, weights, benefit = _batch_inputs(matrices, weights, criteria_types)
+
+    f_star, f_minus = best_worst(matrices, benefit[:, 0, :], axis=1)
+    f_star, f_minus = f_star[:, None, :], f_minus[:, None, :]
+
+    denom = f_star - f_minus
+    denom = np.where(denom == 0, 1e-9, denom)
+
+    weighted_regret = weights * ((f_star - matrices) / denom)
+
+    S = np.sum(weighted_regret, axis=2)
+    R = np.max(weighted_regret, axis=2)
+
+    S_star = np.min(S, axis=1, keepdims=True)
+    R_star = np.min(R, axis=1, keepdims=True)
+
+    delta_S = np.max(S, axis=1, keepdims=True) - S_star
+    delta_S = np.where(delta_S == 0, 1, delta_S)
+
+    delta_R = np.max(R, axis=1, keepdims=True) - R_star
+    delta_R = np.where(delta_R == 0, 1, delta_R)
+
+    return v * (S - S_star) / delta_S + (1 - v) * (R - R_star) / delta_R
+
+@instrumented('ranking.batch_mairca_ranking')
+def batch_mairca_ranking(matrices, weights, criteria_types):
+    """
+    Batched MAIRCA over a (batch, m, n) stack of decision matrices.
+    Returns a (batch, m) array of total gaps (lower is better).
+    """
+    matrices, weights, benefit = _batch_inputs(matrices, weights, criteria_types)
+    m = matrices.shape[1]
+
+    # Linear normalization: x/max for benefit, min/x for cost
+    col_max = np.max(matrices, axis=1, keepdims=True)
+    col_min = np.min(matrices, axis=1, keepdims=True)
+    benefit_norm = matrices / np.where(col_max != 0, col_max, 1)
+    cost_norm = col_min / np.where(matrices == 0, 1e-9, matrices)
+    norm_matrix = np.where(benefit, benefit_norm, cost_norm)
+
+    Tp = (1.0 / m) * weights
+    G = Tp - Tp * norm_matrix
+
+    return np.sum(G, axis=2)
+
+
+@instrumented('ranking.prepare_scoring')
+def prepare_scoring(matrix, criteria_types, method, normalized=None, extremes=None):
+    """
+    Precompute the weight-independent part of a ranking method so it can be
+    scored for many weight vectors without re-normalizing the matrix.
+    method: 'topsis', 'vikor' or 'mairca'
+    normalized: optional precomputed normalization of the matrix
+                (vector for TOPSIS, linear for MAIRCA)
+    extremes: optional precomputed (min_vals, max_vals) of the matrix
+    """
+    matrix = as_float(matrix)
+    if method == 'topsis':
+        # With w_j >= 0 the weighted ideal is w_j * best_j, so
+        # (S+)^2 = Sum_j w_j^2 * (n_ij - best_j)^2 and likewise for S-
+        norm_matrix = vector_normalization(matrix) if normalized is None else normalized
+        best, worst = best_worst(norm_matrix, criteria_types)
+        return {
+            'method': method,
+            'sq_ideal': (norm_matrix - best)**2,
+            'sq_anti_ideal': (norm_matrix - worst)**2,
+        }
+    elif method == 'vikor':
+        f_star, f_minus = best_worst(matrix, criteria_types, extremes=extremes)
+        denom = f_star - f_minus
+        denom = np.where(denom == 0, 1e-9, denom)
+        return {'method': method, 'regret': (f_star - matrix) / denom}
+    elif method == 'mairca':
+        # G_ij = w_j / m * (1 - norm_ij)
+        m = matrix.shape[0]
+        if normalized is None:
+            normalized = linear_normalization(matrix, criteria_types, extremes)
+        return {'method': method, 'gap': (1 - normalized) / m}
+    raise ValueError(f"Unknown ranking method: {method}")
+
+@instrumented('ranking.score_weight_samples')
+def score_weight_samples(prepared, weight_samples, v=0.5):
+    """
+    Score every alternative for a block of weight vectors.
+    prepared: output of prepare_scoring
+    weight_samples: (s, n) array, one weight vector per row
+    Returns an (s, m) array of scores in the method's usual direction.
+    """
+    W = np.atleast_2d(np.asarray(weight_samples, dtype=float))
+    method = prepared['method']
+    
+    if method == 'topsis':
+        W2 = W**2
+        dist_ideal = np.sqrt(W2 @ prepared['sq_ideal'].T)
+        dist_anti_ideal = np.sqrt(W2 @ prepared['sq_anti_ideal'].T)
+        return dist_anti_ideal / (dist_ideal + dist_anti_ideal + 1e-9)
     
-    # 3. Gap Matrix
-    G = Tp - Tr
+    elif method == 'vikor':
+        regret = prepared['regret']
+        S = W @ regret.T
+        R = np.max(W[:, None, :] * regret, axis=2)
+        
+        S_star = np.min(S, axis=1, keepdims=True)
+        R_star = np.min(R, axis=1, keepdims=True)
+        delta_S = np.max(S, axis=1, keepdims=True) - S_star
+        delta_S = np.where(delta_S == 0, 1, delta_S)
+        delta_R = np.max(R, axis=1, keepdims=True) - R_star
+        delta_R = np.where(delta_R == 0, 1, delta_R)
+        return v * (S - S_star) / delta_S + (1 - v) * (R - R_star) / delta_R
     
-    # 4. Sum
-    S = np.sum(G, axis=1)
+    elif method == 'mairca':
+        return W @ prepared['gap'].T
     
-    return S # Sort Ascending (Lower is better)
\ No newline at end of file
+    raise ValueError(f"Unknown ranking method: {method}")
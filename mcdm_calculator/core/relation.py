@@ -0,0 +1,145 @@
+import numpy as np
+
+# Rows of a relation unpacked at once when degrees are updated
+UNPACK_ROWS = 1024
+
+class BitRelation:
+    """
+    Binary relation on m elements stored as packed bits.
+
+    rows[a] holds the successors {b : a R b} as ceil(m / 64) uint64 words
+    (bit b of a row is bit b % 8 of byte b // 8, little bit order). Set
+    operations on whole rows are word-level bitwise operations; the relation
+    takes m^2 / 8 bytes instead of m^2 for a boolean matrix. No transpose is
+    kept: predecessors are found by testing every row against a bitset.
+    """
+    def __init__(self, m):
+        self.m = m
+        self.words = (m + 63) // 64
+        self.rows = np.zeros((m, self.words), dtype=np.uint64)
+        self.out_degree = np.zeros(m, dtype=np.int64)
+        self.in_degree = np.zeros(m, dtype=np.int64)
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes
+
+    def set_rows(self, start, block):
+        """
+        Store the (T, m) boolean block of rows start..start + T, replacing
+        whatever those rows held before.
+        """
+        block = np.asarray(block, dtype=bool)
+        T = block.shape[0]
+        if block.ndim != 2 or block.shape[1] != self.m or not 0 <= start <= self.m - T:
+            raise ValueError(f"Row block of shape {block.shape} at row {start} does not fit "
+                             f"a relation on {self.m} elements")
+        # Rows written before lose their contribution to the in-degrees
+        self.in_degree -= self.unpack(self.rows[start:start + T]).sum(axis=0)
+        row_bytes = self.rows.view(np.uint8)
+        row_bytes[start:start + T, :(self.m + 7) // 8] = np.packbits(block, axis=1, bitorder='little')
+        self.out_degree[start:start + T] = np.count_nonzero(block, axis=1)
+        self.in_degree += np.count_nonzero(block, axis=0)
+
+    @classmethod
+    def from_dense(cls, dense):
+        dense = np.asarray(dense, dtype=bool)
+        relation = cls(dense.shape[0])
+        relation.set_rows(0, dense)
+        return relation
+
+    def pack(self, mask):
+        """(m,) boolean mask -> bitset of self.words uint64 words."""
+        bits = np.zeros(self.words, dtype=np.uint64)
+        bits.view(np.uint8)[:(self.m + 7) // 8] = np.packbits(mask, bitorder='little')
+        return bits
+
+    def unpack(self, bits):
+        """Bitset (or (k, words) bitsets) -> boolean mask(s) of length m."""
+        return np.unpackbits(bits.view(np.uint8), axis=-1, count=self.m, bitorder='little').astype(bool)
+
+    def to_dense(self):
+        return self.unpack(self.rows)
+
+    def union(self, nodes):
+        """Bitwise OR of rows[nodes]: the successors of any node."""
+        bits = np.zeros(self.words, dtype=np.uint64)
+        for i in range(0, len(nodes), UNPACK_ROWS):
+            bits |= np.bitwise_or.reduce(self.rows[nodes[i:i + UNPACK_ROWS]], axis=0)
+        return bits
+
+    def successors(self, bits):
+        """Bitset of the successors of any element of the bitset."""
+        return self.union(np.flatnonzero(self.unpack(bits)))
+
+    def predecessors(self, bits):
+        """Bitset of the elements with a successor in the bitset (every row is tested)."""
+        mask = np.zeros(self.m, dtype=bool)
+        for i in range(0, self.m, UNPACK_ROWS):
+            mask[i:i + UNPACK_ROWS] = np.any(self.rows[i:i + UNPACK_ROWS] & bits, axis=1)
+        return self.pack(mask)
+
+    def reach(self, step, start, alive):
+        """
+        Bitset of the alive elements reachable from the bitset start, start
+        included (breadth first). step: successors or predecessors.
+        """
+        seen = start.copy()
+        frontier = start
+        while frontier.any():
+            frontier = step(frontier) & alive & ~seen
+            seen |= frontier
+        return seen
+
+    def source_component(self, alive):
+        """
+        Elements of a strongly connected component of the alive elements that
+        no other alive element points into. Walks up the condensation: if the
+        component of v has outside predecessors, continue from one of them.
+        """
+        v = np.flatnonzero(self.unpack(alive))[0]
+        while True:
+            start = np.zeros(self.words, dtype=np.uint64)
+            start[v // 64] = np.uint64(1) << np.uint64(v % 64)
+            up = self.reach(self.predecessors, start, alive)
+            component = up & self.reach(self.successors, start, alive)
+            outside = up & ~component
+            if not outside.any():
+                return np.flatnonzero(self.unpack(component))
+            v = np.flatnonzero(self.unpack(outside))[0]
+
+    def kernel(self):
+        """
+        Kernel of the relation: elements that do not relate to each other and
+        that together relate to every other element.
+
+        Peeling as in Kahn's algorithm: elements without an alive predecessor
+        join the kernel, and they and their successors leave the graph. When
+        only cycles remain, a source component (every element of the cycle)
+        joins the kernel instead, i.e. elements on a cycle are treated as one.
+
+        Returns:
+            (mask, cycles): (m,) boolean kernel membership and the list of
+            components that were added as cycles
+        """
+        m = self.m
+        in_kernel = np.zeros(m, dtype=bool)
+        alive_mask = np.ones(m, dtype=bool)
+        alive = self.pack(alive_mask)
+        in_degree = self.in_degree.copy()
+        cycles = []
+        while alive_mask.any():
+            sources = np.flatnonzero(alive_mask & (in_degree == 0))
+            if len(sources) == 0:
+                sources = self.source_component(alive)
+                cycles.append(sources)
+            in_kernel[sources] = True
+            removed = self.union(sources) & alive
+            removed |= self.pack(np.isin(np.arange(m), sources))
+            removed = np.flatnonzero(self.unpack(removed))
+            alive_mask[removed] = False
+            alive = self.pack(alive_mask)
+            # Successors of removed elements lose one alive predecessor each
+            for i in range(0, len(removed), UNPACK_ROWS):
+                in_degree -= self.unpack(self.rows[removed[i:i + UNPACK_ROWS]]).sum(axis=0)
+        return in_kernel, cycles
@@ -0,0 +1,97 @@
+import numpy as np
+
+def _order_keys(scores, ascending):
+    """Map scores to keys where smaller is always better."""
+    key = np.asarray(scores, dtype=float)
+    return key if ascending else -key
+
+def _tie_ranks(sorted_keys, boundary_total):
+    """
+    Ranks for best-first sorted keys, matching pandas
+    Series.rank(method='average').astype(int).
+    
+    Every element strictly better than a selected one is itself selected,
+    so counts inside the selection are exact except for ties at the
+    boundary (worst selected) value, whose global count is boundary_total.
+    """
+    better = np.searchsorted(sorted_keys, sorted_keys, side='left')
+    ties = np.searchsorted(sorted_keys, sorted_keys, side='right') - better
+    if len(sorted_keys):
+        ties = np.where(sorted_keys == sorted_keys[-1], boundary_total, ties)
+    return (better + (ties + 1) / 2).astype(int)
+
+def top_k(scores, k, ascending=False):
+    """
+    Indices and ranks of the k best scores without sorting the whole array.
+    ascending=False: higher is better (TOPSIS); True: lower is better (VIKOR, MAIRCA).
+    Returns (indices, ranks), best first; ties are ordered by index.
+    """
+    key = _order_keys(scores, ascending)
+    k = min(int(k), len(key))
+    if k <= 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    
+    # Partial selection: O(m) instead of O(m log m)
+    idx = np.argpartition(key, k - 1)[:k] if k < len(key) else np.arange(len(key))
+    idx = idx[np.lexsort((idx, key[idx]))]
+    sorted_keys = key[idx]
+    
+    boundary_total = np.count_nonzero(key == sorted_keys[-1])
+    return idx, _tie_ranks(sorted_keys, boundary_total)
+
+class TopKAccumulator:
+    """
+    Bounded top-k selection over score chunks (streaming).
+    Keeps at most k candidates plus a count of discarded scores that tie
+    with the current boundary, so final ranks still match a full rank().
+    """
+    def __init__(self, k, ascending=False):
+        self.k = int(k)
+        self.ascending = ascending
+        self.keys = np.empty(0)
+        self.labels = np.empty(0, dtype=object)
+        self.seq = np.empty(0, dtype=np.int64)
+        self.scores = np.empty(0)
+        self.seen = 0
+        self.dropped_ties = 0 # discarded scores equal to the boundary
+
+    def push(self, labels, scores):
+        scores = np.asarray(scores, dtype=float)
+        new_labels = np.empty(len(scores), dtype=object)
+        new_labels[:] = list(labels)
+        
+        keys = np.concatenate([self.keys, _order_keys(scores, self.ascending)])
+        all_labels = np.concatenate([self.labels, new_labels])
+        seq = np.concatenate([self.seq, np.arange(self.seen, self.seen + len(scores))])
+        all_scores = np.concatenate([self.scores, scores])
+        self.seen += len(scores)
+        
+        if len(keys) > self.k:
+            keep = np.argpartition(keys, self.k - 1)[:self.k] if self.k > 0 else np.empty(0, dtype=int)
+            dropped = np.ones(len(keys), dtype=bool)
+            dropped[keep] = False
+            
+            old_boundary = self.keys.max() if len(self.keys) == self.k else None
+            boundary = keys[keep].max() if self.k > 0 else None
+            newly_dropped = np.count_nonzero(keys[dropped] == boundary) if boundary is not None else 0
+            if boundary is not None and boundary == old_boundary:
+                self.dropped_ties += newly_dropped
+            else:
+                # The boundary improved: earlier discards were all worse than it
+                self.dropped_ties = newly_dropped
+            
+            keys, all_labels, seq, all_scores = keys[keep], all_labels[keep], seq[keep], all_scores[keep]
+        
+        self.keys, self.labels, self.seq, self.scores = keys, all_labels, seq, all_scores
+        return self
+
+    def result(self):
+        """
+        Returns (labels, scores, ranks), best first.
+        """
+        order = np.lexsort((self.seq, self.keys))
+        sorted_keys = self.keys[order]
+        boundary_total = 0
+        if len(sorted_keys):
+            boundary_total = np.count_nonzero(sorted_keys == sorted_keys[-1]) + self.dropped_ties
+        return list(self.labels[order]), self.scores[order], _tie_ranks(sorted_keys, boundary_total)
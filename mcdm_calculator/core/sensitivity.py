@@ -0,0 +1,130 @@
+import numpy as np
+from .kernels import as_float
+from .ranking import prepare_scoring, score_weight_samples
+from .smaa import HIGHER_IS_BETTER
+
+def rescaled_weights(weights, criteria, t):
+    """
+    Weight vectors with weight `criteria[s]` set to t[s] and the other weights
+    rescaled proportionally so every vector still sums to 1, shape (s, n).
+    When a criterion holds all the weight the others share the rest equally.
+    """
+    weights = np.asarray(weights, dtype=float)
+    n = len(weights)
+    criteria = np.asarray(criteria)
+    t = np.asarray(t, dtype=float)
+    rest = 1 - weights[criteria]
+    equal = (np.arange(n) != criteria[:, None]) / max(n - 1, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(rest[:, None] > 0, weights / rest[:, None], equal)
+    W = share * (1 - t)[:, None]
+    W[np.arange(len(criteria)), criteria] = t
+    return W
+
+def _top(scores, k, higher):
+    """First k alternatives of every row of scores, best first, ties by index."""
+    key = -scores if higher else scores
+    if k == 1:
+        return np.argmin(key, axis=1)[:, None]
+    if k < key.shape[1]:
+        part = np.argpartition(key, k - 1, axis=1)[:, :k]
+        part.sort(axis=1) # Index order, so the stable sort below breaks ties by index
+    else:
+        part = np.broadcast_to(np.arange(key.shape[1]), key.shape)
+    order = np.argsort(np.take_along_axis(key, part, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1)
+
+def _tops(prepared, W, k, v, block):
+    higher = HIGHER_IS_BETTER[prepared['method']]
+    return np.concatenate([_top(score_weight_samples(prepared, W[i:i + block], v), k, higher)
+                           for i in range(0, len(W), block)])
+
+def weight_stability(matrix, weights, criteria_types, method, k=1, v=0.5, grid=100, tol=1e-6,
+                     block_size=None):
+    """
+    Stability interval of each criterion weight.
+
+    For criterion j the weight moves along w_j = t, w_i = w_i * (1 - t) / (1 - w_j)
+    for i != j. The interval is the range of t around the current w_j over which
+    the top-k alternatives (in order) stay the same. All criteria are scanned at
+    once on a grid of t, then both ends of every interval are refined by
+    bisection, each step scoring all 2n candidate weight vectors in one call
+    to score_weight_samples. A change that reverts within one grid step
+    (1 / grid) can be missed.
+
+    Args:
+        matrix: (m, n) decision matrix
+        weights: (n,) current weights (normalized to sum 1)
+        criteria_types: list of 1 (benefit) or -1 (cost)
+        method: 'topsis', 'vikor' or 'mairca'
+        k: size of the top ranking that must not change
+        grid: grid intervals over [0, 1]
+        tol: width to which the interval ends are refined
+        block_size: weight vectors scored per call (default keeps blocks around 8M values)
+
+    Returns:
+        dict: {
+            'weights': (n,) normalized current weights,
+            'top': (k,) current top-k alternatives,
+            'lower', 'upper': (n,) interval ends; 0 / 1 when no change is found on that side,
+            'lower_top', 'upper_top': (n, k) top-k just outside each end (-1 where there is no change)
+        }
+    """
+    if method not in HIGHER_IS_BETTER:
+        raise ValueError(f"Unknown ranking method: {method}")
+    matrix = as_float(matrix, np.float64)
+    m, n = matrix.shape
+    if not 1 <= k <= m:
+        raise ValueError(f"k must be between 1 and the number of alternatives ({m})")
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / np.sum(weights)
+    prepared = prepare_scoring(matrix, criteria_types, method)
+    if block_size is None:
+        per_sample = m * n if method == 'vikor' else m
+        block_size = max(1, 8_000_000 // per_sample)
+
+    top = _tops(prepared, weights[None, :], k, v, block_size)[0]
+
+    # 1. Grid scan of every criterion in one batch
+    t = np.linspace(0, 1, grid + 1)
+    criteria = np.repeat(np.arange(n), len(t))
+    grid_tops = _tops(prepared, rescaled_weights(weights, criteria, np.tile(t, n)), k, v, block_size)
+    same = np.all(grid_tops == top, axis=1).reshape(n, len(t))
+
+    # Bracket [inside, outside] of each end: the last unchanged and first changed grid point
+    inside = np.tile(weights, 2)
+    outside = np.concatenate([np.zeros(n), np.ones(n)])
+    changed = np.zeros(2 * n, dtype=bool)
+    for j in range(n):
+        below = np.flatnonzero(t < weights[j])[::-1]
+        above = np.flatnonzero(t > weights[j])
+        for side, points in ((j, below), (n + j, above)):
+            for g in points:
+                if not same[j, g]:
+                    outside[side], changed[side] = t[g], True
+                    break
+                inside[side] = t[g]
+
+    # 2. Bisection of every changing end at once
+    sides = np.flatnonzero(changed)
+    criteria = sides % n
+    lo, hi = inside[sides], outside[sides]
+    while len(sides) and np.max(np.abs(hi - lo)) > tol:
+        mid = (lo + hi) / 2
+        stable = np.all(_tops(prepared, rescaled_weights(weights, criteria, mid), k, v, block_size) == top, axis=1)
+        lo = np.where(stable, mid, lo)
+        hi = np.where(stable, hi, mid)
+    inside[sides] = lo
+    outside[sides] = hi
+
+    outside_tops = np.full((2 * n, k), -1)
+    if len(sides):
+        outside_tops[sides] = _tops(prepared, rescaled_weights(weights, criteria, hi), k, v, block_size)
+    return {
+        'weights': weights,
+        'top': top,
+        'lower': np.where(changed[:n], inside[:n], 0.0),
+        'upper': np.where(changed[n:], inside[n:], 1.0),
+        'lower_top': outside_tops[:n],
+        'upper_top': outside_tops[n:],
+    }
@@ -0,0 +1,111 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .ranking import prepare_scoring, score_weight_samples
+
+# Methods where a higher score is better
+HIGHER_IS_BETTER = {'topsis': True, 'vikor': False, 'mairca': False}
+
+def sample_weights(rng, size, n, center=None, concentration=100.0):
+    """
+    Draw weight vectors from the simplex.
+    center=None: uniform over the simplex (Dirichlet(1, ..., 1))
+    center=w:    Dirichlet(concentration * w), i.e. spread around w.
+                 Larger concentration means samples stay closer to w.
+    """
+    if center is None:
+        alpha = np.ones(n)
+    else:
+        alpha = concentration * np.asarray(center, dtype=float)
+        alpha = np.where(alpha <= 0, 1e-3, alpha) # Dirichlet needs alpha > 0
+    return rng.dirichlet(alpha, size=size)
+
+def _rank_order(scores, method):
+    """Alternatives sorted best-first for every sample, shape (s, m)."""
+    if HIGHER_IS_BETTER[method]:
+        return np.argsort(-scores, axis=1, kind='stable')
+    return np.argsort(scores, axis=1, kind='stable')
+
+def _run_block(prepared, seed_seq, size, n, center, concentration, v):
+    """
+    Sample one block of weights, score it and return partial counts.
+    Top-level so it can run in a worker process.
+    """
+    rng = np.random.default_rng(seed_seq)
+    W = sample_weights(rng, size, n, center, concentration)
+    scores = score_weight_samples(prepared, W, v)
+    m = scores.shape[1]
+    order = _rank_order(scores, prepared['method'])
+    
+    # counts[i, r]: number of samples where alternative i has rank r+1
+    flat = order * m + np.arange(m)
+    counts = np.bincount(flat.ravel(), minlength=m * m).reshape(m, m)
+    
+    # Sum of the weight vectors that make each alternative the winner
+    central_sum = np.zeros((m, n))
+    np.add.at(central_sum, order[:, 0], W)
+    return counts, central_sum
+
+def _block_sizes(samples, block_size):
+    sizes = [block_size] * (samples // block_size)
+    if samples % block_size:
+        sizes.append(samples % block_size)
+    return sizes
+
+def smaa_analysis(matrix, criteria_types, method, samples=10000, center=None,
+                  concentration=100.0, v=0.5, seed=None, block_size=None, workers=None):
+    """
+    SMAA-style stochastic weight-space analysis.
+    
+    Weight vectors are sampled in vectorized blocks and every block is scored
+    against a single precomputed normalization of the matrix.
+    
+    Args:
+        matrix: (m, n) decision matrix
+        criteria_types: list of 1 (benefit) or -1 (cost)
+        method: 'topsis', 'vikor' or 'mairca'
+        samples: total number of weight vectors
+        center: optional weight vector to sample around (e.g. MEREC weights);
+                None samples uniformly from the simplex
+        concentration: Dirichlet concentration around `center`
+        seed: seed for reproducible results; blocks use independent
+              streams spawned from it, so results do not depend on `workers`
+        block_size: samples per block (default keeps blocks around 8M values)
+        workers: number of worker processes (None or 1 runs in-process)
+        
+    Returns:
+        dict: {
+            'acceptability': (m, m) rank acceptability indices b_i^r,
+            'central_weights': (m, n) mean weights where alternative i ranks first
+                               (NaN if it never does),
+            'samples': number of weight vectors evaluated
+        }
+    """
+    if method not in HIGHER_IS_BETTER:
+        raise ValueError(f"Unknown ranking method: {method}")
+    prepared = prepare_scoring(matrix, criteria_types, method)
+    m, n = np.shape(matrix)
+    
+    if block_size is None:
+        per_sample = m * n if method == 'vikor' else m
+        block_size = max(1, min(samples, 8_000_000 // per_sample))
+    sizes = _block_sizes(samples, block_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(prepared, s, size, n, center, concentration, v) for s, size in zip(seeds, sizes)]
+    
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_run_block, *zip(*args)))
+    else:
+        partials = [_run_block(*a) for a in args]
+    
+    counts = sum(p[0] for p in partials)
+    central_sum = sum(p[1] for p in partials)
+    first = counts[:, 0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        central_weights = central_sum / first[:, None]
+    
+    return {
+        'acceptability': counts / samples,
+        'central_weights': central_weights,
+        'samples': samples
+    }
@@ -0,0 +1,318 @@
+import numpy as np
+from .kernels import benefit_mask, scaled_distances
+from .weighting import merec_normalization
+
+class ColumnStats:
+    """
+    Column statistics accumulated chunk by chunk (first streaming pass).
+    Tracks row count, column sums, sums of squares, minima and maxima,
+    which is everything TOPSIS, VIKOR and MAIRCA need from the full matrix.
+    Partial statistics from independent chunks can be merged.
+    """
+    def __init__(self, n):
+        self.count = 0
+        self.sum = np.zeros(n)
+        self.sumsq = np.zeros(n)
+        self.min = np.full(n, np.inf)
+        self.max = np.full(n, -np.inf)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.shape[0] == 0:
+            return self
+        self.count += chunk.shape[0]
+        self.sum += np.sum(chunk, axis=0)
+        self.sumsq += np.einsum('ij,ij->j', chunk, chunk)
+        np.minimum(self.min, np.min(chunk, axis=0), out=self.min)
+        np.maximum(self.max, np.max(chunk, axis=0), out=self.max)
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.sumsq += other.sumsq
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        return self
+
+    @property
+    def norm(self):
+        """Column Euclidean norms, as used by vector normalization."""
+        return np.sqrt(self.sumsq)
+
+def collect_stats(chunks):
+    """
+    First pass: accumulate ColumnStats over an iterable of (labels, block) chunks.
+    """
+    stats = None
+    for _, block in chunks:
+        block = np.asarray(block, dtype=float)
+        if stats is None:
+            stats = ColumnStats(block.shape[1])
+        stats.update(block)
+    if stats is None or stats.count == 0:
+        raise ValueError("No data rows found")
+    return stats
+
+class EntropyAccumulator:
+    """
+    Entropy weights from one pass over the chunks.
+
+    With S_j the column sum and p_ij = x_ij / S_j,
+        Sum_i p_ij ln p_ij = (Sum_i x_ij ln x_ij) / S_j - ln S_j
+    over the non-zero entries, so the counts, column sums, sums of x ln x
+    and numbers of zeros (which count as p = 1e-9, as in entropy_weighting)
+    are all that is kept. Partial accumulators merge by addition.
+    """
+    def __init__(self, n):
+        self.count = 0
+        self.sum = np.zeros(n)
+        self.xlogx = np.zeros(n)
+        self.zeros = np.zeros(n, dtype=np.int64)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        self.count += chunk.shape[0]
+        self.sum += np.sum(chunk, axis=0)
+        # ln 1 = 0 drops the zero entries from the sum
+        self.xlogx += np.einsum('ij,ij->j', chunk, np.log(np.where(chunk == 0, 1, chunk)))
+        self.zeros += np.count_nonzero(chunk == 0, axis=0)
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.xlogx += other.xlogx
+        self.zeros += other.zeros
+        return self
+
+    @property
+    def entropy(self):
+        col_sums = np.where(self.sum == 0, 1, self.sum)
+        plogp = self.xlogx / col_sums - np.log(col_sums) * (self.sum / col_sums)
+        plogp += self.zeros * (1e-9 * np.log(1e-9))
+        return -plogp / np.log(self.count)
+
+    def weights(self):
+        div = 1 - self.entropy
+        return div / np.sum(div)
+
+class CriticAccumulator:
+    """
+    CRITIC weights from a pass over the chunks after a min/max pre-pass
+    (min_vals / max_vals, e.g. from ColumnStats).
+
+    Chunks are min-max normalized with the global extremes and reduced to
+    their mean and co-moment matrix Sum (z - mean)(z - mean)^T; partial
+    results merge with the pairwise update of Chan et al.:
+        M = M_a + M_b + d d^T * n_a n_b / (n_a + n_b),  d = mean_b - mean_a
+    Standard deviations and correlations follow from M. Memory is O(n^2).
+    """
+    def __init__(self, min_vals, max_vals):
+        self.min = np.asarray(min_vals, dtype=float)
+        self.range = np.asarray(max_vals, dtype=float) - self.min + 1e-9
+        n = len(self.min)
+        self.count = 0
+        self.mean = np.zeros(n)
+        self.comoment = np.zeros((n, n))
+
+    def _add(self, count, mean, comoment):
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.shape[0] == 0:
+            return self
+        centered = (chunk - self.min) / self.range
+        mean = np.mean(centered, axis=0)
+        centered -= mean
+        self._add(chunk.shape[0], mean, centered.T @ centered)
+        return self
+
+    def merge(self, other):
+        if other.count:
+            self._add(other.count, other.mean, other.comoment)
+        return self
+
+    @property
+    def std(self):
+        """Population standard deviations of the normalized columns."""
+        return np.sqrt(np.diag(self.comoment) / self.count)
+
+    @property
+    def correlation(self):
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / scale[:, None] / scale[None, :]
+        return np.clip(corr, -1, 1) # As np.corrcoef
+
+    def weights(self):
+        c_vals = self.std * np.sum(1 - self.correlation, axis=0)
+        return c_vals / np.sum(c_vals)
+
+class MerecAccumulator:
+    """
+    MEREC weights from a pass over the chunks after a min/max pre-pass.
+
+    Once the extremes are known each row is normalized on its own, and the
+    removal effects E_j = Sum_i |S'_ij - S_i| are sums over rows: a chunk
+    only adds its per-row log sums, and partial accumulators merge by
+    addition.
+    """
+    def __init__(self, min_vals, max_vals, criteria_types):
+        self.extremes = (np.asarray(min_vals, dtype=float), np.asarray(max_vals, dtype=float))
+        self.criteria_types = criteria_types
+        self.count = 0
+        self.E = np.zeros(len(self.extremes[0]))
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.shape[0] == 0:
+            return self
+        n = chunk.shape[1]
+        abs_log = np.log(merec_normalization(chunk, self.criteria_types, self.extremes))
+        np.abs(abs_log, out=abs_log)
+        row_total = np.sum(abs_log, axis=1)
+        S = np.log(1 + (1/n * row_total))
+        S_prime = np.log(1 + (1/n * (row_total[:, None] - abs_log)))
+        S_prime -= S[:, None]
+        self.E += np.sum(np.abs(S_prime, out=S_prime), axis=0)
+        self.count += chunk.shape[0]
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.E += other.E
+        return self
+
+    def weights(self):
+        return self.E / np.sum(self.E)
+
+STREAM_WEIGHTS = ('entropy', 'critic', 'merec')
+
+def stream_weights(chunk_source, weights_method, criteria_types=None, stats=None):
+    """
+    Out-of-core Entropy, CRITIC or MEREC weights.
+
+    chunk_source: callable returning a fresh iterator of (labels, block) pairs
+    stats: ColumnStats from an earlier pass; CRITIC and MEREC need the column
+           extremes and collect them first when it is omitted.
+    Entropy takes one pass, CRITIC and MEREC one pass after the statistics.
+    Weights match entropy_weighting / critic_weighting / merec_weighting.
+    """
+    if weights_method == 'entropy':
+        acc = None
+        for _, block in chunk_source():
+            block = np.asarray(block, dtype=float)
+            if acc is None:
+                acc = EntropyAccumulator(block.shape[1])
+            acc.update(block)
+        if acc is None or acc.count == 0:
+            raise ValueError("No data rows found")
+        return acc.weights()
+    if weights_method not in STREAM_WEIGHTS:
+        raise ValueError(f"Unknown weighting method: {weights_method}")
+    if stats is None:
+        stats = collect_stats(chunk_source())
+    if weights_method == 'critic':
+        acc = CriticAccumulator(stats.min, stats.max)
+    else:
+        acc = MerecAccumulator(stats.min, stats.max, criteria_types)
+    for _, block in chunk_source():
+        acc.update(block)
+    return acc.weights()
+
+def _topsis_chunk(block, weights, mask, stats, metric='euclidean', p=None):
+    norm = np.where(stats.norm == 0, 1, stats.norm)
+    # Ideal / anti-ideal of the weighted normalized matrix from column extremes
+    ideal = np.where(mask, stats.max, stats.min) / norm * weights
+    anti_ideal = np.where(mask, stats.min, stats.max) / norm * weights
+    dist_ideal, dist_anti_ideal = scaled_distances(block, weights, [ideal, anti_ideal], metric, p, norm=norm)
+    return dist_anti_ideal / (dist_ideal + dist_anti_ideal + 1e-9)
+
+def _vikor_regret(block, weights, mask, stats):
+    f_star = np.where(mask, stats.max, stats.min)
+    f_minus = np.where(mask, stats.min, stats.max)
+    denom = f_star - f_minus
+    denom = np.where(denom == 0, 1e-9, denom)
+    weighted_regret = weights * ((f_star - block) / denom)
+    return np.sum(weighted_regret, axis=1), np.max(weighted_regret, axis=1)
+
+def _mairca_chunk(block, weights, mask, stats):
+    div = np.where(stats.max != 0, stats.max, 1)
+    norm_matrix = np.where(mask, block / div, stats.min / np.where(block == 0, 1e-9, block))
+    Tp = (1.0 / stats.count) * weights
+    return np.sum(Tp - Tp * norm_matrix, axis=1)
+
+def stream_scores(chunk_source, weights, criteria_types, method, stats=None, v=0.5, metric='euclidean', p=None):
+    """
+    Out-of-core ranking scores.
+    
+    chunk_source: callable returning a fresh iterator of (labels, block) pairs,
+                  where block is an (rows, n) array. It is called once per pass.
+    stats: ColumnStats from an earlier pass; computed here when omitted.
+    metric, p: TOPSIS separation measure (see topsis_ranking)
+    
+    Pass 1 accumulates column statistics, pass 2 scores each chunk and yields
+    (labels, scores). VIKOR's Q needs the global extremes of S and R, so it
+    makes one extra pass to find them before yielding.
+    Scores match topsis_ranking / vikor_ranking / mairca_ranking on the full matrix.
+    """
+    weights = np.asarray(weights, dtype=float)
+    mask = benefit_mask(criteria_types)
+    if stats is None:
+        stats = collect_stats(chunk_source())
+    
+    if method == 'topsis':
+        for labels, block in chunk_source():
+            yield labels, _topsis_chunk(np.asarray(block, dtype=float), weights, mask, stats, metric, p)
+    
+    elif method == 'mairca':
+        for labels, block in chunk_source():
+            yield labels, _mairca_chunk(np.asarray(block, dtype=float), weights, mask, stats)
+    
+    elif method == 'vikor':
+        S_star, S_minus = np.inf, -np.inf
+        R_star, R_minus = np.inf, -np.inf
+        for _, block in chunk_source():
+            S, R = _vikor_regret(np.asarray(block, dtype=float), weights, mask, stats)
+            if len(S):
+                S_star, S_minus = min(S_star, S.min()), max(S_minus, S.max())
+                R_star, R_minus = min(R_star, R.min()), max(R_minus, R.max())
+        
+        delta_S = S_minus - S_star
+        delta_S = delta_S if delta_S != 0 else 1
+        delta_R = R_minus - R_star
+        delta_R = delta_R if delta_R != 0 else 1
+        
+        for labels, block in chunk_source():
+            S, R = _vikor_regret(np.asarray(block, dtype=float), weights, mask, stats)
+            yield labels, v * (S - S_star) / delta_S + (1 - v) * (R - R_star) / delta_R
+    
+    else:
+        raise ValueError(f"Unknown ranking method: {method}")
+
+def scores_from_stats(matrix, weights, criteria_types, stats, method, v=0.5):
+    """
+    Score a complete matrix whose column statistics are already known
+    (e.g. maintained incrementally), skipping the statistics pass.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    mask = benefit_mask(criteria_types)
+    if method == 'topsis':
+        return _topsis_chunk(matrix, weights, mask, stats)
+    elif method == 'mairca':
+        return _mairca_chunk(matrix, weights, mask, stats)
+    elif method == 'vikor':
+        S, R = _vikor_regret(matrix, weights, mask, stats)
+        delta_S = S.max() - S.min()
+        delta_S = delta_S if delta_S != 0 else 1
+        delta_R = R.max() - R.min()
+        delta_R = delta_R if delta_R != 0 else 1
+        return v * (S - S.min()) / delta_S + (1 - v) * (R - R.min()) / delta_R
+    raise ValueError(f"Unknown ranking method: {method}")
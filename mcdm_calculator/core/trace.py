@@ -0,0 +1,46 @@
+class _Lazy:
+    __slots__ = ('fn',)
+
+    def __init__(self, fn):
+        self.fn = fn
+
+class Trace:
+    """
+    Intermediate results of core weighting/ranking functions.
+    
+    Core functions accept trace=None; when a Trace is passed they record the
+    arrays they already computed (by reference, no copies), grouped by method:
+    
+        trace = Trace()
+        topsis_ranking(matrix, weights, types, trace=trace)
+        trace.get('topsis', 'dist_ideal')
+    
+    Values that would cost extra work can be recorded with record_lazy and are
+    only computed on first access. With trace=None nothing is recorded.
+    """
+    def __init__(self):
+        self.sections = {}
+
+    def record(self, section, key, value):
+        self.sections.setdefault(section, {})[key] = value
+
+    def record_lazy(self, section, key, fn):
+        self.sections.setdefault(section, {})[key] = _Lazy(fn)
+
+    def get(self, section, key, default=None):
+        values = self.sections.get(section, {})
+        if key not in values:
+            return default
+        value = values[key]
+        if isinstance(value, _Lazy):
+            value = values[key] = value.fn()
+        return value
+
+    def keys(self, section):
+        return list(self.sections.get(section, {}))
+
+    def __contains__(self, section):
+        return section in self.sections
+
+    def __iter__(self):
+        return iter(self.sections)
@@ -1,17 +1,21 @@
 import numpy as np
 from .normalization import min_max_normalization, sum_normalization
+from .kernels import benefit_mask, column_extremes, split_columns, as_float
+from .instrumentation import instrumented
 
-def entropy_weighting(matrix):
+@instrumented('weighting.entropy_weighting')
+def entropy_weighting(matrix, trace=None):
     """
     Calculates weights using the Entropy method.
+    trace: optional Trace recording intermediate steps under 'entropy'
     """
-    matrix = np.array(matrix, dtype=float)
+    matrix = as_float(matrix)
     # 1. Normalize (Sum based for Entropy usually, to make P_ij)
     # However, standard entropy usually effectively uses P_ij = x_ij / sum(x_i)
     p_matrix = sum_normalization(matrix)
     
     # 2. Compute Entropy
-    k = 1 / np.log(matrix.shape[0])
+    k = matrix.dtype.type(1 / np.log(matrix.shape[0]))
     
     # Handle log(0)
     p_matrix = np.where(p_matrix == 0, 1e-9, p_matrix)
@@ -21,24 +25,33 @@ def entropy_weighting(matrix):
     # 3. Compute Weights
     div = 1 - entropy
     weights = div / np.sum(div)
+    if trace is not None:
+        trace.record('entropy', 'p_matrix', p_matrix)
+        trace.record('entropy', 'entropy', entropy)
+        trace.record('entropy', 'divergence', div)
+        trace.record('entropy', 'weights', weights)
     return weights
 
-def critic_weighting(matrix):
+@instrumented('weighting.critic_weighting')
+def critic_weighting(matrix, extremes=None, trace=None):
     """
     Calculates weights using the CRITIC method (Criteria Importance Through Intercriteria Correlation).
+    extremes: optional precomputed (min_vals, max_vals) of the matrix
+    trace: optional Trace recording intermediate steps under 'critic'
     """
-    matrix = np.array(matrix, dtype=float)
+    matrix = as_float(matrix)
+    min_vals, max_vals = extremes if extremes is not None else column_extremes(matrix)
     # 1. Normalize (Min-Max recommended usually, let's assume raw data processed or use simple normalization)
     # Usually CRITIC works on normalized data. We'll normalize internally to be safe/standard.
     # We implicitly treat all as benefit for the correlation structure or just capture variance.
     # Let's use min-max normalizing everything to [0,1]
-    norm_matrix = (matrix - np.min(matrix, axis=0)) / (np.max(matrix, axis=0) - np.min(matrix, axis=0) + 1e-9)
+    norm_matrix = (matrix - min_vals) / (max_vals - min_vals + 1e-9)
 
     # 2. Standard Deviation
     std_dev = np.std(norm_matrix, axis=0)
     
     # 3. Correlation Matrix
-    corr_matrix = np.corrcoef(norm_matrix, rowvar=False)
+    corr_matrix = np.corrcoef(norm_matrix, rowvar=False, dtype=norm_matrix.dtype)
     
     # 4. Measure of Conflict
     # Sum of (1 - r_ij)
@@ -49,62 +62,159 @@ def critic_weighting(matrix):
     
     # 6. Weights
     weights = c_vals / np.sum(c_vals)
+    if trace is not None:
+        trace.record('critic', 'normalized', norm_matrix)
+        trace.record('critic', 'std', std_dev)
+        trace.record('critic', 'correlation', corr_matrix)
+        trace.record('critic', 'information', c_vals)
+        trace.record('critic', 'weights', weights)
     return weights
 
-def merec_weighting(matrix, criteria_types):
+@instrumented('weighting.merec_normalization')
+def merec_normalization(matrix, criteria_types, extremes=None):
     """
-    Calculates weights using MEREC (Method based on the Removal Effects of Criteria).
+    MEREC normalization, values in (0, 1].
+    Benefit: n_ij = min_k(x_kj) / x_ij
+    Cost: n_ij = x_ij / max_k(x_kj)
+    extremes: optional precomputed (min_vals, max_vals) of the matrix
     """
-    matrix = np.array(matrix, dtype=float)
+    matrix = as_float(matrix)
     
-    # 1. Normalize (Simple linear scaling usually: min/max)
     # Logarithmic transformation is part of MEREC, requires normalized data > 0
-    # Formula in papers: n_ij.
-    # Benefit: min/x_ij? No, MEREC normalization:
-    # If Benefit: x_ij / max, If Cost: min / x_ij ? 
-    # Let's check standard MEREC.
-    # Usually: Benefit: x_min / x_ij  | Cost: x_ij / x_max ... Wait, MEREC uses ln(S) based on performance.
-    # Let's stick to a robust simple normalization if specific MEREC norm isn't specified,
-    # but MEREC often implies a specific one.
-    # Let's use:
-    # Benefit: n_ij = min_k(x_kj) / x_ij
-    # Cost: n_ij = x_ij / max_k(x_kj)
-    # This ensures values <= 1.
-    
-    n_matrix = np.zeros_like(matrix)
-    min_vals = np.min(matrix, axis=0)
-    max_vals = np.max(matrix, axis=0)
-    
-    for j, c_type in enumerate(criteria_types):
-        if c_type == 1: # Benefit
-             n_matrix[:, j] = min_vals[j] / np.where(matrix[:, j]==0, 1e-9, matrix[:, j])
-        else: # Cost
-             n_matrix[:, j] = matrix[:, j] / np.where(max_vals[j]==0, 1, max_vals[j])
-             
-    # 2. Calculate overall performance of alternatives (S_i)
-    # S_i = ln(1 + (1/N * sum(|ln(n_ij)|))) -- Wait, typical formulation:
-    # S_i = ln (1 + (1/m * Sum( |ln(n_ij)| )))
-    
-    # Handling ln(n_ij). 0 < n_ij <= 1. ln(n_ij) <= 0. |ln| is positive.
-    # Avoid n_ij = 0
-    n_matrix = np.where(n_matrix <= 0, 1e-9, n_matrix)
+    n_matrix = np.empty_like(matrix)
+    min_vals, max_vals = extremes if extremes is not None else column_extremes(matrix)
     
-    m = matrix.shape[1]
-    S = np.log(1 + (1/m * np.sum(np.abs(np.log(n_matrix)), axis=1)))
+    def benefit(cols):
+        return min_vals[cols] / np.where(matrix[:, cols]==0, 1e-9, matrix[:, cols])
     
-    # 3. Calculate performance without each criterion j (S_ij')
-    # S_ij' = ln (1 + (1/m * Sum_{k!=j}( |ln(n_ik)| )))
+    def cost(cols):
+        return matrix[:, cols] / np.where(max_vals[cols]==0, 1, max_vals[cols])
     
-    E = np.zeros(m) # absolute removal effects
+    split_columns(benefit_mask(criteria_types), benefit, cost, n_matrix)
     
-    for j in range(m):
-        # Exclude column j
-        n_matrix_excl = np.delete(n_matrix, j, axis=1)
-        S_prime = np.log(1 + (1/m * np.sum(np.abs(np.log(n_matrix_excl)), axis=1)))
-        
-        # 4. Sum of absolute deviations
-        E[j] = np.sum(np.abs(S_prime - S))
-        
-    # 5. Calculate weights
-    weights = E / np.sum(E)
-    return weights
+    # Avoid n_ij = 0 before taking logs
+    return np.where(n_matrix <= 0, 1e-9, n_matrix)
+
+@instrumented('weighting.merec_removal_effects')
+def merec_removal_effects(matrix, criteria_types, extremes=None, trace=None):
+    """
+    MEREC steps with leave-one-out removal effects in O(m*n).
+    
+    S_i   = ln(1 + 1/n * Sum_k |ln n_ik|)
+    S'_ij = ln(1 + 1/n * (Sum_k |ln n_ik| - |ln n_ij|))
+    
+    The full row sum is computed once and every S'_ij follows by subtraction,
+    instead of rebuilding the matrix without column j for each criterion.
+    
+    trace: optional Trace recording the returned steps under 'merec'
+    
+    Returns:
+        dict: 'normalized', 'S', 'S_prime' (m x n), 'E' (removal effects), 'weights'
+    """
+    n_matrix = merec_normalization(matrix, criteria_types, extremes)
+    n = n_matrix.shape[1]
+    
+    abs_log = np.log(n_matrix)
+    np.abs(abs_log, out=abs_log)
+    row_total = np.sum(abs_log, axis=1)
+    
+    # Overall performance of alternatives
+    S = np.log(1 + (1/n * row_total))
+    
+    # Performance without each criterion j
+    S_prime = np.log(1 + (1/n * (row_total[:, None] - abs_log)))
+    
+    # Sum of absolute deviations
+    deviation = S_prime - S[:, None]
+    E = np.sum(np.abs(deviation, out=deviation), axis=0)
+    
+    steps = {
+        'normalized': n_matrix,
+        'S': S,
+        'S_prime': S_prime,
+        'E': E,
+        'weights': E / np.sum(E)
+    }
+    if trace is not None:
+        for key, value in steps.items():
+            trace.record('merec', key, value)
+    return steps
+
+@instrumented('weighting.merec_weighting')
+def merec_weighting(matrix, criteria_types, extremes=None, trace=None):
+    """
+    Calculates weights using MEREC (Method based on the Removal Effects of Criteria).
+    """
+    return merec_removal_effects(matrix, criteria_types, extremes, trace)['weights']
+
+@instrumented('weighting.batch_entropy_weighting')
+def batch_entropy_weighting(matrices):
+    """
+    Batched Entropy weights for a (batch, m, n) stack of decision matrices.
+    Returns a (batch, n) array of weights.
+    """
+    matrices = as_float(matrices)
+    col_sums = np.sum(matrices, axis=1, keepdims=True)
+    col_sums = np.where(col_sums == 0, 1, col_sums)
+    p_matrix = matrices / col_sums
+
+    k = matrices.dtype.type(1 / np.log(matrices.shape[1]))
+    p_matrix = np.where(p_matrix == 0, 1e-9, p_matrix)
+
+    entropy = -k * np.sum(p_matrix * np.log(p_matrix), axis=1)
+
+    div = 1 - entropy
+    return div / np.sum(div, axis=1, keepdims=True)
+
+@instrumented('weighting.batch_critic_weighting')
+def batch_critic_weighting(matrices):
+    """
+    Batched CRITIC weights for a (batch, m, n) stack of decision matrices.
+    Returns a (batch, n) array of weights.
+    """
+    matrices = as_float(matrices)
+    col_min = np.min(matrices, axis=1, keepdims=True)
+    col_max = np.max(matrices, axis=1, keepdims=True)
+    norm_matrix = (matrices - col_min) / (col_max - col_min + 1e-9)
+
+    std_dev = np.std(norm_matrix, axis=1)
+
+    # Pearson correlation per batch (same steps as np.corrcoef)
+    centered = norm_matrix - np.mean(norm_matrix, axis=1, keepdims=True)
+    cov = np.einsum('bij,bik->bjk', centered, centered)
+    scale = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr_matrix = cov / scale[:, :, None] / scale[:, None, :]
+    corr_matrix = np.clip(corr_matrix, -1, 1)
+
+    sum_one_minus_corr = np.sum(1 - corr_matrix, axis=1)
+    c_vals = std_dev * sum_one_minus_corr
+    return c_vals / np.sum(c_vals, axis=1, keepdims=True)
+
+@instrumented('weighting.batch_merec_weighting')
+def batch_merec_weighting(matrices, criteria_types):
+    """
+    Batched MEREC weights for a (batch, m, n) stack of decision matrices.
+    criteria_types: (n,) or (batch, n) array of 1 (benefit) / -1 (cost).
+    Returns a (batch, n) array of weights.
+    """
+    matrices = as_float(matrices)
+    b, _, n = matrices.shape
+    benefit = np.broadcast_to(benefit_mask(criteria_types), (b, n))[:, None, :]
+
+    min_vals = np.min(matrices, axis=1, keepdims=True)
+    max_vals = np.max(matrices, axis=1, keepdims=True)
+    benefit_norm = min_vals / np.where(matrices == 0, 1e-9, matrices)
+    cost_norm = matrices / np.where(max_vals == 0, 1, max_vals)
+    n_matrix = np.where(benefit, benefit_norm, cost_norm)
+    n_matrix = np.where(n_matrix <= 0, 1e-9, n_matrix)
+
+    abs_log = np.log(n_matrix)
+    np.abs(abs_log, out=abs_log)
+    row_total = np.sum(abs_log, axis=2, keepdims=True)
+    
+    S = np.log(1 + (1/n * row_total))
+    S_prime = np.log(1 + (1/n * (row_total - abs_log)))
+    E = np.sum(np.abs(S_prime - S), axis=1)
+
+    return E / np.sum(E, axis=1, keepdims=True)
@@ -0,0 +1,53 @@
+import numpy as np
+
+class Workspace:
+    """
+    Preallocated buffers for repeated runs on same-shaped (m, n) matrices.
+
+    Passed as workspace= to vector/linear normalization and the TOPSIS, VIKOR
+    and MAIRCA rankings, which then write every m x n and length-m
+    intermediate into these buffers with out= operations. Buffers are created
+    on first use and reused afterwards, so calls after the first allocate
+    only length-n vectors.
+
+    The returned scores (and any traced arrays) are views into the
+    workspace: the next call overwrites them. Copy them to keep them.
+    A workspace must not be shared between threads.
+    """
+    def __init__(self, m, n, dtype=np.float64):
+        self.shape = (m, n)
+        self.dtype = np.dtype(dtype)
+        self._buffers = {}
+
+    def _buffer(self, name, shape, dtype):
+        buf = self._buffers.get(name)
+        if buf is None:
+            buf = self._buffers[name] = np.empty(shape, dtype=dtype)
+        return buf
+
+    def matrix(self, name):
+        """(m, n) buffer."""
+        return self._buffer(name, self.shape, self.dtype)
+
+    def rows(self, name):
+        """(m,) buffer, one value per alternative."""
+        return self._buffer(name, self.shape[:1], self.dtype)
+
+    def block(self, name, rows):
+        """(rows, n) float64 buffer for kernels that read the matrix in row blocks."""
+        return self._buffer(name, (min(rows, self.shape[0]), self.shape[1]), np.float64)
+
+    def mask(self, name):
+        """(m, n) boolean buffer."""
+        return self._buffer(name, self.shape, bool)
+
+    def check(self, matrix):
+        """Raise ValueError unless matrix has the workspace's shape and dtype."""
+        if matrix.shape != self.shape or matrix.dtype != self.dtype:
+            raise ValueError(f"Workspace is for {self.shape} {self.dtype} matrices, "
+                             f"got {matrix.shape} {matrix.dtype}")
+        return matrix
+
+    @property
+    def nbytes(self):
+        return sum(buf.nbytes for buf in self._buffers.values())
@@ -0,0 +1,249 @@
+import numpy as np
+
+from mcdm_calculator.core import selection
+
+# pandas is imported where the tables are built, so importing this module stays cheap
+
+# Largest table shown per step; bigger matrices are cut to their first/last rows
+MAX_ROWS = 20
+MAX_COLS = 12
+
+TITLES = {
+    'entropy': 'ENTROPY',
+    'critic': 'CRITIC',
+    'merec': 'MEREC',
+    'topsis': 'TOPSIS',
+    'vikor': 'VIKOR',
+    'mairca': 'MAIRCA',
+    'promethee': 'PROMETHEE II',
+    'electre1': 'ELECTRE I',
+    'electre3': 'ELECTRE III',
+}
+
+# Score label and sort direction of the final ranking step
+SCORES = {
+    'topsis': ('Closeness (C)', False),
+    'vikor': ('Q Value', True),
+    'mairca': ('Total Gap', True),
+    'promethee': ('Net Flow (φ)', False),
+    'electre1': ('Net Outranking', False),
+    'electre3': ('Net Outranking', False),
+}
+
+def _shown(count, limit):
+    """Positions displayed out of count: all of them, or the first/last limit // 2."""
+    if limit is None or count <= limit:
+        return np.arange(count), 0
+    head = (limit + 1) // 2
+    return np.r_[0:head, count - (limit - head):count], count - limit
+
+def _note(rows_hidden, total_rows, cols_hidden=0, total_cols=0):
+    parts = []
+    if rows_hidden:
+        parts.append(f"{rows_hidden} of {total_rows} rows")
+    if cols_hidden:
+        parts.append(f"{cols_hidden} of {total_cols} columns")
+    return f"... {' and '.join(parts)} not shown" if parts else None
+
+def matrix_table(matrix, index, columns, max_rows=MAX_ROWS, max_cols=MAX_COLS):
+    """
+    DataFrame view of a (possibly huge) matrix, cut to its first/last rows and columns.
+    Only the displayed cells are copied.
+
+    Returns:
+        (pd.DataFrame, note): note is None when nothing was cut
+    """
+    import pandas as pd
+    matrix = np.asarray(matrix)
+    rows, rows_hidden = _shown(matrix.shape[0], max_rows)
+    cols, cols_hidden = _shown(matrix.shape[1], max_cols)
+    table = pd.DataFrame(
+        matrix[np.ix_(rows, cols)],
+        index=[index[i] for i in rows],
+        columns=[columns[j] for j in cols]
+    )
+    return table, _note(rows_hidden, matrix.shape[0], cols_hidden, matrix.shape[1])
+
+def column_table(label, keys, values, max_rows=MAX_ROWS):
+    """
+    DataFrame with one row per key (alternative or criterion) and one column per
+    entry of values (dict of label -> 1-D array), cut like matrix_table.
+    """
+    import pandas as pd
+    rows, hidden = _shown(len(keys), max_rows)
+    data = {label: [keys[i] for i in rows]}
+    for name, column in values.items():
+        data[name] = np.asarray(column)[rows]
+    return pd.DataFrame(data), _note(hidden, len(keys))
+
+def ranking_table(scores, alternatives, score_col, ascending, max_rows=MAX_ROWS):
+    """Best max_rows alternatives with their ranks (partial selection, no full sort)."""
+    import pandas as pd
+    scores = np.asarray(scores)
+    k = len(scores) if max_rows is None else min(max_rows, len(scores))
+    idx, ranks = selection.top_k(scores, k, ascending)
+    table = pd.DataFrame({
+        'Alternative': [alternatives[i] for i in idx],
+        score_col: scores[idx],
+        'Rank': ranks
+    })
+    return table, _note(len(scores) - k, len(scores))
+
+def _type_labels(criteria_types):
+    return ['Benefit' if t == 1 else 'Cost' for t in criteria_types]
+
+def _entropy_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield ("Step 1: Sum Normalization (P_ij, zeros replaced by 1e-9)",
+           *matrix_table(get('p_matrix'), alternatives, criteria_names, max_rows))
+    yield ("Step 2: Entropy (e_j), Divergence (d_j = 1 - e_j) and Weights",
+           *column_table('Criterion', criteria_names, {
+               'Entropy (e)': get('entropy'),
+               'Divergence (d)': get('divergence'),
+               'Weight': get('weights')
+           }, max_rows))
+
+def _critic_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield ("Step 1: Min-Max Normalization",
+           *matrix_table(get('normalized'), alternatives, criteria_names, max_rows))
+    yield ("Step 2: Correlation Matrix",
+           *matrix_table(get('correlation'), criteria_names, criteria_names, max_rows))
+    yield ("Step 3: Standard Deviation, Information Content (C_j) and Weights",
+           *column_table('Criterion', criteria_names, {
+               'Std Dev': get('std'),
+               'Information (C)': get('information'),
+               'Weight': get('weights')
+           }, max_rows))
+
+def _merec_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield ("Step 1: Normalization (min/x for benefit, x/max for cost)",
+           *matrix_table(get('normalized'), alternatives, criteria_names, max_rows))
+    yield ("Step 2: Overall Performance (S_i)",
+           *column_table('Alternative', alternatives, {'S': get('S')}, max_rows))
+    yield ("Step 3: Removal Effects (E_j) and Final Weights",
+           *column_table('Criterion', criteria_names, {
+               'Removal Effect (E)': get('E'),
+               'Weight': get('weights')
+           }, max_rows))
+
+def _topsis_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield ("Step 1: Vector Normalization",
+           *matrix_table(get('normalized'), alternatives, criteria_names, max_rows))
+    yield ("Step 2: Weighted Normalized Matrix",
+           *matrix_table(get('weighted'), alternatives, criteria_names, max_rows))
+    yield ("Step 3: Ideal and Anti-Ideal Solutions",
+           *column_table('Criterion', criteria_names, {
+               'Type': _type_labels(criteria_types),
+               'Ideal (A*)': get('ideal'),
+               'Anti-Ideal (A-)': get('anti_ideal')
+           }, max_rows))
+    metric, p = get('metric') or 'euclidean', get('p')
+    distance = f"Minkowski Distance, p = {p:g}" if metric == 'minkowski' else f"{metric.capitalize()} Distance"
+    yield (f"Step 4: Separation Measures ({distance})",
+           *column_table('Alternative', alternatives, {
+               'S+ (to Ideal)': get('dist_ideal'),
+               'S- (to Anti-Ideal)': get('dist_anti_ideal')
+           }, max_rows))
+
+def _vikor_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield ("Step 1: Best (f*) and Worst (f-) Values",
+           *column_table('Criterion', criteria_names, {
+               'Type': _type_labels(criteria_types),
+               'f*': get('f_star'),
+               'f-': get('f_minus')
+           }, max_rows))
+    yield ("Step 2: Weighted Normalized Regret w_j (f*_j - x_ij) / (f*_j - f-_j)",
+           *matrix_table(get('weighted_regret'), alternatives, criteria_names, max_rows))
+    yield ("Step 3: Group Utility (S), Individual Regret (R) and Q",
+           *column_table('Alternative', alternatives, {
+               'S': get('S'),
+               'R': get('R'),
+               'Q': get('scores')
+           }, max_rows))
+
+def _mairca_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield ("Step 1: Theoretical Ratings (Tp_j = w_j / m)",
+           *column_table('Criterion', criteria_names, {'Tp': get('theoretical')}, max_rows))
+    yield ("Step 2: Linear Normalization",
+           *matrix_table(get('normalized'), alternatives, criteria_names, max_rows))
+    yield ("Step 3: Real Ratings (Tr = Tp * normalized)",
+           *matrix_table(get('real'), alternatives, criteria_names, max_rows))
+    yield ("Step 4: Gap Matrix (G = Tp - Tr)",
+           *matrix_table(get('gap'), alternatives, criteria_names, max_rows))
+
+def _promethee_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield ("Step 1: Preference Functions and Thresholds (q indifference, p preference, s Gaussian)",
+           *column_table('Criterion', criteria_names, {
+               'Type': _type_labels(criteria_types),
+               'Preference': get('preference'),
+               'q': get('q'),
+               'p': get('p'),
+               's': get('s')
+           }, max_rows))
+    yield ("Step 2: Leaving (φ+) and Entering (φ-) Flows",
+           *column_table('Alternative', alternatives, {
+               'φ+': get('phi_plus'),
+               'φ-': get('phi_minus')
+           }, max_rows))
+
+def _outranking_table(get, alternatives, max_rows):
+    kernel, _ = get('kernel')
+    return column_table('Alternative', alternatives, {
+        'Outranks': get('out_degree'),
+        'Outranked By': get('in_degree'),
+        'Kernel': kernel
+    }, max_rows)
+
+def _electre1_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield (f"Step 1: Outranking Relation (C >= {get('concordance'):.4f} and D <= {get('discordance'):.4f}) and Kernel",
+           *_outranking_table(get, alternatives, max_rows))
+
+def _electre3_steps(get, criteria_names, alternatives, criteria_types, max_rows):
+    yield (f"Step 1: Outranking Relation (credibility >= {get('cut'):.4f}) and Kernel",
+           *_outranking_table(get, alternatives, max_rows))
+
+_STEPS = {
+    'entropy': _entropy_steps,
+    'critic': _critic_steps,
+    'merec': _merec_steps,
+    'topsis': _topsis_steps,
+    'vikor': _vikor_steps,
+    'mairca': _mairca_steps,
+    'promethee': _promethee_steps,
+    'electre1': _electre1_steps,
+    'electre3': _electre3_steps,
+}
+
+def trace_steps(trace, section, criteria_names, alternatives, criteria_types, max_rows=MAX_ROWS):
+    """
+    Display tables for one method recorded in a Trace.
+    Tables are built on demand from the recorded arrays and cut to max_rows.
+
+    Returns:
+        list of (title, pd.DataFrame, note) tuples
+    """
+    if section not in trace:
+        return []
+
+    def get(key):
+        return trace.get(section, key)
+
+    steps = list(_STEPS[section](get, criteria_names, alternatives, criteria_types, max_rows))
+    if section in SCORES:
+        score_col, ascending = SCORES[section]
+        steps.append((f"Step {len(steps) + 1}: Final Ranking",
+                      *ranking_table(get('scores'), alternatives, score_col, ascending, max_rows)))
+    return steps
+
+def format_steps(trace, section, criteria_names, alternatives, criteria_types, max_rows=MAX_ROWS):
+    """Plain-text report of trace_steps for terminal output."""
+    import pandas as pd
+    lines = ["", "="*60, f"{TITLES[section]} - DETAILED STEPS", "="*60]
+    for title, table, note in trace_steps(trace, section, criteria_names, alternatives,
+                                          criteria_types, max_rows):
+        # Matrices are labelled by their index, per-key tables by their first column
+        show_index = not isinstance(table.index, pd.RangeIndex)
+        lines += ["", title, "-" * 40, table.to_string(index=show_index)]
+        if note:
+            lines.append(note)
+    lines += ["="*60, ""]
+    return "\n".join(lines)
@@ -0,0 +1,237 @@
+import os
+import struct
+import numpy as np
+
+# First-column labels marking a criteria-types row directly below the header
+TYPE_ROW_LABELS = ('type', 'types', 'criteria_types')
+# Sidecar file next to the input holding the criteria types, e.g. data.types for data.csv
+TYPES_SUFFIX = '.types'
+
+def criteria_types_from_tokens(tokens):
+    """
+    Criteria types from tokens like '1', '-1', 'benefit', 'cost', 'max', 'min'.
+    Returns list of 1/-1. Raises ValueError.
+    """
+    types = []
+    for token in tokens:
+        p = str(token).strip().lower()
+        if p in ['1', '1.0', 'benefit', 'max', '+']:
+            types.append(1)
+        elif p in ['-1', '-1.0', 'cost', 'min', '-']:
+            types.append(-1)
+        else:
+            raise ValueError(f"Unknown criteria type: {p}. Use 1/benefit or -1/cost.")
+    return types
+
+class DecisionData:
+    """
+    Decision matrix with its labels, as returned by the loaders.
+    matrix may be a read-only memory map (.npy/.npz); it is not copied here.
+    criteria_types is None when the file has no types row or sidecar.
+    """
+    def __init__(self, matrix, alternatives=None, criteria=None, criteria_types=None):
+        if np.ndim(matrix) != 2:
+            raise ValueError(f"Decision matrix must be 2-D (alternatives x criteria), got shape {np.shape(matrix)}")
+        self.matrix = matrix
+        self._alternatives = list(alternatives) if alternatives is not None else None
+        self.criteria = list(criteria) if criteria is not None else [f"C{j + 1}" for j in range(matrix.shape[1])]
+        self.criteria_types = criteria_types
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def alternatives(self):
+        # Default labels A1..Am are only built when asked for
+        if self._alternatives is None:
+            self._alternatives = [f"A{i + 1}" for i in range(self.matrix.shape[0])]
+        return self._alternatives
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.matrix, index=self.alternatives, columns=self.criteria)
+
+def _from_frame(df):
+    """DecisionData from a frame indexed by alternative, taking out a leading types row."""
+    types = None
+    if len(df) and str(df.index[0]).strip().lower() in TYPE_ROW_LABELS:
+        types = criteria_types_from_tokens(df.iloc[0].tolist())
+        df = df.iloc[1:]
+    return DecisionData(df.to_numpy(dtype=float), list(df.index), list(df.columns), types)
+
+def load_csv(source):
+    import pandas as pd
+    return _from_frame(pd.read_csv(source, index_col=0))
+
+def _npy_header(f):
+    version = np.lib.format.read_magic(f)
+    readers = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+    if version not in readers:
+        return None
+    return readers[version](f)
+
+def _memmap_npz_member(path, member):
+    """
+    Memory map an array stored uncompressed in an .npz archive (np.savez), or
+    None if it is compressed (np.savez_compressed) or holds Python objects.
+    """
+    import zipfile
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, 'rb') as f:
+        # Skip the local file header: 30 fixed bytes, then name and extra field
+        f.seek(info.header_offset)
+        name_len, extra_len = struct.unpack('<HH', f.read(30)[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        header = _npy_header(f)
+        offset = f.tell()
+    if header is None:
+        return None
+    shape, fortran_order, dtype = header
+    if dtype.hasobject:
+        return None
+    return np.memmap(path, dtype=dtype, mode='r', shape=shape,
+                     order='F' if fortran_order else 'C', offset=offset)
+
+def _require_matrix(matrix, source):
+    """Raise ValueError naming the file unless matrix is 2-D (alternatives x criteria)."""
+    if matrix.ndim != 2:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', 'upload')
+        raise ValueError(f"{os.path.basename(str(name))}: expected a 2-D matrix (alternatives x criteria), "
+                         f"got shape {matrix.shape}")
+    return matrix
+
+def load_npy(source):
+    """Memory-mapped when source is a path; labels default to A1../C1.."""
+    if isinstance(source, (str, os.PathLike)):
+        return DecisionData(_require_matrix(np.load(source, mmap_mode='r'), source))
+    return DecisionData(_require_matrix(np.load(source), source))
+
+def load_npz(source):
+    """
+    .npz archive with a 'matrix' array (or a single array) and optional
+    'alternatives', 'criteria' and 'types' arrays. Uncompressed matrices are
+    memory-mapped when source is a path.
+    """
+    with np.load(source) as archive:
+        key = 'matrix' if 'matrix' in archive.files else archive.files[0]
+        matrix = None
+        if isinstance(source, (str, os.PathLike)):
+            matrix = _memmap_npz_member(source, key + '.npy')
+        if matrix is None:
+            matrix = archive[key]
+        _require_matrix(matrix, source)
+        labels = {name: archive[name].tolist() for name in ('alternatives', 'criteria', 'types')
+                  if name in archive.files}
+    types = criteria_types_from_tokens(labels['types']) if 'types' in labels else None
+    return DecisionData(matrix, labels.get('alternatives'), labels.get('criteria'), types)
+
+def _require_pyarrow(kind):
+    try:
+        import pyarrow # noqa: F401
+    except ImportError:
+        raise ImportError(f"{kind} files need the optional pyarrow package (pip install pyarrow)")
+
+def _from_columnar(df):
+    from pandas.api.types import is_numeric_dtype
+    # Frames written without their index keep the labels in the first column
+    if df.index.dtype.kind == 'i' and len(df.columns) and not is_numeric_dtype(df[df.columns[0]]):
+        df = df.set_index(df.columns[0])
+    return _from_frame(df)
+
+def load_parquet(source):
+    _require_pyarrow('Parquet')
+    import pandas as pd
+    return _from_columnar(pd.read_parquet(source))
+
+def load_feather(source):
+    _require_pyarrow('Feather')
+    import pandas as pd
+    return _from_columnar(pd.read_feather(source))
+
+def load_excel(source):
+    """
+    First sheet of an .xlsx workbook, parsed row by row in openpyxl's
+    read-only mode (no styles or formulas are loaded).
+    """
+    from openpyxl import load_workbook
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        while header and header[-1] is None:
+            header.pop()
+        criteria = [str(c) for c in header[1:]]
+        n = len(criteria)
+        alternatives, values, types = [], [], None
+        for row in rows:
+            if row is None or all(cell is None for cell in row):
+                continue
+            label, cells = row[0], row[1:n + 1]
+            if not values and types is None and str(label).strip().lower() in TYPE_ROW_LABELS:
+                types = criteria_types_from_tokens(cells)
+                continue
+            alternatives.append(label)
+            values.append(cells)
+    finally:
+        workbook.close()
+    matrix = np.array(values, dtype=float).reshape(len(values), n)
+    return DecisionData(matrix, alternatives, criteria, types)
+
+def load_excel_legacy(source):
+    # .xls is not supported by openpyxl
+    import pandas as pd
+    return _from_frame(pd.read_excel(source, index_col=0))
+
+LOADERS = {
+    '.csv': load_csv,
+    '.npy': load_npy,
+    '.npz': load_npz,
+    '.parquet': load_parquet,
+    '.pq': load_parquet,
+    '.feather': load_feather,
+    '.xlsx': load_excel,
+    '.xlsm': load_excel,
+    '.xls': load_excel_legacy,
+}
+
+def read_types_sidecar(path):
+    """Criteria types from <name>.types next to path ("-1,1,1" or "cost, benefit, ..."), or None."""
+    sidecar = os.path.splitext(path)[0] + TYPES_SUFFIX
+    if not os.path.exists(sidecar):
+        return None
+    with open(sidecar) as f:
+        tokens = f.read().replace(',', ' ').split()
+    return criteria_types_from_tokens(tokens)
+
+def load(source, name=None):
+    """
+    Load a decision matrix, picking the loader by file extension.
+
+    Args:
+        source: file path or binary file-like object (e.g. an upload)
+        name: file name used for the extension when source has none
+
+    Criteria types come from a <name>.types sidecar file (paths only), which
+    takes precedence, or from a types row right below the header.
+
+    Returns:
+        DecisionData
+    """
+    if name is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext not in LOADERS:
+        raise ValueError(f"Unsupported file format: {ext or name}. Supported: {', '.join(LOADERS)}")
+    data = LOADERS[ext](source)
+
+    if isinstance(source, (str, os.PathLike)):
+        sidecar = read_types_sidecar(source)
+        if sidecar is not None:
+            data.criteria_types = sidecar
+    if data.criteria_types is not None and len(data.criteria_types) != data.shape[1]:
+        raise ValueError(f"Number of criteria types ({len(data.criteria_types)}) doesn't match columns ({data.shape[1]}).")
+    return data
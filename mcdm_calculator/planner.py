@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+class StagePlan:
+    """
+    Small dependency graph of computation stages.
+    
+    Each stage is computed exactly once, after all of its dependencies, and
+    receives their results as positional arguments. Independent stages run
+    concurrently on a thread pool (NumPy releases the GIL in the heavy work).
+    """
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, fn, deps=()):
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage {name} depends on unknown stage {dep}")
+        self.stages[name] = (fn, tuple(deps))
+        return name
+
+    def run(self, workers=None):
+        """
+        Execute every stage; returns {stage name: result}.
+        workers=1 runs sequentially in insertion (= topological) order.
+        """
+        results = {}
+        if workers == 1:
+            for name, (fn, deps) in self.stages.items():
+                results[name] = fn(*(results[d] for d in deps))
+            return results
+        
+        pending = dict(self.stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                ready = [name for name, (_, deps) in pending.items()
+                         if all(d in results for d in deps)]
+                for name in ready:
+                    fn, deps = pending.pop(name)
+                    running[pool.submit(fn, *(results[d] for d in deps))] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        return results
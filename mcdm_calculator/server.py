@@ -0,0 +1,376 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+KEEPALIVE_TIMEOUT = 15.0
+
+REASONS = {
+    100: 'Continue', 200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    408: 'Request Timeout', 411: 'Length Required', 413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large', 500: 'Internal Server Error',
+}
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _encode(payload):
+    return json.dumps(payload, default=_json_default).encode()
+
+def _matrix(payload):
+    matrix = np.asarray(payload['matrix'], dtype=float)
+    if matrix.ndim != 2 or matrix.size == 0:
+        raise ValueError("matrix must be a non-empty list of rows")
+    return matrix
+
+def _criteria_types(payload, n):
+    types = payload.get('criteria_types')
+    if types is None:
+        return [1] * n
+    from mcdm_calculator.loaders import criteria_types_from_tokens
+    types = criteria_types_from_tokens(types)
+    if len(types) != n:
+        raise ValueError(f"Number of criteria types ({len(types)}) doesn't match columns ({n}).")
+    return types
+
+def _calculate(payload):
+    import pandas as pd
+    from mcdm_calculator.service import calculate_mcdm
+    matrix = _matrix(payload)
+    m, n = matrix.shape
+    df = pd.DataFrame(matrix,
+                      index=payload.get('alternatives') or [f"A{i + 1}" for i in range(m)],
+                      columns=payload.get('criteria') or [f"C{j + 1}" for j in range(n)])
+    out = calculate_mcdm(df, payload.get('weights', 'merec'), payload.get('ranking', 'topsis'),
+                         _criteria_types(payload, n), payload.get('manual_weights'),
+                         top_k=payload.get('top_k'), ranking_options=payload.get('ranking_options'))
+    response = {
+        'results': out['results'].to_dict(orient='records'),
+        'weights': out['weights'].to_dict(orient='records'),
+    }
+    if 'kernel' in out['intermediate']:
+        response['kernel'] = out['intermediate']['kernel']
+    return response
+
+def _weights(payload):
+    from mcdm_calculator.service import compute_weights
+    matrix = _matrix(payload)
+    weights = compute_weights(matrix, payload.get('method', 'merec'),
+                              _criteria_types(payload, matrix.shape[1]), payload.get('manual_weights'))
+    return {'weights': weights}
+
+def _scores(payload):
+    from mcdm_calculator.service import compute_scores
+    matrix = _matrix(payload)
+    weights = np.asarray(payload['weights'], dtype=float)
+    if weights.shape != (matrix.shape[1],):
+        raise ValueError(f"Expected {matrix.shape[1]} weights, got {weights.size}")
+    scores = compute_scores(matrix, weights, payload.get('method', 'topsis'),
+                            _criteria_types(payload, matrix.shape[1]),
+                            ranking_options=payload.get('ranking_options'))
+    return {'scores': scores}
+
+# POST endpoints, run on the worker pool
+ROUTES = {
+    '/calculate': _calculate,
+    '/weights': _weights,
+    '/scores': _scores,
+}
+
+def handle_request(path, body):
+    """
+    Decode a JSON request body, run the endpoint and encode its response.
+    Runs in a pool worker; returns (status, response bytes) and never raises.
+    """
+    try:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        return 200, _encode(ROUTES[path](payload))
+    except (ValueError, KeyError, TypeError) as e:
+        message = f"Missing field: {e}" if isinstance(e, KeyError) else str(e)
+        return 400, _encode({'error': message})
+    except Exception as e:
+        return 500, _encode({'error': f"{type(e).__name__}: {e}"})
+
+class LatencyHistogram:
+    """Request latencies counted in the fixed LATENCY_BUCKETS."""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(self.buckets) and seconds > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+
+    def as_dict(self):
+        # Prometheus-style cumulative counts per upper bound
+        cumulative, running = {}, 0
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {'count': self.count, 'sum_seconds': self.total, 'buckets': cumulative}
+
+class Metrics:
+    """Request counters and per-endpoint latency histograms, updated on the event loop."""
+    def __init__(self):
+        self.started = time.time()
+        self.latency = {}
+        self.responses = {}
+        self.connections = 0
+        self.open_connections = 0
+        self.in_flight = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, path, status, seconds):
+        key = path if path in ROUTES or path in ('/metrics', '/health') else 'other'
+        self.latency.setdefault(key, LatencyHistogram()).observe(seconds)
+        self.responses[status] = self.responses.get(status, 0) + 1
+
+    def as_dict(self):
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'connections_total': self.connections,
+            'connections_open': self.open_connections,
+            'requests_in_flight': self.in_flight,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'responses': {str(k): v for k, v in sorted(self.responses.items())},
+            'latency_seconds': {k: h.as_dict() for k, h in sorted(self.latency.items())},
+        }
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ScoringServer:
+    """
+    HTTP/1.1 JSON server for the MCDM service on asyncio streams.
+
+    POST /calculate, /weights and /scores run on a worker pool (processes by
+    default, threads with executor='thread'), so the event loop only parses
+    requests and keeps serving other connections meanwhile. GET /metrics
+    returns counters and latency histograms, GET /health a liveness check.
+    Connections are kept alive between requests until the client closes them,
+    sends "Connection: close" or stays idle for keepalive_timeout seconds.
+    Bodies over max_body_bytes are rejected with 413 before they are read.
+    """
+    def __init__(self, host='127.0.0.1', port=8000, workers=None, executor='process',
+                 max_body_bytes=MAX_BODY_BYTES, max_header_bytes=MAX_HEADER_BYTES,
+                 keepalive_timeout=KEEPALIVE_TIMEOUT):
+        if executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.executor = executor
+        self.max_body_bytes = max_body_bytes
+        self.max_header_bytes = max_header_bytes
+        self.keepalive_timeout = keepalive_timeout
+        self.metrics = Metrics()
+        self._pool = None
+        self._server = None
+        self._connections = set()
+
+    async def start(self):
+        pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+        self._pool = pool_class(max_workers=self.workers)
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port,
+                                                  limit=self.max_header_bytes)
+        # The bound port, when started with port=0
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise outlive the server
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    async def _read_request(self, reader):
+        """(method, path, headers, body), or None when the client closed the connection."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keepalive_timeout)
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, f"Request headers exceed {self.max_header_bytes} bytes")
+        except asyncio.TimeoutError:
+            return None
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        headers[':version'] = version
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"Request body exceeds {self.max_body_bytes} bytes")
+        return method, target.split('?', 1)[0], headers, length
+
+    async def _respond(self, writer, status, body, keep_alive):
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode()
+        writer.write(head + body)
+        await writer.drain()
+        self.metrics.bytes_out += len(head) + len(body)
+
+    async def _dispatch(self, method, path, body):
+        if path == '/metrics' or path == '/health':
+            if method != 'GET':
+                return 405, _encode({'error': f"{path} only accepts GET"})
+            payload = self.metrics.as_dict() if path == '/metrics' else {'status': 'ok'}
+            return 200, _encode(payload)
+        if path not in ROUTES:
+            return 404, _encode({'error': f"Unknown endpoint: {path}"})
+        if method != 'POST':
+            return 405, _encode({'error': f"{path} only accepts POST"})
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, handle_request, path, body)
+
+    async def _serve_connection(self, reader, writer):
+        self.metrics.connections += 1
+        self.metrics.open_connections += 1
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    # The rest of the stream cannot be trusted after a rejected head
+                    await self._respond(writer, e.status, _encode({'error': str(e)}), keep_alive=False)
+                    self.metrics.record('other', e.status, 0.0)
+                    break
+                if request is None:
+                    break
+                method, path, headers, length = request
+                start = time.perf_counter()
+
+                if length and headers.get('expect', '').lower() == '100-continue':
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                    await writer.drain()
+                try:
+                    body = await asyncio.wait_for(reader.readexactly(length), self.keepalive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                self.metrics.bytes_in += length
+
+                connection = headers.get('connection', '').lower()
+                if headers[':version'] == 'HTTP/1.0':
+                    keep_alive = connection == 'keep-alive'
+                else:
+                    keep_alive = connection != 'close'
+
+                self.metrics.in_flight += 1
+                try:
+                    status, response = await self._dispatch(method, path, body)
+                finally:
+                    self.metrics.in_flight -= 1
+                await self._respond(writer, status, response, keep_alive)
+                self.metrics.record(path, status, time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(task)
+            self.metrics.open_connections -= 1
+            writer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="calculator.py serve",
+        description="Serve the MCDM calculator over HTTP/JSON",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Endpoints:
+  POST /calculate  {"matrix": [[...]], "criteria_types": [...], "weights": "merec", "ranking": "topsis"}
+  POST /weights    {"matrix": [[...]], "method": "entropy"}
+  POST /scores     {"matrix": [[...]], "weights": [...], "method": "vikor"}
+  GET  /metrics    request counters and latency histograms
+  GET  /health
+        """
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port (default: 8000)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Worker pool size (default: CPU count)')
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                       help='Worker pool kind (default: process)')
+    parser.add_argument('--max-body-mb', type=float, default=MAX_BODY_BYTES / 2**20,
+                       help='Largest accepted request body in MiB (default: 16)')
+    parser.add_argument('--keepalive-timeout', type=float, default=KEEPALIVE_TIMEOUT,
+                       help='Seconds an idle connection is kept open (default: 15)')
+    args = parser.parse_args(argv)
+
+    server = ScoringServer(args.host, args.port, args.workers, args.executor,
+                           max_body_bytes=int(args.max_body_mb * 2**20),
+                           keepalive_timeout=args.keepalive_timeout)
+
+    async def run():
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port} ({args.workers} {args.executor} workers)")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
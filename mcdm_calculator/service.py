@@ -1,5 +1,4 @@
 
-import pandas as pd
 import numpy as np
 import sys
 import os
@@ -7,48 +6,191 @@ import os
 # Add current directory to path
 sys.path.append(os.getcwd())
 
-from mcdm_calculator.core import normalization, weighting, ranking
-from mcdm_calculator.calculator import verbose_topsis, verbose_merec # Reusing existing verbose logic if possible, or refactoring
+from mcdm_calculator.core import normalization, weighting, ranking, smaa, selection, kernels, rank_reversal, sensitivity
+from mcdm_calculator.cache import LRUCache, fingerprint
+from mcdm_calculator.planner import StagePlan
+from mcdm_calculator.core.instrumentation import Profiler, stage
+from mcdm_calculator.core.trace import Trace
 
-def calculate_mcdm(df, weights_method, ranking_method, criteria_types, manual_weights=None):
+# pandas is imported by the functions that build DataFrames, so the numpy-only
+# entry points (compute_weights, compute_scores, compute_batch_*) do not load it
+
+def compute_weights(matrix, weights_method, criteria_types, manual_weights=None, trace=None):
+    """
+    Compute the criteria weight vector for one decision matrix.
+    weights_method: 'merec', 'entropy', 'critic', 'equal', 'manual'
+    trace: optional Trace for the intermediate steps
+    """
+    if weights_method == 'manual':
+        if not manual_weights:
+            raise ValueError("Manual weights required")
+        weights = np.array(manual_weights)
+        weights = weights / np.sum(weights)
+    elif weights_method == 'equal':
+        n = matrix.shape[1]
+        weights = np.ones(n) / n
+    elif weights_method == 'entropy':
+        weights = weighting.entropy_weighting(matrix, trace=trace)
+    elif weights_method == 'critic':
+        weights = weighting.critic_weighting(matrix, trace=trace)
+    elif weights_method == 'merec':
+        weights = weighting.merec_weighting(matrix, criteria_types, trace=trace)
+    else:
+        raise ValueError(f"Unknown weighting method: {weights_method}")
+    return weights
+
+def compute_scores(matrix, weights, ranking_method, criteria_types, trace=None, ranking_options=None):
+    """
+    Compute ranking scores for one decision matrix.
+    ranking_method: 'topsis', 'vikor', 'mairca', 'promethee', 'electre1', 'electre3'
+    trace: optional Trace for the intermediate steps
+    ranking_options: optional keyword arguments of the ranking function
+        (e.g. preference / q / p / s for PROMETHEE, q / p / v / cut for ELECTRE III)
+    """
+    options = ranking_options or {}
+    if ranking_method == 'topsis':
+        return ranking.topsis_ranking(matrix, weights, criteria_types, trace=trace, **options)
+    elif ranking_method == 'vikor':
+        return ranking.vikor_ranking(matrix, weights, criteria_types, trace=trace, **options)
+    elif ranking_method == 'mairca':
+        return ranking.mairca_ranking(matrix, weights, criteria_types, trace=trace, **options)
+    elif ranking_method == 'promethee':
+        return ranking.promethee_ranking(matrix, weights, criteria_types, trace=trace, **options)
+    elif ranking_method == 'electre1':
+        return ranking.electre1_ranking(matrix, weights, criteria_types, trace=trace, **options)
+    elif ranking_method == 'electre3':
+        return ranking.electre3_ranking(matrix, weights, criteria_types, trace=trace, **options)
+    raise ValueError(f"Unknown ranking method: {ranking_method}")
+
+def compute_batch_weights(matrices, weights_method, criteria_types, manual_weights=None):
+    """
+    Batched compute_weights for a (batch, m, n) stack of decision matrices.
+    criteria_types: (n,) or (batch, n). manual_weights: (batch, n), one list per matrix.
+    Returns a (batch, n) array.
+    """
+    if weights_method == 'manual':
+        if manual_weights is None or len(manual_weights) == 0:
+            raise ValueError("Manual weights required")
+        weights = np.array(manual_weights, dtype=float)
+        return weights / np.sum(weights, axis=1, keepdims=True)
+    elif weights_method == 'equal':
+        b, _, n = np.shape(matrices)
+        return np.ones((b, n)) / n
+    elif weights_method == 'entropy':
+        return weighting.batch_entropy_weighting(matrices)
+    elif weights_method == 'critic':
+        return weighting.batch_critic_weighting(matrices)
+    elif weights_method == 'merec':
+        return weighting.batch_merec_weighting(matrices, criteria_types)
+    raise ValueError(f"Unknown weighting method: {weights_method}")
+
+def compute_batch_scores(matrices, weights, ranking_method, criteria_types):
+    """
+    Batched compute_scores for a (batch, m, n) stack of decision matrices.
+    weights / criteria_types: (n,) or (batch, n). Returns a (batch, m) array.
+    The pairwise (outranking) methods have no batched kernel and rank the matrices one at a time.
+    """
+    if ranking_method == 'topsis':
+        return ranking.batch_topsis_ranking(matrices, weights, criteria_types)
+    elif ranking_method == 'vikor':
+        return ranking.batch_vikor_ranking(matrices, weights, criteria_types)
+    elif ranking_method == 'mairca':
+        return ranking.batch_mairca_ranking(matrices, weights, criteria_types)
+    elif ranking_method in PAIRWISE_METHODS:
+        b, _, n = np.shape(matrices)
+        weights = np.broadcast_to(weights, (b, n))
+        types = np.broadcast_to(criteria_types, (b, n))
+        return np.stack([compute_scores(matrices[i], weights[i], ranking_method, types[i]) for i in range(b)])
+    raise ValueError(f"Unknown ranking method: {ranking_method}")
+
+# Memoized weight and ranking stages, keyed on content hashes of the inputs
+weights_cache = LRUCache(max_entries=256, max_bytes=16 * 1024 * 1024)
+scores_cache = LRUCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+
+def cache_info():
+    """Hit/miss/eviction counters of the weight and ranking stage caches."""
+    return {'weights': weights_cache.info(), 'scores': scores_cache.info()}
+
+def clear_cache():
+    weights_cache.clear()
+    scores_cache.clear()
+
+def _memoized(cache, key, compute):
+    value = cache.get(key)
+    if value is None:
+        value = np.asarray(compute())
+        value.setflags(write=False) # Shared between callers
+        cache.put(key, value)
+    return value
+
+def calculate_mcdm(df, weights_method, ranking_method, criteria_types, manual_weights=None, top_k=None,
+                   use_cache=True, profile=False, explain=False, dtype=None, ranking_options=None):
     """
     Core service function to calculate MCDM rankings.
     
     Args:
         df (pd.DataFrame): Input dataframe (Index=Alternatives, Cols=Criteria)
         weights_method (str): 'merec', 'entropy', 'critic', 'equal', 'manual'
-        ranking_method (str): 'topsis', 'vikor', 'mairca'
+        ranking_method (str): 'topsis', 'vikor', 'mairca', 'promethee', 'electre1', 'electre3'
         criteria_types (list): List of 1 (Benefit) or -1 (Cost)
         manual_weights (list, optional): List of weights if weights_method is 'manual'
+        top_k (int, optional): Only keep the k best alternatives (partial selection, no full sort)
+        use_cache (bool): Reuse weights/scores computed earlier for identical inputs
+            (ELECTRE scores are always computed, together with their kernel)
+        profile (bool): Record per-stage wall/CPU time and peak memory in intermediate['profile']
+        explain (bool): Record the intermediate steps in intermediate['trace'] (a core.trace.Trace,
+            rendered with explain.trace_steps). Bypasses the cache, the steps come from one computation.
+        dtype (optional): Compute dtype, np.float32 or np.float64. Default: float32/float64 frames
+            keep their dtype, others use float64. The matrix is converted at most once.
+        ranking_options (dict, optional): Extra arguments of the ranking method, e.g.
+            {'preference': 'linear', 'q': 0.5, 'p': 2.0} for PROMETHEE
         
     Returns:
         dict: {
-            'results': pd.DataFrame (Final ranking),
+            'results': pd.DataFrame (Final ranking; ELECTRE adds a boolean 'Kernel' column),
             'weights': pd.DataFrame (Weights used),
-            'intermediate': dict (Any intermediate steps for display)
+            'intermediate': dict (Any intermediate steps for display; ELECTRE adds
+                'kernel' and 'cycles', lists of alternative names)
         }
     """
-    matrix = df.values
+    if not profile:
+        return _calculate_mcdm(df, weights_method, ranking_method, criteria_types,
+                               manual_weights, top_k, use_cache, explain, dtype, ranking_options)
+    
+    with Profiler(memory=True) as profiler:
+        with stage('calculate_mcdm'):
+            output = _calculate_mcdm(df, weights_method, ranking_method, criteria_types,
+                                     manual_weights, top_k, use_cache, explain, dtype, ranking_options)
+    output['intermediate']['profile'] = profiler.as_dicts()
+    return output
+
+def _calculate_mcdm(df, weights_method, ranking_method, criteria_types, manual_weights, top_k, use_cache,
+                    explain=False, dtype=None, ranking_options=None):
+    import pandas as pd
+    # A view of the frame's data when it is already floating point; the core never writes into it
+    matrix = kernels.as_float(df.to_numpy(), dtype)
     criteria_names = list(df.columns)
     alternatives = list(df.index)
     
+    if ranking_method not in RANKING_OUTPUT:
+        raise ValueError(f"Unknown ranking method: {ranking_method}")
+    
+    trace = Trace() if explain else None
+    use_cache = use_cache and not explain
+    
     # 1. Calculate Weights
-    if weights_method == 'manual':
-        if not manual_weights:
-            raise ValueError("Manual weights required")
-        weights = np.array(manual_weights)
-        weights = weights / np.sum(weights)
-    elif weights_method == 'equal':
-        n = len(criteria_names)
-        weights = np.ones(n) / n
-    elif weights_method == 'entropy':
-        weights = weighting.entropy_weighting(matrix)
-    elif weights_method == 'critic':
-        weights = weighting.critic_weighting(matrix)
-    elif weights_method == 'merec':
-        weights = weighting.merec_weighting(matrix, criteria_types)
-    else:
-        raise ValueError(f"Unknown weighting method: {weights_method}")
+    with stage('weights'):
+        if use_cache:
+            matrix_key = fingerprint(matrix)
+            types_key = tuple(int(t) for t in criteria_types)
+            manual_key = tuple(manual_weights) if weights_method == 'manual' and manual_weights else None
+            weights = _memoized(
+                weights_cache,
+                fingerprint(matrix_key, weights_method, types_key, manual_key),
+                lambda: compute_weights(matrix, weights_method, criteria_types, manual_weights)
+            )
+        else:
+            weights = compute_weights(matrix, weights_method, criteria_types, manual_weights, trace)
 
     # Prepare weights dataframe for display
     df_weights = pd.DataFrame({
@@ -57,38 +199,410 @@ def calculate_mcdm(df, weights_method, ranking_method, criteria_types, manual_we
     })
 
     # 2. Calculate Ranking
-    # Note: We might want to capture more detailed intermediate steps later
-    # For now, we return standard ranking
-    
-    score_col = 'Score'
-    ascending = False
-
-    if ranking_method == 'topsis':
-        scores = ranking.topsis_ranking(matrix, weights, criteria_types)
-        score_col = 'Closeness Score'
-        ascending = False
-    elif ranking_method == 'vikor':
-        scores = ranking.vikor_ranking(matrix, weights, criteria_types)
-        score_col = 'Q Value'
-        ascending = True
-    elif ranking_method == 'mairca':
-        scores = ranking.mairca_ranking(matrix, weights, criteria_types)
-        score_col = 'Total Gap'
-        ascending = True
-    else:
-        raise ValueError(f"Unknown ranking method: {ranking_method}")
+    score_col, ascending = RANKING_OUTPUT[ranking_method]
+    # The ELECTRE kernel comes from the relation built for the scores, so those runs are always traced
+    rank_trace = Trace() if trace is None and ranking_method in KERNEL_METHODS else trace
+    with stage('ranking'):
+        if use_cache and rank_trace is None:
+            scores = _memoized(
+                scores_cache,
+                fingerprint(matrix_key, np.asarray(weights, dtype=float), ranking_method, types_key,
+                            sorted((ranking_options or {}).items())),
+                lambda: compute_scores(matrix, weights, ranking_method, criteria_types,
+                                       ranking_options=ranking_options)
+            )
+        else:
+            scores = compute_scores(matrix, weights, ranking_method, criteria_types, rank_trace, ranking_options)
         
     # 3. Format Results
+    intermediate = {}
+    with stage('format'):
+        results = _format_results(alternatives, scores, score_col, ascending, top_k)
+        if ranking_method in KERNEL_METHODS:
+            kernel, cycles = rank_trace.get(ranking_method, 'kernel')
+            results['Kernel'] = kernel[results.index.to_numpy()]
+            intermediate['kernel'] = [alternatives[i] for i in np.flatnonzero(kernel)]
+            intermediate['cycles'] = [[alternatives[i] for i in cycle] for cycle in cycles]
+    
+    if trace is not None:
+        intermediate['trace'] = trace
+    return {
+        'results': results,
+        'weights': df_weights,
+        'intermediate': intermediate
+    }
+
+# Score column label and sort direction for each ranking method
+RANKING_OUTPUT = {
+    'topsis': ('Closeness Score', False),
+    'vikor': ('Q Value', True),
+    'mairca': ('Total Gap', True),
+    'promethee': ('Net Flow', False),
+    'electre1': ('Net Outranking', False),
+    'electre3': ('Net Outranking', False),
+}
+
+# Methods ranked from pairwise comparisons of the whole matrix (no batched or prepared form)
+PAIRWISE_METHODS = ('promethee', 'electre1', 'electre3')
+# Methods whose outranking relation has a kernel reported by calculate_mcdm
+KERNEL_METHODS = ('electre1', 'electre3')
+
+def _format_results(alternatives, scores, score_col, ascending, top_k=None):
+    """
+    Build the ranked results table shown to users.
+    With top_k only the k best rows are selected and sorted; ranks are
+    identical to ranking the full table.
+    """
+    import pandas as pd
+    if top_k is not None:
+        idx, ranks = selection.top_k(scores, top_k, ascending)
+        return pd.DataFrame({
+            'Alternative': [alternatives[i] for i in idx],
+            score_col: np.asarray(scores)[idx],
+            'Rank': ranks
+        }, index=idx)
+    
     results = pd.DataFrame({
         'Alternative': alternatives,
         score_col: scores
     })
     
     results['Rank'] = results[score_col].rank(ascending=ascending).astype(int)
-    results = results.sort_values('Rank')
+    return results.sort_values('Rank')
+
+def _per_matrix(value, count):
+    """
+    Expand a shared per-criterion list to one entry per matrix.
+    Accepts a flat list (shared) or a list of lists (one per matrix).
+    """
+    if value is None:
+        return [None] * count
+    if len(value) > 0 and np.ndim(value[0]) == 1:
+        if len(value) != count:
+            raise ValueError(f"Expected {count} entries, got {len(value)}")
+        return list(value)
+    return [value] * count
+
+def calculate_many(dfs, weights_method, ranking_method, criteria_types, manual_weights=None, top_k=None):
+    """
+    Batched counterpart of calculate_mcdm for many decision matrices.
+    
+    Matrices with the same shape are stacked and processed in a single
+    vectorized pass through the batch_* core functions.
+    
+    Args:
+        dfs (list): DataFrames (Index=Alternatives, Cols=Criteria)
+        weights_method (str): 'merec', 'entropy', 'critic', 'equal', 'manual'
+        ranking_method (str): 'topsis', 'vikor', 'mairca', 'promethee', 'electre1', 'electre3'
+        criteria_types (list): One list of 1/-1 shared by all matrices, or one list per matrix
+        manual_weights (list, optional): One list shared by all matrices, or one list per matrix
+        top_k (int, optional): Only keep the k best alternatives of each matrix
+        
+    Returns:
+        list: One dict per input, in input order, shaped like calculate_mcdm's result
+    """
+    import pandas as pd
+    if ranking_method not in RANKING_OUTPUT:
+        raise ValueError(f"Unknown ranking method: {ranking_method}")
+    if weights_method not in ('merec', 'entropy', 'critic', 'equal', 'manual'):
+        raise ValueError(f"Unknown weighting method: {weights_method}")
+    if weights_method == 'manual' and not manual_weights:
+        raise ValueError("Manual weights required")
+
+    dfs = list(dfs)
+    types_list = _per_matrix(criteria_types, len(dfs))
+    manual_list = _per_matrix(manual_weights, len(dfs))
+    
+    # Group inputs by shape so each group is one (batch, m, n) tensor
+    groups = {}
+    for idx, df in enumerate(dfs):
+        groups.setdefault(df.shape, []).append(idx)
+    
+    score_col, ascending = RANKING_OUTPUT[ranking_method]
+    outputs = [None] * len(dfs)
+    
+    for (m, n), indices in groups.items():
+        matrices = np.stack([dfs[i].values for i in indices]).astype(float)
+        c_types = np.array([types_list[i] for i in indices])
+        
+        # 1. Weights for the whole group
+        manual = [manual_list[i] for i in indices] if weights_method == 'manual' else None
+        weights = compute_batch_weights(matrices, weights_method, c_types, manual)
+        
+        # 2. Scores for the whole group
+        scores = compute_batch_scores(matrices, weights, ranking_method, c_types)
+        
+        # 3. Format per matrix
+        for row, i in enumerate(indices):
+            df = dfs[i]
+            outputs[i] = {
+                'results': _format_results(list(df.index), scores[row], score_col, ascending, top_k),
+                'weights': pd.DataFrame({
+                    'Criterion': list(df.columns),
+                    'Weight': weights[row]
+                }),
+                'intermediate': {}
+            }
+    
+    return outputs
+
+def calculate_smaa(df, ranking_method, criteria_types, weights_method=None,
+                   samples=10000, concentration=100.0, seed=None, workers=None):
+    """
+    Stochastic (SMAA-style) robustness analysis of a ranking under weight uncertainty.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe (Index=Alternatives, Cols=Criteria)
+        ranking_method (str): 'topsis', 'vikor', 'mairca'
+        criteria_types (list): List of 1 (Benefit) or -1 (Cost)
+        weights_method (str, optional): None samples uniformly from the weight simplex;
+            'merec', 'entropy' or 'critic' samples a Dirichlet around those weights
+        samples (int): Number of weight vectors
+        concentration (float): Dirichlet concentration around the central weights
+        seed (int, optional): Seed for reproducible results
+        workers (int, optional): Number of worker processes
+        
+    Returns:
+        dict: {
+            'acceptability': pd.DataFrame (Alternatives x Rank 1..m),
+            'central_weights': pd.DataFrame (Alternatives x Criteria),
+            'center': np.ndarray or None (weights the samples were drawn around)
+        }
+    """
+    import pandas as pd
+    matrix = df.values
+    alternatives = list(df.index)
+    
+    center = None
+    if weights_method is not None:
+        if weights_method not in ('merec', 'entropy', 'critic'):
+            raise ValueError(f"Unknown weighting method for SMAA: {weights_method}")
+        center = compute_weights(matrix, weights_method, criteria_types)
+    
+    analysis = smaa.smaa_analysis(
+        matrix, criteria_types, ranking_method,
+        samples=samples, center=center, concentration=concentration,
+        seed=seed, workers=workers
+    )
+    
+    acceptability = pd.DataFrame(
+        analysis['acceptability'],
+        index=alternatives,
+        columns=[f"Rank {r + 1}" for r in range(len(alternatives))]
+    )
+    central_weights = pd.DataFrame(
+        analysis['central_weights'], index=alternatives, columns=list(df.columns)
+    )
     
     return {
-        'results': results,
-        'weights': df_weights,
-        'intermediate': {} # Placeholder for deeper verbose data
+        'acceptability': acceptability,
+        'central_weights': central_weights,
+        'center': center
+    }
+
+WEIGHT_METHODS = ('merec', 'entropy', 'critic', 'equal', 'manual')
+# Rankings of analyze_all by default; the O(m^2) PAIRWISE_METHODS are opt-in
+ANALYZE_RANKINGS = ('topsis', 'vikor', 'mairca')
+
+def analyze_all(df, criteria_types, manual_weights=None, weights_methods=None,
+                ranking_methods=None, workers=None):
+    """
+    Run every weighting x ranking combination with shared intermediate stages.
+    
+    Column extremes, vector/linear normalization, each weight vector and each
+    ranking method's weight-independent preparation are computed exactly once;
+    independent stages run on a thread pool.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe (Index=Alternatives, Cols=Criteria)
+        criteria_types (list): List of 1 (Benefit) or -1 (Cost)
+        manual_weights (list, optional): Adds the 'manual' weighting when given
+        weights_methods (list, optional): Subset of weighting methods (default: all available)
+        ranking_methods (list, optional): Ranking methods (default: ANALYZE_RANKINGS; pass
+            'promethee', 'electre1' or 'electre3' to include the pairwise methods)
+        workers (int, optional): Thread pool size (1 = sequential)
+        
+    Returns:
+        dict: {
+            'results': pd.DataFrame (Weighting, Ranking, Alternative, Score, Rank),
+            'weights': pd.DataFrame (Criterion x weighting method)
+        }
+    """
+    import pandas as pd
+    matrix = np.array(df.values, dtype=float)
+    criteria_names = list(df.columns)
+    alternatives = list(df.index)
+    
+    if weights_methods is None:
+        weights_methods = [w for w in WEIGHT_METHODS if w != 'manual' or manual_weights]
+    if ranking_methods is None:
+        ranking_methods = list(ANALYZE_RANKINGS)
+    for r in ranking_methods:
+        if r not in RANKING_OUTPUT:
+            raise ValueError(f"Unknown ranking method: {r}")
+    
+    plan = StagePlan()
+    plan.add('extremes', lambda: kernels.column_extremes(matrix))
+    plan.add('vector_norm', lambda: normalization.vector_normalization(matrix))
+    plan.add('linear_norm', lambda ext: normalization.linear_normalization(matrix, criteria_types, ext),
+             deps=['extremes'])
+    
+    # Weight stages
+    weight_fns = {
+        'merec': (lambda ext: weighting.merec_weighting(matrix, criteria_types, ext), ['extremes']),
+        'entropy': (lambda: weighting.entropy_weighting(matrix), []),
+        'critic': (lambda ext: weighting.critic_weighting(matrix, ext), ['extremes']),
+        'equal': (lambda: compute_weights(matrix, 'equal', criteria_types), []),
+        'manual': (lambda: compute_weights(matrix, 'manual', criteria_types, manual_weights), []),
     }
+    for w in weights_methods:
+        if w not in weight_fns:
+            raise ValueError(f"Unknown weighting method: {w}")
+        fn, deps = weight_fns[w]
+        plan.add(f"weights:{w}", fn, deps)
+    
+    # Weight-independent ranking preparation (the pairwise methods have none, they rank the matrix)
+    prepare_deps = {'topsis': 'vector_norm', 'vikor': 'extremes', 'mairca': 'linear_norm'}
+    for r in ranking_methods:
+        if r in PAIRWISE_METHODS:
+            continue
+        if r == 'vikor':
+            fn = lambda ext: ranking.prepare_scoring(matrix, criteria_types, 'vikor', extremes=ext)
+        else:
+            fn = lambda norm, r=r: ranking.prepare_scoring(matrix, criteria_types, r, normalized=norm)
+        plan.add(f"prepare:{r}", fn, [prepare_deps[r]])
+    
+    # Scores for every combination
+    for w in weights_methods:
+        for r in ranking_methods:
+            if r in PAIRWISE_METHODS:
+                plan.add(f"scores:{w}:{r}",
+                         lambda weights, r=r: compute_scores(matrix, weights, r, criteria_types),
+                         [f"weights:{w}"])
+                continue
+            plan.add(f"scores:{w}:{r}",
+                     lambda prepared, weights: ranking.score_weight_samples(prepared, weights)[0],
+                     [f"prepare:{r}", f"weights:{w}"])
+    
+    stages = plan.run(workers)
+    
+    frames = []
+    for w in weights_methods:
+        for r in ranking_methods:
+            scores = stages[f"scores:{w}:{r}"]
+            _, ascending = RANKING_OUTPUT[r]
+            frames.append(pd.DataFrame({
+                'Weighting': w,
+                'Ranking': r,
+                'Alternative': alternatives,
+                'Score': scores,
+                'Rank': pd.Series(scores).rank(ascending=ascending).astype(int).values
+            }))
+    
+    df_weights = pd.DataFrame(
+        {w: stages[f"weights:{w}"] for w in weights_methods},
+        index=pd.Index(criteria_names, name='Criterion')
+    )
+    
+    return {
+        'results': pd.concat(frames, ignore_index=True),
+        'weights': df_weights
+    }
+
+def calculate_rank_reversal(df, weights_method, ranking_method, criteria_types, manual_weights=None,
+                            all_pairs=None):
+    """
+    Leave-one-out rank-reversal analysis (see core.rank_reversal).
+    Weights are computed once on the full matrix and kept for every removal.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe (Index=Alternatives, Cols=Criteria)
+        weights_method (str): 'merec', 'entropy', 'critic', 'equal', 'manual'
+        ranking_method (str): 'topsis', 'vikor', 'mairca'
+        criteria_types (list): List of 1 (Benefit) or -1 (Cost)
+        manual_weights (list, optional): List of weights if weights_method is 'manual'
+        all_pairs (bool, optional): Check every pair, not only neighbours in the ranking
+            (default: up to rank_reversal.ALL_PAIRS_MAX alternatives)
+        
+    Returns:
+        dict: {
+            'summary': pd.DataFrame (Removed, Rank, Reversals, Involved, Best Changed, New Best),
+            'flips': pd.DataFrame (Removed, Above, Below) one row per reversed pair,
+            'weights': pd.DataFrame (Weights used),
+            'all_pairs': bool
+        }
+    """
+    import pandas as pd
+    if ranking_method not in rank_reversal.RANKINGS:
+        raise ValueError(f"Unknown ranking method for rank reversal: {ranking_method}")
+    matrix = kernels.as_float(df.to_numpy(), np.float64)
+    alternatives = list(df.index)
+    weights = compute_weights(matrix, weights_method, criteria_types, manual_weights)
+    analysis = rank_reversal.rank_reversal_analysis(matrix, weights, criteria_types, ranking_method,
+                                                    all_pairs=all_pairs)
+    
+    order = analysis['order']
+    rank = np.empty(len(order), dtype=int)
+    rank[order] = np.arange(1, len(order) + 1)
+    flips = analysis['flips']
+    
+    summary = pd.DataFrame({
+        'Removed': alternatives,
+        'Rank': rank,
+        'Reversals': analysis['flip_counts'],
+        'Involved': analysis['involved_counts'],
+        'Best Changed': analysis['best_changed'],
+        'New Best': [alternatives[i] for i in analysis['best']],
+    }).sort_values('Rank')
+    return {
+        'summary': summary,
+        'flips': pd.DataFrame({
+            'Removed': [alternatives[i] for i in flips[:, 0]],
+            'Above': [alternatives[i] for i in flips[:, 1]],
+            'Below': [alternatives[i] for i in flips[:, 2]],
+        }),
+        'weights': pd.DataFrame({'Criterion': list(df.columns), 'Weight': weights}),
+        'all_pairs': analysis['all_pairs'],
+    }
+
+def calculate_weight_stability(df, weights_method, ranking_method, criteria_types, manual_weights=None, k=1):
+    """
+    Weight stability intervals (see core.sensitivity.weight_stability): for each
+    criterion, how far its weight can move, with the other weights rescaled
+    proportionally, before the top-k ranking changes.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe (Index=Alternatives, Cols=Criteria)
+        weights_method (str): 'merec', 'entropy', 'critic', 'equal', 'manual'
+        ranking_method (str): 'topsis', 'vikor', 'mairca'
+        criteria_types (list): List of 1 (Benefit) or -1 (Cost)
+        manual_weights (list, optional): List of weights if weights_method is 'manual'
+        k (int): Number of top alternatives (in order) that must stay the same
+        
+    Returns:
+        dict: {
+            'intervals': pd.DataFrame (Criterion, Weight, Lower, Upper, Top Below, Top Above),
+            'top': list of the current top-k alternatives
+        }
+    """
+    import pandas as pd
+    if ranking_method not in sensitivity.HIGHER_IS_BETTER:
+        raise ValueError(f"Unknown ranking method for weight stability: {ranking_method}")
+    matrix = kernels.as_float(df.to_numpy(), np.float64)
+    alternatives = list(df.index)
+    weights = compute_weights(matrix, weights_method, criteria_types, manual_weights)
+    result = sensitivity.weight_stability(matrix, weights, criteria_types, ranking_method, k=k)
+    
+    def names(top):
+        # Top-k just outside the interval, '' where the ranking never changes
+        return ' > '.join(str(alternatives[i]) for i in top) if top[0] >= 0 else ''
+    
+    intervals = pd.DataFrame({
+        'Criterion': list(df.columns),
+        'Weight': result['weights'],
+        'Lower': result['lower'],
+        'Upper': result['upper'],
+        'Top Below': [names(top) for top in result['lower_top']],
+        'Top Above': [names(top) for top in result['upper_top']],
+    })
+    return {'intervals': intervals, 'top': [alternatives[i] for i in result['top']]}
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import weighting, ranking
+from mcdm_calculator.service import calculate_mcdm, calculate_many
+
+class TestBatchedAPI(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # 6 random matrices (5 Alts, 4 Criteria) with per-batch types and weights
+        self.matrices = rng.uniform(1, 100, size=(6, 5, 4))
+        self.c_types = rng.choice([1, -1], size=(6, 4))
+        self.weights = rng.dirichlet(np.ones(4), size=6)
+        
+    def test_batch_ranking_matches_single(self):
+        pairs = [
+            (ranking.batch_topsis_ranking, ranking.topsis_ranking),
+            (ranking.batch_vikor_ranking, ranking.vikor_ranking),
+            (ranking.batch_mairca_ranking, ranking.mairca_ranking),
+        ]
+        for batch_fn, single_fn in pairs:
+            batched = batch_fn(self.matrices, self.weights, self.c_types)
+            self.assertEqual(batched.shape, (6, 5))
+            for b in range(6):
+                expected = single_fn(self.matrices[b], self.weights[b], self.c_types[b])
+                np.testing.assert_allclose(batched[b], expected, rtol=1e-12, atol=1e-12)
+                
+    def test_batch_weighting_matches_single(self):
+        entropy = weighting.batch_entropy_weighting(self.matrices)
+        critic = weighting.batch_critic_weighting(self.matrices)
+        merec = weighting.batch_merec_weighting(self.matrices, self.c_types)
+        for b in range(6):
+            np.testing.assert_allclose(entropy[b], weighting.entropy_weighting(self.matrices[b]), rtol=1e-12)
+            np.testing.assert_allclose(critic[b], weighting.critic_weighting(self.matrices[b]), rtol=1e-9)
+            np.testing.assert_allclose(merec[b], weighting.merec_weighting(self.matrices[b], self.c_types[b]), rtol=1e-12)
+            
+    def test_calculate_many_matches_calculate_mcdm(self):
+        dfs = [pd.DataFrame(m, columns=['C1', 'C2', 'C3', 'C4']) for m in self.matrices]
+        # Mixed shapes are grouped internally
+        dfs.append(pd.DataFrame(self.matrices[0][:3], columns=['C1', 'C2', 'C3', 'C4']))
+        c_types = [-1, 1, 1, 1]
+        
+        outputs = calculate_many(dfs, 'merec', 'vikor', c_types)
+        self.assertEqual(len(outputs), len(dfs))
+        for df, out in zip(dfs, outputs):
+            single = calculate_mcdm(df, 'merec', 'vikor', c_types)
+            pd.testing.assert_frame_equal(out['results'], single['results'])
+            np.testing.assert_allclose(out['weights']['Weight'], single['weights']['Weight'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+import json
+import tempfile
+import sys
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator import batch
+from mcdm_calculator.calculator import main
+from mcdm_calculator.service import calculate_mcdm
+
+class TestBatchMode(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        rng = np.random.default_rng(3)
+        self.frames = {}
+        for i in range(3):
+            df = pd.DataFrame(rng.uniform(1, 10, (6, 3)), columns=['C1', 'C2', 'C3'],
+                              index=[f"A{j}" for j in range(6)])
+            path = os.path.join(self.dir, f"m{i}.csv")
+            df.to_csv(path)
+            self.frames[path] = df
+        self.bad = os.path.join(self.dir, "bad.csv")
+        with open(self.bad, 'w') as f:
+            f.write("Alt,C1\nA0,foo\n")
+        self.options = {'weights': 'entropy', 'ranking': 'topsis', 'types': '-1,1,1',
+                        'manual_weights': None, 'top_k': None, 'format': 'jsonl', 'output_dir': None}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_expand_inputs(self):
+        self.assertEqual(len(batch.expand_inputs([self.dir])), 4)
+        self.assertEqual(batch.expand_inputs([os.path.join(self.dir, 'm*.csv'), self.dir + '/m0.csv']),
+                         sorted(self.frames))
+
+    def test_failures_do_not_abort(self):
+        for workers in (1, 2):
+            reports = list(batch.run_batch(batch.expand_inputs([self.dir]), self.options, workers))
+            by_file = {r['file']: r for r in reports}
+            self.assertEqual(len(reports), 4)
+            self.assertFalse(by_file[self.bad]['ok'])
+            self.assertIn('error', by_file[self.bad])
+            for path, df in self.frames.items():
+                expected = calculate_mcdm(df, 'entropy', 'topsis', [-1, 1, 1], use_cache=False)['results']
+                pd.testing.assert_frame_equal(by_file[path]['results'], expected)
+                self.assertGreaterEqual(by_file[path]['seconds'], 0)
+
+    def test_cli_outputs(self):
+        out_dir = os.path.join(self.dir, 'out')
+        with redirect_stdout(StringIO()) as log:
+            main(['batch', os.path.join(self.dir, 'm*.csv'), '--types=-1,1,1',
+                  '--output-dir', out_dir, '--workers', '1', '--top-k', '2'])
+        self.assertIn('3 ok, 0 failed', log.getvalue())
+        with open(os.path.join(out_dir, 'm1_topsis_merec.jsonl')) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([r['Rank'] for r in rows], [1, 2])
+
+        combined = os.path.join(self.dir, 'all.csv')
+        with redirect_stdout(StringIO()), self.assertRaises(SystemExit):
+            main(['batch', self.dir, '--format', 'csv', '--combined', combined, '--workers', '1'])
+        merged = pd.read_csv(combined)
+        self.assertEqual(len(merged), 18)
+        self.assertEqual(set(merged['File']), set(self.frames))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.batching import MicroBatcher
+from mcdm_calculator.service import compute_weights, compute_scores
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.matrices = [rng.uniform(1, 10, (12, 5)) for _ in range(30)] + \
+                        [rng.uniform(1, 10, (7, 5)) for _ in range(10)]
+        self.types = [rng.choice([-1, 1], 5) for _ in self.matrices]
+
+    def expected(self, i, weights_method, ranking_method):
+        weights = compute_weights(self.matrices[i], weights_method, self.types[i])
+        return weights, compute_scores(self.matrices[i], weights, ranking_method, self.types[i])
+
+    def run_all(self, batcher, weights_method, ranking_method):
+        async def main():
+            out = await asyncio.gather(*(
+                batcher.score(matrix, weights_method, ranking_method, c_types)
+                for matrix, c_types in zip(self.matrices, self.types)))
+            await batcher.flush()
+            return out
+        return asyncio.run(main())
+
+    def test_matches_single_requests(self):
+        for weights_method in ('merec', 'entropy', 'critic', 'equal'):
+            for ranking_method in ('topsis', 'vikor', 'mairca'):
+                batcher = MicroBatcher(max_batch_size=16, max_wait=0.01)
+                results = self.run_all(batcher, weights_method, ranking_method)
+                for i, result in enumerate(results):
+                    weights, scores = self.expected(i, weights_method, ranking_method)
+                    np.testing.assert_allclose(result['weights'], weights, rtol=1e-10, atol=1e-12)
+                    np.testing.assert_allclose(result['scores'], scores, rtol=1e-10, atol=1e-12)
+                # 30 requests of one shape in batches of <= 16, 10 of another shape
+                self.assertEqual(batcher.requests, 40)
+                self.assertEqual(batcher.batches, 3)
+
+    def test_executor_and_manual_weights(self):
+        with ThreadPoolExecutor(2) as pool:
+            batcher = MicroBatcher(max_batch_size=64, max_wait=0.001, executor=pool)
+            async def main():
+                return await asyncio.gather(*(
+                    batcher.score(self.matrices[i], 'manual', 'vikor', self.types[i], manual_weights=[i + 1, 1, 1, 1, 1])
+                    for i in range(5)))
+            results = asyncio.run(main())
+        self.assertEqual(batcher.batches, 1)
+        for i, result in enumerate(results):
+            weights = np.array([i + 1, 1, 1, 1, 1]) / (i + 5)
+            np.testing.assert_allclose(result['weights'], weights)
+            np.testing.assert_allclose(result['scores'], compute_scores(self.matrices[i], weights, 'vikor', self.types[i]))
+
+    def test_invalid_requests_fail_alone(self):
+        batcher = MicroBatcher(max_wait=0.001)
+        async def main():
+            return await asyncio.gather(
+                batcher.score(self.matrices[0], 'entropy', 'topsis', self.types[0]),
+                batcher.score(self.matrices[1], 'entropy', 'foo', self.types[1]),
+                batcher.score(self.matrices[2], 'entropy', 'topsis', [1, -1]),
+                return_exceptions=True)
+        ok, bad_method, bad_types = asyncio.run(main())
+        self.assertEqual(ok['scores'].shape, (12,))
+        self.assertIsInstance(bad_method, ValueError)
+        self.assertIsInstance(bad_types, ValueError)
+        with self.assertRaises(ValueError):
+            MicroBatcher(max_batch_size=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+
+# Add project root and benchmarks directory to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'benchmarks'))
+
+import run_benchmarks
+
+class TestBenchmarkHarness(unittest.TestCase):
+    
+    def test_tiny_grid_covers_every_function(self):
+        results = run_benchmarks.run([10], [3], max_cells=1e6, log=lambda *_: None)
+        names = {r['function'] for r in results.values()}
+        self.assertIn('service.calculate_mcdm', names)
+        self.assertEqual(len(names), len(results))
+        # Functions added to the core modules later must get a case too
+        public = run_benchmarks.public_functions()
+        self.assertIn('ranking.score_weight_samples', public)
+        self.assertIn('streaming.CriticAccumulator', public)
+        self.assertEqual(public - {name.split('[')[0] for name in names}, set())
+        for r in results.values():
+            self.assertGreater(r['time_s'], 0)
+            self.assertGreater(r['peak_bytes'], 0)
+            
+    def test_compare_flags_regressions(self):
+        baseline = {
+            'a|10|3': {'time_s': 1.0, 'peak_bytes': 1000},
+            'b|10|3': {'time_s': 1.0, 'peak_bytes': 1000},
+            'c|10|3': {'time_s': 1.0, 'peak_bytes': 1000},
+        }
+        current = {
+            'a|10|3': {'time_s': 1.1, 'peak_bytes': 1000}, # within threshold
+            'b|10|3': {'time_s': 2.0, 'peak_bytes': 1000}, # slower
+            'c|10|3': {'time_s': 1.0, 'peak_bytes': 2000}, # more memory
+            'd|10|3': {'time_s': 9.0, 'peak_bytes': 9000}, # not in baseline
+        }
+        flagged = [r[0] for r in run_benchmarks.compare(current, baseline, 0.25, 0.10)]
+        self.assertEqual(flagged, ['b|10|3', 'c|10|3'])
+
+if __name__ == '__main__':
+    unittest.main()
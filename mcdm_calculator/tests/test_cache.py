@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator import service
+from mcdm_calculator.cache import LRUCache, fingerprint
+
+class TestResultCache(unittest.TestCase):
+    
+    def setUp(self):
+        service.clear_cache()
+        self.df = pd.DataFrame([
+            [250, 16, 12, 5],
+            [200, 16, 8, 3],
+            [300, 32, 16, 4],
+            [275, 32, 8, 4],
+        ], columns=['Price', 'Storage', 'Camera', 'Looks'])
+        self.c_types = [-1, 1, 1, 1]
+        
+    def test_fingerprint_is_content_based(self):
+        a = np.arange(12.0).reshape(3, 4)
+        self.assertEqual(fingerprint(a, 'merec'), fingerprint(a.copy(), 'merec'))
+        self.assertNotEqual(fingerprint(a, 'merec'), fingerprint(a.T, 'merec'))
+        self.assertNotEqual(fingerprint(a, 'merec'), fingerprint(a, 'entropy'))
+        
+    def test_stages_are_memoized_separately(self):
+        first = service.calculate_mcdm(self.df, 'merec', 'topsis', self.c_types)
+        info = service.cache_info()
+        self.assertEqual((info['weights']['misses'], info['scores']['misses']), (1, 1))
+        
+        # Same weights stage, different ranking stage
+        service.calculate_mcdm(self.df.copy(), 'merec', 'vikor', self.c_types)
+        info = service.cache_info()
+        self.assertEqual(info['weights']['hits'], 1)
+        self.assertEqual(info['scores']['misses'], 2)
+        
+        again = service.calculate_mcdm(self.df, 'merec', 'topsis', self.c_types)
+        self.assertEqual(service.cache_info()['scores']['hits'], 1)
+        pd.testing.assert_frame_equal(first['results'], again['results'])
+        
+        uncached = service.calculate_mcdm(self.df, 'merec', 'topsis', self.c_types, use_cache=False)
+        pd.testing.assert_frame_equal(first['results'], uncached['results'])
+        
+    def test_lru_eviction_by_entries_and_bytes(self):
+        cache = LRUCache(max_entries=2, max_bytes=10 * 8)
+        cache.put('a', np.zeros(2))
+        cache.put('b', np.zeros(2))
+        cache.get('a') # 'b' is now least recently used
+        cache.put('c', np.zeros(2))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        
+        cache.put('big', np.zeros(9)) # exceeds the byte budget together with 'a'/'c'
+        info = cache.info()
+        self.assertLessEqual(info['bytes'], 10 * 8)
+        self.assertEqual(info['evictions'], 3)
+        cache.put('huge', np.zeros(11)) # larger than the whole budget: not stored
+        self.assertIsNone(cache.get('huge'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import numpy as np
+import pandas as pd
+import contextlib
+import io
+import tempfile
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import kernels, ranking, streaming
+from mcdm_calculator.core.trace import Trace
+from mcdm_calculator.service import calculate_mcdm
+from mcdm_calculator.calculator import main
+
+def direct_distances(V, point, metric, p=None):
+    diff = np.abs(V - point)
+    if metric == 'euclidean':
+        return np.sqrt(np.sum(diff**2, axis=1))
+    if metric == 'manhattan':
+        return np.sum(diff, axis=1)
+    if metric == 'chebyshev':
+        return np.max(diff, axis=1)
+    return np.sum(diff**p, axis=1) ** (1 / p)
+
+def direct_topsis(matrix, weights, c_types, metric, p=None):
+    V = matrix / np.linalg.norm(matrix, axis=0) * weights
+    benefit = np.array(c_types) == 1
+    ideal = np.where(benefit, V.max(axis=0), V.min(axis=0))
+    anti_ideal = np.where(benefit, V.min(axis=0), V.max(axis=0))
+    d_plus = direct_distances(V, ideal, metric, p)
+    d_minus = direct_distances(V, anti_ideal, metric, p)
+    return d_minus / (d_plus + d_minus + 1e-9)
+
+METRICS = [('euclidean', None), ('manhattan', None), ('chebyshev', None), ('minkowski', 3), ('minkowski', 1.5)]
+
+class TestDistances(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.matrix = rng.uniform(1, 10, (500, 6))
+        self.c_types = [1, -1, 1, 1, -1, 1]
+        self.weights = rng.dirichlet(np.ones(6))
+        self.scale = rng.uniform(0.01, 0.2, 6)
+        self.points = rng.uniform(0, 2, (3, 6))
+
+    def test_scaled_distances_match_direct(self):
+        V = self.matrix * self.scale
+        for metric, p in METRICS:
+            dists = kernels.scaled_distances(self.matrix, self.scale, self.points, metric, p)
+            for point, dist in zip(self.points, dists):
+                np.testing.assert_allclose(dist, direct_distances(V, point, metric, p), rtol=1e-9, atol=1e-12,
+                                           err_msg=metric)
+        # A point on a row gives an exact zero, not the square root of a rounding error
+        dist = kernels.scaled_distances(self.matrix, self.scale, [V[7]])[0]
+        self.assertEqual(dist[7], 0)
+
+    def test_large_column_offsets(self):
+        # ||x||^2 - 2 x.y + ||y||^2 would cancel here; direct differences stay exact
+        rng = np.random.default_rng(9)
+        for offset in (1e5, 1e7):
+            matrix = offset + rng.uniform(0, 1, (200, 5))
+            c_types = [1, -1, 1, -1, 1]
+            expected = direct_topsis(matrix, self.weights[:5], c_types, 'euclidean')
+            scores = ranking.topsis_ranking(matrix, self.weights[:5], c_types)
+            np.testing.assert_allclose(scores, expected, rtol=1e-12, atol=1e-14)
+            np.testing.assert_array_equal(np.argsort(-scores, kind='stable'), np.argsort(-expected, kind='stable'))
+
+    def test_blocks_and_float32(self):
+        V = self.matrix * self.scale
+        block_bytes = kernels.DISTANCE_BLOCK_BYTES
+        kernels.DISTANCE_BLOCK_BYTES = 7 * 6 * 8 # blocks of 7 rows, the last one partial
+        try:
+            for metric, p in METRICS:
+                dists = kernels.scaled_distances(self.matrix, self.scale, self.points, metric, p)
+                np.testing.assert_allclose(dists[1], direct_distances(V, self.points[1], metric, p), rtol=1e-9)
+                single = kernels.scaled_distances(self.matrix.astype(np.float32), self.scale, self.points, metric, p)
+                self.assertEqual(single[0].dtype, np.float32)
+                np.testing.assert_allclose(single[0], dists[0], rtol=1e-5)
+        finally:
+            kernels.DISTANCE_BLOCK_BYTES = block_bytes
+
+    def test_metric_validation(self):
+        self.assertEqual(kernels.distance_metric('minkowski', 1), ('manhattan', None))
+        self.assertEqual(kernels.distance_metric('minkowski', 2), ('euclidean', None))
+        self.assertEqual(kernels.distance_metric('minkowski', np.inf), ('chebyshev', None))
+        for metric, p in (('cosine', None), ('minkowski', None), ('minkowski', 0.5)):
+            with self.assertRaises(ValueError):
+                ranking.topsis_ranking(self.matrix, self.weights, self.c_types, metric=metric, p=p)
+
+    def test_topsis_metrics(self):
+        for metric, p in METRICS:
+            trace = Trace()
+            scores = ranking.topsis_ranking(self.matrix, self.weights, self.c_types, metric=metric, p=p, trace=trace)
+            np.testing.assert_allclose(scores, direct_topsis(self.matrix, self.weights, self.c_types, metric, p),
+                                       rtol=1e-9, err_msg=metric)
+            # The normalized and weighted matrices are only built when read
+            V = self.matrix / np.linalg.norm(self.matrix, axis=0) * self.weights
+            np.testing.assert_allclose(trace.get('topsis', 'weighted'), V)
+            stats = streaming.collect_stats([(None, self.matrix[:200]), (None, self.matrix[200:])])
+            chunks = streaming.stream_scores(lambda: iter([(None, self.matrix[:300]), (None, self.matrix[300:])]),
+                                             self.weights, self.c_types, 'topsis', stats=stats, metric=metric, p=p)
+            np.testing.assert_allclose(np.concatenate([s for _, s in chunks]), scores, rtol=1e-9)
+
+    def test_service_and_cli(self):
+        df = pd.DataFrame(self.matrix[:30], index=[f"A{i}" for i in range(30)], columns=list('ABCDEF'))
+        options = {'metric': 'minkowski', 'p': 3.0}
+        out = calculate_mcdm(df, 'entropy', 'topsis', self.c_types, ranking_options=options)
+        euclidean = calculate_mcdm(df, 'entropy', 'topsis', self.c_types)
+        self.assertFalse(np.allclose(out['results']['Closeness Score'], euclidean['results']['Closeness Score']))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            df.to_csv(path)
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    main([path, '--weights', 'entropy', '--ranking', 'topsis', '--types', '1,-1,1,1,-1,1',
+                          '--distance', 'minkowski', '--minkowski-p', '3'])
+                saved = pd.read_csv('result_topsis_entropy.csv')
+            finally:
+                os.chdir(cwd)
+        np.testing.assert_allclose(saved['Score (Closeness)'], out['results']['Closeness Score'])
+
+if __name__ == '__main__':
+    unittest.main()
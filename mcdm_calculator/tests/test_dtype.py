@@ -0,0 +1,92 @@
+import unittest
+import tracemalloc
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import normalization, weighting, ranking
+from mcdm_calculator.core.kernels import as_float
+from mcdm_calculator.service import calculate_mcdm
+
+# Peak number of full (m x n) matrices each stage holds at once
+WEIGHTS_BUDGET = {'equal': 0, 'entropy': 2, 'critic': 2, 'merec': 4}
+RANKING_BUDGET = {'topsis': 0, 'vikor': 2, 'mairca': 3}
+
+def peak_bytes(fn):
+    fn() # warm-up, so lazy imports and caches are not counted
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+class TestComputeDtype(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.matrix = rng.uniform(1, 100, (4000, 100))
+        self.c_types = [-1, 1] * 50
+        self.weights = np.full(100, 0.01)
+
+    def test_as_float_does_not_copy(self):
+        single = self.matrix.astype(np.float32)
+        self.assertIs(as_float(self.matrix), self.matrix)
+        self.assertIs(as_float(single), single)
+        self.assertEqual(as_float(single, np.float64).dtype, np.float64)
+        self.assertEqual(as_float([[1, 2], [3, 4]]).dtype, np.float64)
+
+    def test_read_only_input_and_dtype_preserved(self):
+        for dtype in (np.float32, np.float64):
+            matrix = self.matrix[:200].astype(dtype)
+            matrix.setflags(write=False) # Any in-place write into the input would raise
+            outputs = [
+                normalization.vector_normalization(matrix),
+                normalization.min_max_normalization(matrix, self.c_types),
+                normalization.linear_normalization(matrix, self.c_types),
+                normalization.sum_normalization(matrix),
+                weighting.entropy_weighting(matrix),
+                weighting.critic_weighting(matrix),
+                weighting.merec_weighting(matrix, self.c_types),
+                ranking.topsis_ranking(matrix, self.weights, self.c_types),
+                ranking.vikor_ranking(matrix, self.weights, self.c_types),
+                ranking.mairca_ranking(matrix, self.weights, self.c_types),
+            ]
+            for out in outputs:
+                self.assertEqual(out.dtype, dtype)
+
+    def test_full_matrix_allocations_per_run(self):
+        nbytes = self.matrix.nbytes
+        df64 = pd.DataFrame(self.matrix)
+        df32 = pd.DataFrame(self.matrix.astype(np.float32))
+        for weights_method, w_budget in WEIGHTS_BUDGET.items():
+            for ranking_method, r_budget in RANKING_BUDGET.items():
+                def run(df):
+                    return lambda: calculate_mcdm(df, weights_method, ranking_method, self.c_types,
+                                                  use_cache=False)
+                peak64 = peak_bytes(run(df64))
+                # The float64 frame is used in place: no conversion copy on top of the stage budgets
+                self.assertLessEqual(peak64, (max(w_budget, r_budget) + 0.25) * nbytes,
+                                     f"{weights_method}/{ranking_method}")
+                # float32 halves every full-matrix temporary (when a stage holds any)
+                if max(w_budget, r_budget):
+                    self.assertLessEqual(peak_bytes(run(df32)), 0.55 * peak64,
+                                         f"{weights_method}/{ranking_method}")
+                else:
+                    self.assertLessEqual(peak_bytes(run(df32)), 0.25 * nbytes,
+                                         f"{weights_method}/{ranking_method}")
+
+    def test_calculate_mcdm_dtype_option(self):
+        df = pd.DataFrame(self.matrix[:50].round().astype(int))
+        out32 = calculate_mcdm(df, 'critic', 'topsis', self.c_types, dtype=np.float32, use_cache=False)
+        out64 = calculate_mcdm(df, 'critic', 'topsis', self.c_types, use_cache=False)
+        self.assertEqual(out32['weights']['Weight'].dtype, np.float32)
+        np.testing.assert_allclose(out32['results']['Closeness Score'], out64['results']['Closeness Score'],
+                                   atol=1e-5)
+
+if __name__ == '__main__':
+    unittest.main()
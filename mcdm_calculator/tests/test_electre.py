@@ -0,0 +1,135 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import ranking
+from mcdm_calculator.core.relation import BitRelation
+from mcdm_calculator.core.trace import Trace
+from mcdm_calculator.service import calculate_mcdm
+
+def dense_electre1(matrix, weights, c_types):
+    """ELECTRE I relation from the full (m, m, n) difference tensor, mean thresholds."""
+    Y = np.where(np.array(c_types) == 1, matrix, -matrix)
+    diff = Y[None, :, :] - Y[:, None, :] # [a, b]: how much b is better than a
+    C = ((diff <= 0) * weights).sum(axis=2) / weights.sum()
+    D = np.max(np.maximum(diff, 0) / np.ptp(Y, axis=0), axis=2)
+    off = ~np.eye(len(matrix), dtype=bool)
+    return (C >= C[off].mean()) & (D <= D[off].mean()) & off
+
+def dense_electre3(matrix, weights, c_types, q, p, v):
+    """ELECTRE III relation at the first distillation cut from the full credibility matrix."""
+    Y = np.where(np.array(c_types) == 1, matrix, -matrix)
+    diff = Y[None, :, :] - Y[:, None, :]
+    C = (np.clip((p - diff) / (p - q), 0, 1) * weights).sum(axis=2) / weights.sum()
+    d = np.clip((diff - p) / (v - p), 0, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factors = np.where(d > C[:, :, None], (1 - d) / (1 - C[:, :, None]), 1)
+    sigma = C * factors.prod(axis=2)
+    off = ~np.eye(len(matrix), dtype=bool)
+    top = sigma[off].max()
+    return (sigma >= top - (0.3 - 0.15 * top)) & off
+
+def dense_kernel(dense):
+    """Kernel of an acyclic relation by repeatedly taking the unoutranked alternatives."""
+    alive = np.ones(len(dense), dtype=bool)
+    kernel = np.zeros(len(dense), dtype=bool)
+    while alive.any():
+        sources = alive & ~dense[alive].any(axis=0)
+        kernel |= sources
+        alive &= ~sources & ~dense[sources].any(axis=0)
+    return kernel
+
+class TestElectre(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(12)
+        # 150 alternatives: three row tiles of 64, the last one partial
+        self.matrix = rng.integers(1, 20, (150, 4)).astype(float)
+        self.c_types = [1, -1, 1, -1]
+        self.weights = rng.dirichlet(np.ones(4))
+
+    def test_electre1_matches_dense_reference(self):
+        expected = dense_electre1(self.matrix, self.weights, self.c_types)
+        relation, _, _ = ranking.electre1_relation(self.matrix, self.weights, self.c_types, tile_bytes=1)
+        np.testing.assert_array_equal(relation.to_dense(), expected)
+        np.testing.assert_array_equal(relation.out_degree, expected.sum(axis=1))
+        np.testing.assert_array_equal(relation.in_degree, expected.sum(axis=0))
+        # One bit per pair, padded to whole words per row: 8x smaller than a boolean matrix
+        self.assertEqual(relation.nbytes, 150 * 3 * 8)
+        scores = ranking.electre1_ranking(self.matrix, self.weights, self.c_types)
+        np.testing.assert_array_equal(scores, expected.sum(axis=1) - expected.sum(axis=0))
+
+    def test_electre3_matches_dense_reference(self):
+        q = np.array([1, 0.5, 0, 2])
+        p = np.array([3, 2, 1, 4])
+        v = np.array([10, np.inf, 6, 12])
+        expected = dense_electre3(self.matrix, self.weights, self.c_types, q, p, v)
+        relation, _ = ranking.electre3_relation(self.matrix, self.weights, self.c_types, q=q, p=p, v=v,
+                                                tile_bytes=1)
+        np.testing.assert_array_equal(relation.to_dense(), expected)
+        with self.assertRaises(ValueError):
+            ranking.electre3_ranking(self.matrix, self.weights, self.c_types, q=2, p=1)
+        with self.assertRaises(ValueError):
+            ranking.electre3_ranking(self.matrix, self.weights, self.c_types, p=1, v=1)
+
+    def test_kernel(self):
+        # Acyclic: a strict order by a random score on a random subset of pairs
+        rng = np.random.default_rng(4)
+        order = rng.permutation(130)
+        dense = (order[:, None] < order[None, :]) & (rng.random((130, 130)) < 0.05)
+        kernel, cycles = BitRelation.from_dense(dense).kernel()
+        np.testing.assert_array_equal(kernel, dense_kernel(dense))
+        self.assertEqual(cycles, [])
+        # Independent and absorbing
+        self.assertFalse(dense[np.ix_(kernel, kernel)].any())
+        self.assertTrue(dense[kernel][:, ~kernel].any(axis=0).all())
+
+        # A 3-cycle pointing into a 2-cycle: the first enters the kernel as a whole
+        dense = np.zeros((6, 6), dtype=bool)
+        for a, b in ((0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 5), (5, 4)):
+            dense[a, b] = True
+        kernel, cycles = BitRelation.from_dense(dense).kernel()
+        np.testing.assert_array_equal(kernel, [True, True, True, False, True, True])
+        self.assertEqual([list(c) for c in cycles], [[0, 1, 2], [4, 5]])
+
+    def test_set_rows_overwrites_and_any_split(self):
+        rng = np.random.default_rng(6)
+        dense = rng.random((50, 50)) < 0.2
+        relation = BitRelation(50)
+        # Unaligned blocks, then one block written again with the final content
+        for start, stop in ((0, 13), (13, 20), (20, 50)):
+            relation.set_rows(start, ~dense[start:stop])
+        relation.set_rows(13, dense[13:20])
+        relation.set_rows(0, dense[:13])
+        relation.set_rows(20, dense[20:])
+        np.testing.assert_array_equal(relation.to_dense(), dense)
+        np.testing.assert_array_equal(relation.out_degree, dense.sum(axis=1))
+        np.testing.assert_array_equal(relation.in_degree, dense.sum(axis=0))
+        kernel, _ = relation.kernel()
+        np.testing.assert_array_equal(kernel, BitRelation.from_dense(dense).kernel()[0])
+        for start, block in ((45, dense[:10]), (0, dense[:, :40]), (-1, dense[:5])):
+            with self.assertRaises(ValueError):
+                relation.set_rows(start, block)
+
+    def test_service_kernel(self):
+        df = pd.DataFrame(self.matrix[:40], index=[f"A{i}" for i in range(40)], columns=list('ABCD'))
+        trace = Trace()
+        ranking.electre1_ranking(df.values, self.weights, self.c_types, trace=trace)
+        kernel, _ = trace.get('electre1', 'kernel')
+        out = calculate_mcdm(df, 'manual', 'electre1', self.c_types, list(self.weights))
+        results = out['results']
+        self.assertEqual(list(results.columns), ['Alternative', 'Net Outranking', 'Rank', 'Kernel'])
+        self.assertEqual(out['intermediate']['kernel'], [f"A{i}" for i in np.flatnonzero(kernel)])
+        self.assertEqual(sorted(results.loc[results['Kernel'], 'Alternative']), sorted(out['intermediate']['kernel']))
+        top = calculate_mcdm(df, 'manual', 'electre3', self.c_types, list(self.weights), top_k=5,
+                             ranking_options={'q': 1, 'p': 3, 'v': 12})
+        self.assertEqual(len(top['results']), 5)
+        self.assertIn('Kernel', top['results'].columns)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import normalization, ranking
+from mcdm_calculator.core.incremental import DecisionModel
+
+class TestDecisionModel(unittest.TestCase):
+    
+    def setUp(self):
+        self.rng = np.random.default_rng(9)
+        # Integer values so extremes are frequently shared between rows
+        self.matrix = self.rng.integers(1, 20, size=(30, 5)).astype(float)
+        self.c_types = [1, -1, 1, 1, -1]
+        self.weights = np.array([0.3, 0.2, 0.2, 0.1, 0.2])
+        
+    def assert_matches_full(self, model):
+        matrix = model.matrix
+        np.testing.assert_array_equal(model.stats.min, matrix.min(axis=0))
+        np.testing.assert_array_equal(model.stats.max, matrix.max(axis=0))
+        np.testing.assert_allclose(model.stats.sum, matrix.sum(axis=0))
+        np.testing.assert_allclose(model.normalize('vector'), normalization.vector_normalization(matrix))
+        np.testing.assert_allclose(model.normalize('min_max'), normalization.min_max_normalization(matrix, self.c_types))
+        np.testing.assert_allclose(model.normalize('linear'), normalization.linear_normalization(matrix, self.c_types))
+        full = {
+            'topsis': ranking.topsis_ranking,
+            'vikor': ranking.vikor_ranking,
+            'mairca': ranking.mairca_ranking,
+        }
+        for method, fn in full.items():
+            np.testing.assert_allclose(model.scores(self.weights, method),
+                                       fn(matrix, self.weights, self.c_types), rtol=1e-9, atol=1e-12)
+            
+    def test_random_edits_match_full_recompute(self):
+        model = DecisionModel(self.matrix, self.c_types)
+        self.assert_matches_full(model)
+        next_id = len(self.matrix)
+        for step in range(300):
+            labels = model.alternatives
+            op = self.rng.integers(3)
+            if op == 0 or len(labels) < 5:
+                next_id += 1
+                model.add(f"A{next_id}", self.rng.integers(1, 20, size=5))
+            elif op == 1:
+                model.remove(labels[self.rng.integers(len(labels))])
+            else:
+                model.update(labels[self.rng.integers(len(labels))], self.rng.integers(1, 20, size=5))
+            if step % 25 == 0:
+                self.assert_matches_full(model)
+        self.assert_matches_full(model)
+        self.assertEqual(len(model), len(model.alternatives))
+        
+    def test_duplicate_and_missing_labels(self):
+        model = DecisionModel(self.matrix[:3], self.c_types, alternatives=['a', 'b', 'c'])
+        with self.assertRaises(ValueError):
+            model.add('a', self.matrix[0])
+        with self.assertRaises(KeyError):
+            model.remove('z')
+        # A wrong-length row is rejected before the old one is taken out
+        stats = model.stats.sum.copy()
+        with self.assertRaises(ValueError):
+            model.update('a', [1.0])
+        np.testing.assert_array_equal(model.stats.sum, stats)
+        np.testing.assert_array_equal(model.matrix, self.matrix[:3])
+        np.testing.assert_array_equal(model.remove('b'), self.matrix[1])
+        self.assertEqual(model.alternatives, ['a', 'c'])
+
+if __name__ == '__main__':
+    unittest.main()
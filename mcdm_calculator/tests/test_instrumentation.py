@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import instrumentation, ranking
+from mcdm_calculator.core.instrumentation import Profiler, stage
+from mcdm_calculator.service import calculate_mcdm
+
+class TestInstrumentation(unittest.TestCase):
+    
+    def setUp(self):
+        self.df = pd.DataFrame([
+            [250, 16, 12, 5],
+            [200, 16, 8, 3],
+            [300, 32, 16, 4],
+        ], columns=['Price', 'Storage', 'Camera', 'Looks'])
+        self.c_types = [-1, 1, 1, 1]
+        
+    def test_inactive_by_default(self):
+        seen = []
+        instrumentation.add_listener(seen.append)
+        try:
+            ranking.topsis_ranking(self.df.values, np.ones(4) / 4, self.c_types)
+            with stage('ignored'):
+                pass
+        finally:
+            instrumentation.remove_listener(seen.append)
+        self.assertEqual(seen, [])
+        self.assertFalse(instrumentation.is_active())
+        
+    def test_nested_stages_and_peak_memory(self):
+        with Profiler(memory=True) as prof:
+            with stage('outer'):
+                with stage('inner'):
+                    block = np.ones(1_000_000) # ~8 MB inside the inner stage
+                    del block
+                with stage('small'):
+                    pass
+        records = {r.name: r for r in prof.records}
+        self.assertEqual(records['inner'].parent, 'outer')
+        self.assertEqual(records['inner'].depth, 1)
+        self.assertGreaterEqual(records['inner'].peak_bytes, 8_000_000)
+        # The outer stage keeps the inner peak even though tracemalloc was reset
+        self.assertGreaterEqual(records['outer'].peak_bytes, 8_000_000)
+        self.assertLess(records['small'].peak_bytes, 1_000_000)
+        self.assertIn('inner', prof.format_table())
+        
+    def test_calculate_mcdm_profile(self):
+        out = calculate_mcdm(self.df, 'merec', 'topsis', self.c_types, use_cache=False, profile=True)
+        names = [r['name'] for r in out['intermediate']['profile']]
+        for expected in ('calculate_mcdm', 'weights', 'ranking', 'format',
+                         'weighting.merec_weighting', 'ranking.topsis_ranking'):
+            self.assertIn(expected, names)
+        for r in out['intermediate']['profile']:
+            self.assertGreaterEqual(r['wall_s'], 0)
+            self.assertIsNotNone(r['peak_bytes'])
+        self.assertFalse(instrumentation.is_active())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import kernels, normalization
+
+class TestKernels(unittest.TestCase):
+    
+    def setUp(self):
+        self.matrix = np.array([
+            [250, 16, 12, 5],
+            [200, 16, 8, 3],
+            [300, 32, 16, 4],
+            [275, 32, 8, 4],
+            [225, 16, 16, 2]
+        ], dtype=float)
+        self.c_types = [-1, 1, 1, 1]
+        
+    def test_benefit_mask_and_signs(self):
+        mask = kernels.benefit_mask(self.c_types)
+        np.testing.assert_array_equal(mask, [False, True, True, True])
+        # A precomputed mask passes straight through
+        self.assertIs(kernels.benefit_mask(mask), mask)
+        
+    def test_best_worst(self):
+        best, worst = kernels.best_worst(self.matrix, self.c_types)
+        np.testing.assert_array_equal(best, [200, 32, 16, 5])
+        np.testing.assert_array_equal(worst, [300, 16, 8, 2])
+        
+    def test_min_max_matches_per_column_formula(self):
+        norm = normalization.min_max_normalization(self.matrix, self.c_types)
+        col_min, col_max = self.matrix.min(axis=0), self.matrix.max(axis=0)
+        expected = (self.matrix - col_min) / (col_max - col_min)
+        expected[:, 0] = (col_max[0] - self.matrix[:, 0]) / (col_max[0] - col_min[0])
+        np.testing.assert_allclose(norm, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import numpy as np
+import pandas as pd
+import importlib.util
+import tempfile
+import sys
+import os
+from io import BytesIO
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator import loaders
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+HAS_OPENPYXL = importlib.util.find_spec('openpyxl') is not None
+
+class TestLoaders(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame([
+            [250.0, 16, 12, 5],
+            [200.0, 16, 8, 3],
+            [300.0, 32, 16, 4],
+        ], columns=['Price', 'Storage', 'Camera', 'Looks'], index=['A', 'B', 'C'])
+        self.df.index.name = 'Alternative'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def assert_matches(self, data, types=None, labels=True):
+        np.testing.assert_array_equal(np.asarray(data.matrix), self.df.values)
+        if labels:
+            self.assertEqual(data.alternatives, ['A', 'B', 'C'])
+            self.assertEqual(data.criteria, list(self.df.columns))
+        self.assertEqual(data.criteria_types, types)
+
+    def test_csv_types_row_and_sidecar(self):
+        self.df.to_csv(self.path('plain.csv'))
+        self.assert_matches(loaders.load(self.path('plain.csv')))
+
+        with open(self.path('typed.csv'), 'w') as f:
+            f.write("Alternative,Price,Storage,Camera,Looks\ntypes,cost,benefit,benefit,max\n")
+            f.write("A,250,16,12,5\nB,200,16,8,3\nC,300,32,16,4\n")
+        self.assert_matches(loaders.load(self.path('typed.csv')), [-1, 1, 1, 1])
+
+        with open(self.path('plain.types'), 'w') as f:
+            f.write("-1, 1, -1, 1\n")
+        self.assert_matches(loaders.load(self.path('plain.csv')), [-1, 1, -1, 1])
+
+        with open(self.path('plain.types'), 'w') as f:
+            f.write("-1, 1\n")
+        with self.assertRaises(ValueError):
+            loaders.load(self.path('plain.csv'))
+
+    def test_npy_is_memory_mapped(self):
+        np.save(self.path('m.npy'), self.df.values)
+        data = loaders.load(self.path('m.npy'))
+        self.assertIsInstance(data.matrix, np.memmap)
+        self.assert_matches(data, labels=False)
+        self.assertEqual(data.alternatives, ['A1', 'A2', 'A3'])
+
+    def test_arrays_must_be_2d(self):
+        np.save(self.path('v.npy'), self.df.values[:, 0])
+        np.savez(self.path('v.npz'), matrix=self.df.values[None])
+        for name in ('v.npy', 'v.npz'):
+            with self.assertRaisesRegex(ValueError, name):
+                loaders.load(self.path(name))
+        buffer = BytesIO()
+        np.save(buffer, self.df.values[:, 0])
+        buffer.seek(0)
+        with self.assertRaisesRegex(ValueError, '2-D'):
+            loaders.load(buffer, name='upload.npy')
+        with self.assertRaises(ValueError):
+            loaders.DecisionData(np.zeros(3))
+
+    def test_npz(self):
+        np.savez(self.path('m.npz'), matrix=self.df.values, alternatives=np.array(['A', 'B', 'C']),
+                 criteria=np.array(list(self.df.columns)), types=np.array([-1, 1, 1, 1]))
+        data = loaders.load(self.path('m.npz'))
+        self.assertIsInstance(data.matrix, np.memmap)
+        self.assert_matches(data, [-1, 1, 1, 1])
+
+        # Compressed members cannot be mapped and are read instead
+        np.savez_compressed(self.path('c.npz'), self.df.values)
+        data = loaders.load(self.path('c.npz'))
+        self.assertNotIsInstance(data.matrix, np.memmap)
+        self.assert_matches(data, labels=False)
+
+    def test_upload_file_objects(self):
+        buffer = BytesIO()
+        np.save(buffer, self.df.values)
+        buffer.seek(0)
+        self.assert_matches(loaders.load(buffer, name='upload.npy'), labels=False)
+
+        upload = BytesIO(self.df.to_csv().encode())
+        upload.name = 'upload.csv'
+        self.assert_matches(loaders.load(upload))
+
+        with self.assertRaises(ValueError):
+            loaders.load(self.path('data.txt'))
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_parquet_and_feather(self):
+        self.df.to_parquet(self.path('m.parquet'))
+        self.assert_matches(loaders.load(self.path('m.parquet')))
+        # Feather has no index; the labels are the first column
+        self.df.reset_index().to_feather(self.path('m.feather'))
+        self.assert_matches(loaders.load(self.path('m.feather')))
+
+    @unittest.skipUnless(HAS_OPENPYXL, "openpyxl not installed")
+    def test_excel_read_only(self):
+        from openpyxl import Workbook
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['Alternative', 'Price', 'Storage', 'Camera', 'Looks'])
+        sheet.append(['Type', 'cost', 'benefit', 'benefit', 'benefit'])
+        for label, row in zip(self.df.index, self.df.values.tolist()):
+            sheet.append([label] + row)
+        workbook.save(self.path('m.xlsx'))
+        self.assert_matches(loaders.load(self.path('m.xlsx')), [-1, 1, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator import service
+from mcdm_calculator.core import normalization, ranking
+from mcdm_calculator.planner import StagePlan
+
+class TestAnalyzeAll(unittest.TestCase):
+    
+    def setUp(self):
+        self.df = pd.DataFrame([
+            [250, 16, 12, 5],
+            [200, 16, 8, 3],
+            [300, 32, 16, 4],
+            [275, 32, 8, 4],
+            [225, 16, 16, 2]
+        ], columns=['Price', 'Storage', 'Camera', 'Looks'])
+        self.c_types = [-1, 1, 1, 1]
+        self.manual = [0.4, 0.2, 0.2, 0.2]
+        
+    def test_all_combinations_match_calculate_mcdm(self):
+        out = service.analyze_all(self.df, self.c_types, manual_weights=self.manual, workers=4)
+        # 5 weightings x 3 rankings: the pairwise methods are not run by default
+        self.assertEqual(len(out['results']), 5 * 3 * len(self.df))
+        self.assertEqual(sorted(out['results']['Ranking'].unique()), ['mairca', 'topsis', 'vikor'])
+        pairwise = service.analyze_all(self.df, self.c_types, manual_weights=self.manual, workers=4,
+                                       ranking_methods=list(service.RANKING_OUTPUT))
+        self.assertEqual(len(pairwise['results']), 5 * len(service.RANKING_OUTPUT) * len(self.df))
+        self.assertEqual(list(out['weights'].columns), list(service.WEIGHT_METHODS))
+        
+        for (w, r), group in pairwise['results'].groupby(['Weighting', 'Ranking']):
+            single = service.calculate_mcdm(self.df, w, r, self.c_types, self.manual, use_cache=False)
+            expected = single['results'].sort_index()
+            np.testing.assert_allclose(group['Score'].values, expected.iloc[:, 1].values, rtol=1e-9)
+            np.testing.assert_array_equal(group['Rank'].values, expected['Rank'].values)
+            np.testing.assert_allclose(out['weights'][w].values, single['weights']['Weight'].values)
+            
+    def test_shared_normalizations_computed_once(self):
+        with mock.patch.object(normalization, 'vector_normalization', wraps=normalization.vector_normalization) as vec, \
+             mock.patch.object(normalization, 'linear_normalization', wraps=normalization.linear_normalization) as lin, \
+             mock.patch.object(ranking, 'vector_normalization', wraps=ranking.vector_normalization) as rvec, \
+             mock.patch.object(ranking, 'linear_normalization', wraps=ranking.linear_normalization) as rlin:
+            service.analyze_all(self.df, self.c_types, workers=1)
+        self.assertEqual(vec.call_count + rvec.call_count, 1)
+        self.assertEqual(lin.call_count + rlin.call_count, 1)
+        
+    def test_stage_plan_runs_each_stage_once(self):
+        calls = []
+        plan = StagePlan()
+        plan.add('a', lambda: calls.append('a') or 1)
+        plan.add('b', lambda a: calls.append('b') or a + 1, ['a'])
+        plan.add('c', lambda a: calls.append('c') or a + 2, ['a'])
+        plan.add('d', lambda b, c: b * c, ['b', 'c'])
+        self.assertEqual(plan.run(workers=3)['d'], 6)
+        self.assertEqual(sorted(calls), ['a', 'b', 'c'])
+        with self.assertRaises(ValueError):
+            plan.add('e', lambda x: x, ['missing'])
+
+if __name__ == '__main__':
+    unittest.main()
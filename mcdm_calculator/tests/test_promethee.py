@@ -0,0 +1,127 @@
+import unittest
+import numpy as np
+import pandas as pd
+import contextlib
+import io
+import tempfile
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import ranking
+from mcdm_calculator.core.trace import Trace
+from mcdm_calculator.service import calculate_mcdm, calculate_many
+from mcdm_calculator.calculator import main
+
+def dense_promethee(matrix, weights, c_types, kinds, q, p, s):
+    """Net flows from the full (m, m, n) preference tensor."""
+    Y = np.where(np.array(c_types) == 1, matrix, -matrix)
+    D = Y[:, None, :] - Y[None, :, :]
+    P = np.zeros_like(D)
+    for j, kind in enumerate(kinds):
+        d = D[:, :, j]
+        if kind == 'usual':
+            P[:, :, j] = d > 0
+        elif kind == 'gaussian':
+            P[:, :, j] = np.where(d > 0, 1 - np.exp(-d**2 / (2 * s[j]**2)), 0)
+        else:
+            lo = q[j] if kind == 'linear' else 0
+            if p[j] == lo:
+                P[:, :, j] = d > lo
+            else:
+                P[:, :, j] = np.clip((d - lo) / (p[j] - lo), 0, 1)
+    pi = P @ weights
+    m = len(matrix)
+    return pi.sum(axis=1) / (m - 1), pi.sum(axis=0) / (m - 1)
+
+class TestPromethee(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        # Integer data gives ties and differences exactly on the thresholds
+        self.matrix = rng.integers(1, 10, (40, 4)).astype(float)
+        self.c_types = [1, -1, 1, -1]
+        self.weights = rng.dirichlet(np.ones(4))
+        self.kinds = ['usual', 'linear', 'vshape', 'gaussian']
+        self.q = [0, 1, 0, 0]
+        self.p = [0, 3, 2, 0]
+        self.s = [0, 0, 0, 1.5]
+
+    def test_matches_dense_reference(self):
+        q, p, s = [0.5, 1, 0, 2], [2, 3, 1, 4], [1, 1.5, 2, 0.5]
+        for kind in ranking.PREFERENCE_FUNCTIONS:
+            plus, minus = dense_promethee(self.matrix, self.weights, self.c_types, [kind] * 4, q, p, s)
+            for algorithm in ('auto', 'tiled'):
+                net = ranking.promethee_ranking(self.matrix, self.weights, self.c_types, preference=kind,
+                                                q=q, p=p, s=s, algorithm=algorithm)
+                np.testing.assert_allclose(net, plus - minus, atol=1e-12, err_msg=f"{kind} {algorithm}")
+
+    def test_ties_on_equal_thresholds(self):
+        # Integer differences land exactly on q == p: the sorted path must count them like the tiles
+        x = np.array([[2, 5, 2, 0, 7, 0, 2]], dtype=float).T
+        net = ranking.promethee_ranking(x, [1.0], [1], preference='linear', q=2, p=2)
+        tiled = ranking.promethee_ranking(x, [1.0], [1], preference='linear', q=2, p=2, algorithm='tiled')
+        np.testing.assert_allclose(net, tiled, atol=1e-12)
+        self.assertAlmostEqual(net[4], 5 / 6)
+        for kind in ('linear', 'vshape'):
+            plus, minus = dense_promethee(self.matrix, self.weights, self.c_types, [kind] * 4,
+                                          [2] * 4, [2] * 4, [1] * 4)
+            net = ranking.promethee_ranking(self.matrix, self.weights, self.c_types, preference=kind, q=2, p=2)
+            np.testing.assert_allclose(net, plus - minus, atol=1e-12, err_msg=kind)
+
+    def test_mixed_functions_tiles_and_workers(self):
+        plus, minus = dense_promethee(self.matrix, self.weights, self.c_types, self.kinds, self.q, self.p, self.s)
+        options = dict(preference=self.kinds, q=self.q, p=self.p, s=self.s)
+        trace = Trace()
+        # Tiles of 3 rows, the last one partial
+        net = ranking.promethee_ranking(self.matrix, self.weights, self.c_types, algorithm='tiled',
+                                        tile_bytes=3 * 2 * 8 * 40, trace=trace, **options)
+        np.testing.assert_allclose(net, plus - minus, atol=1e-12)
+        np.testing.assert_allclose(trace.get('promethee', 'phi_plus'), plus, atol=1e-12)
+        np.testing.assert_allclose(trace.get('promethee', 'phi_minus'), minus, atol=1e-12)
+        pooled = ranking.promethee_ranking(self.matrix, self.weights, self.c_types, algorithm='tiled',
+                                           tile_bytes=4000, workers=2, **options)
+        np.testing.assert_allclose(pooled, net, atol=1e-12)
+        # Net flows of all alternatives sum to zero
+        self.assertAlmostEqual(net.sum(), 0, places=10)
+
+    def test_invalid_preferences(self):
+        for kwargs in ({'preference': 'step'}, {'preference': 'linear'}, {'preference': 'gaussian'},
+                       {'preference': 'linear', 'q': 3, 'p': 1}, {'preference': ['usual'] * 3},
+                       {'preference': 'vshape', 'p': -1}):
+            with self.assertRaises(ValueError, msg=kwargs):
+                ranking.promethee_ranking(self.matrix, self.weights, self.c_types, **kwargs)
+
+    def test_service_and_cli(self):
+        df = pd.DataFrame(self.matrix, index=[f"A{i}" for i in range(40)], columns=list('ABCD'))
+        options = {'preference': 'linear', 'q': 1.0, 'p': 3.0}
+        out = calculate_mcdm(df, 'entropy', 'promethee', self.c_types, ranking_options=options, explain=True)
+        results = out['results']
+        self.assertEqual(results.columns[1], 'Net Flow')
+        self.assertTrue(results['Net Flow'].is_monotonic_decreasing)
+        self.assertIn('promethee', out['intermediate']['trace'])
+        cached = calculate_mcdm(df, 'entropy', 'promethee', self.c_types, ranking_options=options)
+        pd.testing.assert_frame_equal(cached['results'], results)
+        usual = calculate_mcdm(df, 'entropy', 'promethee', self.c_types)
+        self.assertFalse(np.allclose(usual['results']['Net Flow'], results['Net Flow']))
+        many = calculate_many([df, df], 'entropy', 'promethee', self.c_types)
+        pd.testing.assert_frame_equal(many[1]['results'], usual['results'])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            df.to_csv(path)
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    main([path, '--weights', 'entropy', '--ranking', 'promethee', '--types', '1,-1,1,-1',
+                          '--preference', 'linear', '--q', '1', '--p', '3'])
+                saved = pd.read_csv('result_promethee_entropy.csv')
+            finally:
+                os.chdir(cwd)
+        np.testing.assert_allclose(saved['Net Flow'], results['Net Flow'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import rank_reversal, ranking
+from mcdm_calculator.service import calculate_rank_reversal
+
+RANKINGS = {'topsis': ranking.topsis_ranking, 'vikor': ranking.vikor_ranking, 'mairca': ranking.mairca_ranking}
+HIGHER_IS_BETTER = {'topsis': True, 'vikor': False, 'mairca': False}
+
+def brute_force_flips(matrix, weights, c_types, method):
+    """(removed, above, below) triples from re-ranking every m - 1 row matrix."""
+    sign = -1 if HIGHER_IS_BETTER[method] else 1
+    base = sign * RANKINGS[method](matrix, weights, c_types)
+    flips = set()
+    for r in range(len(matrix)):
+        keys = np.insert(sign * RANKINGS[method](np.delete(matrix, r, axis=0), weights, c_types), r, np.nan)
+        for a in range(len(matrix)):
+            for b in range(len(matrix)):
+                if base[a] < base[b] and keys[a] > keys[b]:
+                    flips.add((r, a, b))
+    return flips
+
+class TestRankReversal(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.matrix = rng.uniform(1, 10, (25, 5))
+        # A shared column maximum and a zero in a cost column exercise the extreme fallbacks
+        self.matrix[[3, 9], 2] = 12.0
+        self.matrix[4, 0] = 0.0
+        self.c_types = [-1, 1, 1, -1, 1]
+        self.weights = rng.dirichlet(np.ones(5))
+
+    def test_leave_one_out_scores_match_direct_rankings(self):
+        for method, fn in RANKINGS.items():
+            seen = []
+            for rows, scores in rank_reversal.leave_one_out_scores(self.matrix, self.weights, self.c_types,
+                                                                   method, block_rows=4):
+                for k, r in enumerate(rows):
+                    self.assertTrue(np.isnan(scores[k, r]))
+                    expected = fn(np.delete(self.matrix, r, axis=0), self.weights, self.c_types)
+                    np.testing.assert_allclose(np.delete(scores[k], r), expected, rtol=1e-10, atol=1e-12)
+                seen.extend(rows)
+            self.assertEqual(seen, list(range(25)))
+
+    def test_flips_match_brute_force(self):
+        for method in RANKINGS:
+            expected = brute_force_flips(self.matrix, self.weights, self.c_types, method)
+            result = rank_reversal.rank_reversal_analysis(self.matrix, self.weights, self.c_types, method)
+            self.assertTrue(result['all_pairs'])
+            self.assertEqual(set(map(tuple, result['flips'].tolist())), expected)
+            self.assertEqual(result['flip_counts'].sum(), len(expected))
+            self.assertEqual(result['involved_counts'].sum(), 2 * len(expected))
+
+            # Neighbour mode reports the subset of flips between adjacent alternatives
+            adjacent = rank_reversal.rank_reversal_analysis(self.matrix, self.weights, self.c_types, method,
+                                                            all_pairs=False, block_rows=3)
+            self.assertLessEqual(set(map(tuple, adjacent['flips'].tolist())), expected)
+            np.testing.assert_array_equal(adjacent['best'], result['best'])
+
+    def test_topsis_large_column_offsets(self):
+        # ||x||^2 - 2 x.y + ||y||^2 cancels on 1e7 + U(0, 1) columns and reported false reversals
+        rng = np.random.default_rng(3)
+        matrix = 1e7 + rng.uniform(0, 1, (40, 4))
+        c_types = [1, -1, 1, -1]
+        weights = rng.dirichlet(np.ones(4))
+        for rows, scores in rank_reversal.leave_one_out_scores(matrix, weights, c_types, 'topsis', block_rows=7):
+            for k, r in enumerate(rows):
+                expected = ranking.topsis_ranking(np.delete(matrix, r, axis=0), weights, c_types)
+                # x / norm keeps only ~1e-9 of the 1e-7 relative spread, whichever way the norm is summed
+                np.testing.assert_allclose(np.delete(scores[k], r), expected, rtol=1e-7)
+        result = rank_reversal.rank_reversal_analysis(matrix, weights, c_types, 'topsis')
+        self.assertEqual(set(map(tuple, result['flips'].tolist())),
+                         brute_force_flips(matrix, weights, c_types, 'topsis'))
+
+    def test_best_changed(self):
+        result = rank_reversal.rank_reversal_analysis(self.matrix, self.weights, self.c_types, 'vikor')
+        order = result['order']
+        for r in range(25):
+            scores = RANKINGS['vikor'](np.delete(self.matrix, r, axis=0), self.weights, self.c_types)
+            best = np.delete(np.arange(25), r)[np.argmin(scores)]
+            self.assertEqual(result['best'][r], best)
+            old_best = order[0] if order[0] != r else order[1]
+            self.assertEqual(result['best_changed'][r], best != old_best)
+
+    def test_service_tables(self):
+        df = pd.DataFrame(self.matrix, index=[f"Alt {i}" for i in range(25)], columns=list('ABCDE'))
+        out = calculate_rank_reversal(df, 'entropy', 'topsis', self.c_types)
+        self.assertEqual(list(out['summary'].columns),
+                         ['Removed', 'Rank', 'Reversals', 'Involved', 'Best Changed', 'New Best'])
+        self.assertEqual(out['summary']['Rank'].tolist(), list(range(1, 26)))
+        self.assertEqual(len(out['flips']), out['summary']['Reversals'].sum())
+        with self.assertRaises(ValueError):
+            rank_reversal.rank_reversal_analysis(self.matrix[:2], self.weights, self.c_types)
+        # Outranking methods are rejected before any weights are computed
+        for method in ('promethee', 'electre1', 'electre3'):
+            with self.assertRaisesRegex(ValueError, 'rank reversal'):
+                calculate_rank_reversal(df, 'manual', method, self.c_types)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import selection
+from mcdm_calculator.service import calculate_mcdm
+
+class TestTopK(unittest.TestCase):
+    
+    def setUp(self):
+        # Heavy ties so the boundary usually falls inside a tie group
+        self.scores = np.random.default_rng(11).integers(0, 15, size=200).astype(float)
+        
+    def expected_ranks(self, ascending):
+        return pd.Series(self.scores).rank(ascending=ascending).astype(int).values
+        
+    def test_top_k_ranks_match_pandas_rank(self):
+        for ascending in (True, False):
+            full = self.expected_ranks(ascending)
+            for k in (1, 7, 50, 200, 500):
+                idx, ranks = selection.top_k(self.scores, k, ascending)
+                self.assertEqual(len(idx), min(k, len(self.scores)))
+                np.testing.assert_array_equal(ranks, full[idx])
+                # Exactly the k best ranks are selected
+                self.assertLessEqual(ranks.max(), np.sort(full)[len(idx) - 1])
+                
+    def test_accumulator_matches_in_memory(self):
+        for ascending in (True, False):
+            full = self.expected_ranks(ascending)
+            for k in (1, 13, 60):
+                acc = selection.TopKAccumulator(k, ascending)
+                for start in range(0, 200, 17):
+                    acc.push(range(start, min(start + 17, 200)), self.scores[start:start + 17])
+                labels, scores, ranks = acc.result()
+                self.assertEqual(len(labels), k)
+                np.testing.assert_array_equal(scores, self.scores[labels])
+                np.testing.assert_array_equal(ranks, full[labels])
+                
+    def test_calculate_mcdm_top_k(self):
+        df = pd.DataFrame(np.random.default_rng(2).uniform(1, 9, size=(40, 3)), columns=['A', 'B', 'C'])
+        full = calculate_mcdm(df, 'entropy', 'topsis', [1, -1, 1])['results']
+        top = calculate_mcdm(df, 'entropy', 'topsis', [1, -1, 1], top_k=5)['results']
+        pd.testing.assert_frame_equal(top, full.head(5))
+
+if __name__ == '__main__':
+    unittest.main()
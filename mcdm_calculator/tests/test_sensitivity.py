@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import sensitivity, ranking
+from mcdm_calculator.service import calculate_weight_stability
+
+RANKINGS = {'topsis': ranking.topsis_ranking, 'vikor': ranking.vikor_ranking, 'mairca': ranking.mairca_ranking}
+
+class TestWeightStability(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.matrix = rng.uniform(1, 10, (30, 5))
+        self.c_types = [-1, 1, 1, -1, 1]
+        self.weights = rng.dirichlet(np.ones(5))
+
+    def top(self, method, weights, k):
+        scores = RANKINGS[method](self.matrix, weights, self.c_types)
+        key = -scores if method == 'topsis' else scores
+        return tuple(np.argsort(key, kind='stable')[:k])
+
+    def test_rescaled_weights(self):
+        W = sensitivity.rescaled_weights(self.weights, [0, 2, 2], [0.5, 0.0, 1.0])
+        np.testing.assert_allclose(W.sum(axis=1), 1)
+        self.assertEqual(W[0, 0], 0.5)
+        # The other weights keep their proportions
+        np.testing.assert_allclose(W[0, 1:] / W[0, 1], self.weights[1:] / self.weights[1])
+        np.testing.assert_allclose(W[2], [0, 0, 1, 0, 0])
+        np.testing.assert_allclose(sensitivity.rescaled_weights([0, 1, 0], [1], [0.4]), [[0.3, 0.4, 0.3]])
+
+    def test_intervals_match_direct_rankings(self):
+        for method in RANKINGS:
+            for k in (1, 3):
+                result = sensitivity.weight_stability(self.matrix, self.weights, self.c_types, method, k=k)
+                base = self.top(method, result['weights'], k)
+                self.assertEqual(tuple(result['top']), base)
+                for j in range(5):
+                    lower, upper = result['lower'][j], result['upper'][j]
+                    self.assertLessEqual(lower, result['weights'][j])
+                    self.assertGreaterEqual(upper, result['weights'][j])
+                    for t in np.linspace(lower, upper, 25):
+                        W = sensitivity.rescaled_weights(result['weights'], [j], [t])[0]
+                        self.assertEqual(self.top(method, W, k), base, f"{method} k={k} criterion {j}")
+                    for bound, step, outside in ((lower, -1, result['lower_top'][j]), (upper, 1, result['upper_top'][j])):
+                        if bound in (0.0, 1.0):
+                            self.assertEqual(outside[0], -1)
+                            continue
+                        W = sensitivity.rescaled_weights(result['weights'], [j], [bound + step * 2e-6])[0]
+                        self.assertEqual(self.top(method, W, k), tuple(outside))
+                        self.assertNotEqual(tuple(outside), base)
+
+    def test_service_table(self):
+        df = pd.DataFrame(self.matrix, index=[f"Alt {i}" for i in range(30)], columns=list('ABCDE'))
+        out = calculate_weight_stability(df, 'manual', 'vikor', self.c_types, list(self.weights), k=2)
+        table = out['intervals']
+        self.assertEqual(len(out['top']), 2)
+        self.assertTrue((table['Lower'] <= table['Weight']).all())
+        self.assertTrue((table['Weight'] <= table['Upper']).all())
+        self.assertTrue(((table['Upper'] < 1) == (table['Top Above'] != '')).all())
+        with self.assertRaises(ValueError):
+            sensitivity.weight_stability(self.matrix, self.weights, self.c_types, 'topsis', k=31)
+        # Outranking methods are rejected before any weights are computed
+        for method in ('promethee', 'electre1', 'electre3'):
+            with self.assertRaisesRegex(ValueError, 'weight stability'):
+                calculate_weight_stability(df, 'manual', method, self.c_types)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import asyncio
+import http.client
+import json
+import socket
+import threading
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.server import ScoringServer
+from mcdm_calculator.service import calculate_mcdm, compute_weights
+
+class ServerThread:
+    """Runs a ScoringServer on its own event loop in a background thread, on a free localhost port."""
+    def __init__(self, **kwargs):
+        self.server = ScoringServer(port=0, **kwargs)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result(timeout=10)
+        return self.server
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+def request(conn, method, path, payload=None):
+    body = json.dumps(payload) if payload is not None else None
+    conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+class TestScoringServer(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = [[250, 16, 12, 5], [200, 16, 8, 3], [300, 32, 16, 4], [275, 32, 8, 4]]
+        self.df = pd.DataFrame(self.matrix, index=['A', 'B', 'C', 'D'], columns=['Price', 'Storage', 'Camera', 'Looks'])
+        self.payload = {'matrix': self.matrix, 'alternatives': list(self.df.index), 'criteria': list(self.df.columns),
+                        'criteria_types': ['cost', 'benefit', 'benefit', 'benefit'],
+                        'weights': 'entropy', 'ranking': 'vikor'}
+
+    def test_endpoints_match_service(self):
+        with ServerThread(workers=2) as server:
+            conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=30)
+            status, out = request(conn, 'POST', '/calculate', self.payload)
+            self.assertEqual(status, 200)
+            expected = calculate_mcdm(self.df, 'entropy', 'vikor', [-1, 1, 1, 1], use_cache=False)
+            self.assertEqual([r['Alternative'] for r in out['results']], list(expected['results']['Alternative']))
+            np.testing.assert_allclose([r['Q Value'] for r in out['results']], expected['results']['Q Value'])
+
+            status, out = request(conn, 'POST', '/weights', {'matrix': self.matrix, 'method': 'critic'})
+            self.assertEqual(status, 200)
+            np.testing.assert_allclose(out['weights'], compute_weights(np.array(self.matrix, float), 'critic', None))
+
+            status, out = request(conn, 'POST', '/scores', {'matrix': self.matrix, 'weights': [0.25] * 4,
+                                                            'criteria_types': [-1, 1, 1, 1], 'method': 'mairca'})
+            self.assertEqual(status, 200)
+            self.assertEqual(len(out['scores']), 4)
+            conn.close()
+
+    def test_keep_alive_and_metrics(self):
+        with ServerThread(workers=2, executor='thread') as server:
+            conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=30)
+            for _ in range(5):
+                self.assertEqual(request(conn, 'POST', '/calculate', self.payload)[0], 200)
+            sock = conn.sock
+            status, metrics = request(conn, 'GET', '/metrics')
+            self.assertIs(conn.sock, sock) # Same connection for every request
+            self.assertEqual(status, 200)
+            self.assertEqual(metrics['connections_total'], 1)
+            histogram = metrics['latency_seconds']['/calculate']
+            self.assertEqual(histogram['count'], 5)
+            self.assertEqual(histogram['buckets']['+Inf'], 5)
+            counts = list(histogram['buckets'].values())
+            self.assertEqual(counts, sorted(counts)) # Cumulative
+            self.assertEqual(metrics['responses']['200'], 5)
+            conn.close()
+
+    def test_errors(self):
+        with ServerThread(workers=1, executor='thread', max_body_bytes=1024) as server:
+            conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=30)
+            status, out = request(conn, 'POST', '/calculate', dict(self.payload, ranking='foo'))
+            self.assertEqual(status, 400)
+            self.assertIn('foo', out['error'])
+            self.assertEqual(request(conn, 'POST', '/calculate', {'ranking': 'topsis'})[0], 400)
+            self.assertEqual(request(conn, 'GET', '/calculate')[0], 405)
+            self.assertEqual(request(conn, 'GET', '/nothing')[0], 404)
+            conn.request('POST', '/weights', body=b'{not json', headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 400)
+
+            # Oversized bodies are refused from the Content-Length alone and the connection is closed
+            big = {'matrix': np.ones((100, 10)).tolist()}
+            status, out = request(conn, 'POST', '/weights', big)
+            self.assertEqual(status, 413)
+            conn.close()
+
+            # The server keeps serving other connections
+            conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=30)
+            self.assertEqual(request(conn, 'GET', '/health'), (200, {'status': 'ok'}))
+            conn.close()
+
+    def test_connection_close_and_http10(self):
+        with ServerThread(workers=1, executor='thread') as server:
+            with socket.create_connection(('127.0.0.1', server.port), timeout=30) as sock:
+                sock.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+                data = b''
+                while chunk := sock.recv(4096):
+                    data += chunk
+            self.assertTrue(data.startswith(b"HTTP/1.1 200 OK"))
+            self.assertIn(b"Connection: close", data)
+
+if __name__ == '__main__':
+    unittest.main()
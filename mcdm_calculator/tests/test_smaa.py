@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import ranking, smaa
+from mcdm_calculator.service import calculate_smaa
+
+class TestSMAA(unittest.TestCase):
+    
+    def setUp(self):
+        self.matrix = np.array([
+            [250, 16, 12, 5],
+            [200, 16, 8, 3],
+            [300, 32, 16, 4],
+            [275, 32, 8, 4],
+            [225, 16, 16, 2]
+        ])
+        self.c_types = [-1, 1, 1, 1]
+        
+    def test_weight_sample_scoring_matches_ranking_functions(self):
+        W = np.random.default_rng(3).dirichlet(np.ones(4), size=20)
+        single = {
+            'topsis': ranking.topsis_ranking,
+            'vikor': ranking.vikor_ranking,
+            'mairca': ranking.mairca_ranking,
+        }
+        for method, fn in single.items():
+            prepared = ranking.prepare_scoring(self.matrix, self.c_types, method)
+            scores = ranking.score_weight_samples(prepared, W)
+            for w, row in zip(W, scores):
+                np.testing.assert_allclose(row, fn(self.matrix, w, self.c_types), rtol=1e-9, atol=1e-12)
+                
+    def test_acceptability_is_reproducible_and_normalized(self):
+        a = smaa.smaa_analysis(self.matrix, self.c_types, 'topsis', samples=3000, seed=7, block_size=500)
+        b = smaa.smaa_analysis(self.matrix, self.c_types, 'topsis', samples=3000, seed=7, block_size=500, workers=2)
+        np.testing.assert_array_equal(a['acceptability'], b['acceptability'])
+        # Every sample assigns each rank exactly once
+        np.testing.assert_allclose(a['acceptability'].sum(axis=0), 1)
+        np.testing.assert_allclose(a['acceptability'].sum(axis=1), 1)
+        
+        winners = a['acceptability'][:, 0] > 0
+        np.testing.assert_allclose(a['central_weights'][winners].sum(axis=1), 1)
+        self.assertTrue(np.all(np.isnan(a['central_weights'][~winners])))
+        
+    def test_calculate_smaa_around_merec(self):
+        df = pd.DataFrame(self.matrix, columns=['Price', 'Storage', 'Camera', 'Looks'])
+        out = calculate_smaa(df, 'vikor', self.c_types, weights_method='merec',
+                             samples=2000, concentration=1e6, seed=1)
+        # A very tight Dirichlet reproduces the deterministic ranking
+        self.assertEqual(list(out['acceptability'].columns[:2]), ['Rank 1', 'Rank 2'])
+        q = ranking.vikor_ranking(self.matrix, out['center'], self.c_types)
+        self.assertGreater(out['acceptability'].iloc[np.argmin(q), 0], 0.99)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import subprocess
+import sys
+import os
+
+# Add project root and benchmarks directory to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'benchmarks'))
+
+import bench_startup
+
+# Runs the CLI's --help and the numpy-only service entry points, then reports whether pandas was loaded
+NUMPY_ONLY = """
+import sys, contextlib, io
+import numpy as np
+from mcdm_calculator.calculator import main
+from mcdm_calculator.service import compute_weights, compute_scores
+with contextlib.redirect_stdout(io.StringIO()):
+    for argv in (['--help'], ['batch', '--help'], ['serve', '--help']):
+        try:
+            main(argv)
+        except SystemExit:
+            pass
+matrix = np.random.default_rng(0).uniform(1, 10, (20, 4))
+weights = compute_weights(matrix, 'merec', [-1, 1, 1, 1])
+compute_scores(matrix, weights, 'vikor', [-1, 1, 1, 1])
+print('pandas' in sys.modules)
+"""
+
+class TestStartup(unittest.TestCase):
+
+    def test_entry_points_do_not_import_pandas(self):
+        for module in bench_startup.MODULES:
+            profile = bench_startup.import_profile(module)
+            self.assertIn(module, profile)
+            self.assertNotIn('pandas', profile, module)
+
+    def test_help_and_core_path_run_without_pandas(self):
+        proc = subprocess.run([sys.executable, '-c', NUMPY_ONLY], cwd=ROOT,
+                              capture_output=True, text=True, check=True)
+        self.assertEqual(proc.stdout.strip(), 'False')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import ranking, streaming, weighting
+
+class TestStreaming(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.matrix = rng.uniform(1, 100, size=(103, 6))
+        self.c_types = [-1, 1, 1, -1, 1, 1]
+        self.weights = rng.dirichlet(np.ones(6))
+        
+    def chunks(self, size=10):
+        def source():
+            for start in range(0, len(self.matrix), size):
+                yield list(range(start, min(start + size, len(self.matrix)))), self.matrix[start:start + size]
+        return source
+        
+    def test_stream_scores_match_in_memory(self):
+        full = {
+            'topsis': ranking.topsis_ranking,
+            'vikor': ranking.vikor_ranking,
+            'mairca': ranking.mairca_ranking,
+        }
+        for method, fn in full.items():
+            parts = list(streaming.stream_scores(self.chunks(), self.weights, self.c_types, method))
+            labels = np.concatenate([p[0] for p in parts])
+            scores = np.concatenate([p[1] for p in parts])
+            np.testing.assert_array_equal(labels, np.arange(len(self.matrix)))
+            np.testing.assert_allclose(scores, fn(self.matrix, self.weights, self.c_types), rtol=1e-12, atol=1e-12)
+            
+    def test_column_stats_merge(self):
+        a = streaming.ColumnStats(6).update(self.matrix[:40])
+        b = streaming.ColumnStats(6).update(self.matrix[40:])
+        merged = a.merge(b)
+        self.assertEqual(merged.count, len(self.matrix))
+        np.testing.assert_allclose(merged.norm, np.linalg.norm(self.matrix, axis=0))
+        np.testing.assert_array_equal(merged.min, self.matrix.min(axis=0))
+        np.testing.assert_array_equal(merged.max, self.matrix.max(axis=0))
+
+    def test_stream_weights_match_in_memory(self):
+        self.matrix[3, 2] = 0 # zero entries take p = 1e-9 in Entropy
+        self.matrix[50:60, 4] = 0
+        full = {
+            'entropy': weighting.entropy_weighting(self.matrix),
+            'critic': weighting.critic_weighting(self.matrix),
+            'merec': weighting.merec_weighting(self.matrix, self.c_types),
+        }
+        for method, expected in full.items():
+            for size in (10, 103):
+                weights = streaming.stream_weights(self.chunks(size), method, self.c_types)
+                np.testing.assert_allclose(weights, expected, rtol=1e-12, err_msg=f"{method} {size}")
+        with self.assertRaises(ValueError):
+            streaming.stream_weights(self.chunks(), 'equal')
+
+    def test_weight_accumulators_merge(self):
+        stats = streaming.collect_stats(self.chunks()())
+        def make():
+            return [streaming.EntropyAccumulator(6), streaming.CriticAccumulator(stats.min, stats.max),
+                    streaming.MerecAccumulator(stats.min, stats.max, self.c_types)]
+        whole = [acc.update(self.matrix) for acc in make()]
+        # Partials over uneven splits (one of them empty), merged out of order
+        splits = np.split(self.matrix, [7, 7, 60])
+        partials = [[acc.update(part) for acc in make()] for part in splits]
+        merged = make()
+        for i in (2, 0, 3, 1):
+            for acc, part in zip(merged, partials[i]):
+                acc.merge(part)
+        for acc, expected in zip(merged, whole):
+            self.assertEqual(acc.count, len(self.matrix))
+            np.testing.assert_allclose(acc.weights(), expected.weights(), rtol=1e-12)
+        critic = merged[1]
+        normalized = (self.matrix - stats.min) / (stats.max - stats.min + 1e-9)
+        np.testing.assert_allclose(critic.std, np.std(normalized, axis=0), rtol=1e-12)
+        np.testing.assert_allclose(critic.correlation, np.corrcoef(normalized, rowvar=False), atol=1e-12)
+
+if __name__ == '__main__':
+    unittest.main()
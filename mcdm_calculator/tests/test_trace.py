@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import weighting, ranking
+from mcdm_calculator.core.trace import Trace
+from mcdm_calculator.explain import trace_steps, format_steps, matrix_table
+from mcdm_calculator.service import calculate_mcdm
+
+class TestTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame([
+            [250, 16, 12, 5],
+            [200, 16, 8, 3],
+            [300, 32, 16, 4],
+            [275, 32, 8, 4],
+            [225, 16, 16, 2],
+        ], columns=['Price', 'Storage', 'Camera', 'Looks'],
+           index=['A', 'B', 'C', 'D', 'E'])
+        self.matrix = self.df.values
+        self.c_types = [-1, 1, 1, 1]
+        self.weights = np.array([0.2, 0.3, 0.4, 0.1])
+
+    def test_recorded_steps_match_results(self):
+        trace = Trace()
+        scores = ranking.topsis_ranking(self.matrix, self.weights, self.c_types, trace=trace)
+        np.testing.assert_array_equal(scores, ranking.topsis_ranking(self.matrix, self.weights, self.c_types))
+        self.assertIs(trace.get('topsis', 'scores'), scores)
+
+        d_pos, d_neg = trace.get('topsis', 'dist_ideal'), trace.get('topsis', 'dist_anti_ideal')
+        np.testing.assert_allclose(scores, d_neg / (d_pos + d_neg + 1e-9))
+
+        q = ranking.vikor_ranking(self.matrix, self.weights, self.c_types, trace=trace)
+        np.testing.assert_allclose(trace.get('vikor', 'S'), trace.get('vikor', 'weighted_regret').sum(axis=1))
+        self.assertIs(trace.get('vikor', 'scores'), q)
+
+        merec = weighting.merec_removal_effects(self.matrix, self.c_types, trace=trace)
+        np.testing.assert_array_equal(trace.get('merec', 'E'), merec['E'])
+        self.assertEqual(set(trace), {'topsis', 'vikor', 'merec'})
+
+    def test_lazy_values(self):
+        trace = Trace()
+        calls = []
+        trace.record_lazy('x', 'value', lambda: calls.append(1) or 42)
+        self.assertEqual(calls, [])
+        self.assertEqual(trace.get('x', 'value'), 42)
+        self.assertEqual(trace.get('x', 'value'), 42)
+        self.assertEqual(calls, [1])
+        self.assertIsNone(trace.get('x', 'missing'))
+
+    def test_every_method_renders(self):
+        trace = Trace()
+        weighting.entropy_weighting(self.matrix, trace=trace)
+        weighting.critic_weighting(self.matrix, trace=trace)
+        weighting.merec_weighting(self.matrix, self.c_types, trace=trace)
+        ranking.topsis_ranking(self.matrix, self.weights, self.c_types, trace=trace)
+        ranking.vikor_ranking(self.matrix, self.weights, self.c_types, trace=trace)
+        ranking.mairca_ranking(self.matrix, self.weights, self.c_types, trace=trace)
+        names, alts = list(self.df.columns), list(self.df.index)
+        for section in trace:
+            steps = trace_steps(trace, section, names, alts, self.c_types)
+            self.assertGreaterEqual(len(steps), 2)
+            for title, table, note in steps:
+                self.assertIsInstance(table, pd.DataFrame)
+                self.assertIsNone(note)
+
+        # The final ranking step agrees with a full rank
+        _, final, _ = trace_steps(trace, 'topsis', names, alts, self.c_types)[-1]
+        self.assertEqual(final['Alternative'].iloc[0], alts[int(np.argmax(trace.get('topsis', 'scores')))])
+        self.assertIn('TOPSIS - DETAILED STEPS', format_steps(trace, 'topsis', names, alts, self.c_types))
+
+    def test_large_tables_are_truncated(self):
+        matrix = np.arange(1000 * 30, dtype=float).reshape(1000, 30)
+        table, note = matrix_table(matrix, [f"A{i}" for i in range(1000)], [f"C{j}" for j in range(30)],
+                                   max_rows=6, max_cols=4)
+        self.assertEqual(table.shape, (6, 4))
+        self.assertEqual(list(table.index), ['A0', 'A1', 'A2', 'A997', 'A998', 'A999'])
+        self.assertEqual(table.iloc[-1, -1], matrix[-1, -1])
+        self.assertIn('994 of 1000 rows', note)
+        self.assertIn('26 of 30 columns', note)
+
+    def test_calculate_mcdm_explain(self):
+        out = calculate_mcdm(self.df, 'critic', 'mairca', self.c_types, explain=True)
+        trace = out['intermediate']['trace']
+        self.assertEqual(set(trace), {'critic', 'mairca'})
+        np.testing.assert_allclose(trace.get('critic', 'weights'), out['weights']['Weight'].values)
+        plain = calculate_mcdm(self.df, 'critic', 'mairca', self.c_types)
+        self.assertNotIn('trace', plain['intermediate'])
+        pd.testing.assert_frame_equal(out['results'], plain['results'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import tracemalloc
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcdm_calculator.core import normalization, ranking
+from mcdm_calculator.core.trace import Trace
+from mcdm_calculator.core.workspace import Workspace
+
+RANKINGS = [ranking.topsis_ranking, ranking.vikor_ranking, ranking.mairca_ranking]
+
+class TestWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.matrix = rng.uniform(0, 10, (3000, 40))
+        self.matrix[5, 1] = 0 # exercises the zero guard of the cost columns
+        self.c_types = np.array([-1, 1] * 20)
+        self.weights = rng.dirichlet(np.ones(40))
+
+    def test_same_results_as_without_workspace(self):
+        for dtype in (np.float64, np.float32):
+            matrix = self.matrix.astype(dtype)
+            ws = Workspace(*matrix.shape, dtype=dtype)
+            for _ in range(2):
+                for fn in RANKINGS:
+                    expected = fn(matrix, self.weights, self.c_types)
+                    np.testing.assert_array_equal(fn(matrix, self.weights, self.c_types, workspace=ws), expected)
+            np.testing.assert_array_equal(normalization.vector_normalization(matrix, workspace=ws),
+                                          normalization.vector_normalization(matrix))
+            np.testing.assert_array_equal(normalization.linear_normalization(matrix, self.c_types, workspace=ws),
+                                          normalization.linear_normalization(matrix, self.c_types))
+
+    def test_no_matrix_allocations_after_warm_up(self):
+        ws = Workspace(*self.matrix.shape)
+        for fn in RANKINGS:
+            fn(self.matrix, self.weights, self.c_types, workspace=ws)
+            tracemalloc.start()
+            try:
+                fn(self.matrix, self.weights, self.c_types, workspace=ws)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            # Only length-n vectors and numpy's fixed-size ufunc buffers (~64 KB) remain
+            self.assertLess(peak, 0.1 * self.matrix.nbytes, fn.__name__)
+
+    def test_scores_live_in_workspace(self):
+        ws = Workspace(*self.matrix.shape)
+        first = ranking.topsis_ranking(self.matrix, self.weights, self.c_types, workspace=ws)
+        kept = first.copy()
+        second = ranking.topsis_ranking(self.matrix * 2 + 1, self.weights, self.c_types, workspace=ws)
+        self.assertTrue(np.shares_memory(first, second))
+        self.assertFalse(np.array_equal(first, kept))
+
+        trace = Trace()
+        scores = ranking.vikor_ranking(self.matrix, self.weights, self.c_types, trace=trace, workspace=ws)
+        np.testing.assert_allclose(trace.get('vikor', 'S'), trace.get('vikor', 'weighted_regret').sum(axis=1))
+        self.assertIs(trace.get('vikor', 'scores'), scores)
+
+    def test_shape_and_dtype_checked(self):
+        ws = Workspace(10, 40)
+        with self.assertRaises(ValueError):
+            ranking.topsis_ranking(self.matrix, self.weights, self.c_types, workspace=ws)
+        # Other input dtypes are converted to the workspace dtype
+        small = self.matrix[:10].astype(np.float32)
+        np.testing.assert_allclose(ranking.mairca_ranking(small, self.weights, self.c_types, workspace=ws),
+                                   ranking.mairca_ranking(small.astype(np.float64), self.weights, self.c_types))
+        self.assertGreater(ws.nbytes, 0)
+
+if __name__ == '__main__':
+    unittest.main()